@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any
 from configobj import ConfigObj
 
 from mycli.config import strip_matching_quotes
+from mycli.constants import DEFAULT_ROW_GROUP_SIZE
 from mycli.types import ImageProtocol
 
 if TYPE_CHECKING:
@@ -57,6 +58,15 @@ def normalize_image_protocol(image_protocol: str | None) -> tuple[ImageProtocol,
     return 'none', f'Invalid config option provided for image_protocol ({image_protocol}); disabling.'
 
 
+def normalize_export_row_group_size(row_group_size: int) -> tuple[int, str | None]:
+    if row_group_size < 1:
+        return (
+            DEFAULT_ROW_GROUP_SIZE,
+            f'Invalid config option provided for export_row_group_size ({row_group_size}); using {DEFAULT_ROW_GROUP_SIZE}.',
+        )
+    return row_group_size, None
+
+
 def configure_prompt_state(
     mycli: MyCli,
     config: ConfigObj,
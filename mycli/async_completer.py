@@ -0,0 +1,71 @@
+"""Complete in a worker thread, abandoning requests for stale input.
+
+prompt_toolkit's `ThreadedCompleter` keeps the prompt responsive while
+`SQLCompleter` works, but a request whose input has since changed still runs
+to the end: the buffer runs one completion at a time, and only looks at the
+input again once the first completion has arrived, which for a large catalog
+is after all of the matching and sorting.  The next keystroke's completions
+wait for it.
+
+`AsyncCompleter` watches the input from the event loop while the worker
+thread completes, and tells the completer to give up as soon as the text or
+the cursor moves, so that the buffer can start over with the current input.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import AsyncGenerator, Callable, Iterable
+
+from prompt_toolkit.application import get_app
+from prompt_toolkit.completion import CompleteEvent, Completer, Completion
+from prompt_toolkit.document import Document
+from prompt_toolkit.eventloop import generator_to_async_generator
+
+from mycli.sqlcompleter import SQLCompleter
+
+# Seconds between checks of the input while a completion is running.
+DEFAULT_POLL_INTERVAL = 0.05
+
+
+class AsyncCompleter(Completer):
+    """Run the completer returned by *get_completer* in a worker thread.
+
+    get_document - returns the document being edited, compared with the one
+    being completed to tell when a request is stale; by default that of the
+    focused buffer of the running application.
+    """
+
+    def __init__(
+        self,
+        get_completer: Callable[[], SQLCompleter],
+        get_document: Callable[[], Document] | None = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        self.get_completer = get_completer
+        self.get_document = get_document or (lambda: get_app().current_buffer.document)
+        self.poll_interval = poll_interval
+
+    def get_completions(self, document: Document, complete_event: CompleteEvent) -> Iterable[Completion]:
+        return self.get_completer().get_completions(document, complete_event)
+
+    async def get_completions_async(self, document: Document, complete_event: CompleteEvent) -> AsyncGenerator[Completion, None]:
+        completer = self.get_completer()
+        cancelled = threading.Event()
+        watcher = asyncio.ensure_future(self._watch(document, cancelled))
+        completions = generator_to_async_generator(lambda: completer.get_completions(document, complete_event, cancelled=cancelled))
+        try:
+            async for completion in completions:
+                yield completion
+        finally:
+            cancelled.set()
+            watcher.cancel()
+            await completions.aclose()
+
+    async def _watch(self, document: Document, cancelled: threading.Event) -> None:
+        while not cancelled.is_set():
+            await asyncio.sleep(self.poll_interval)
+            current = self.get_document()
+            if current.text != document.text or current.cursor_position != document.cursor_position:
+                cancelled.set()
@@ -515,6 +515,7 @@ def run_from_cli_args(cli_args: 'CliArgs', client_factory: ClientFactory) -> Non
             ssl=ssl,
             init_command=combined_init_cmd,
             unbuffered=cli_args.unbuffered,
+            multi_statements=(cli_args.batch_pack or 1) > 1,
             character_set=cli_args.character_set,
             use_keyring=use_keyring,
             reset_keyring=reset_keyring,
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+from functools import cached_property
 from io import TextIOWrapper
 import logging
 import os
 import threading
-from typing import IO, Literal
+from typing import IO, TYPE_CHECKING, Literal
 
 from cli_helpers.tabular_output import TabularOutputFormatter
 from configobj import ConfigObj
@@ -17,6 +18,7 @@ from mycli.app_state import (
     configure_prompt_state,
     destructive_keywords_from_config,
     llm_prompt_truncation,
+    normalize_export_row_group_size,
     normalize_image_protocol,
     normalize_ssl_mode,
 )
@@ -25,27 +27,29 @@ from mycli.client_commands import ClientCommandsMixin, get_config_property_names
 from mycli.client_connection import ClientConnectionMixin
 from mycli.client_query import ClientQueryMixin
 from mycli.clistyle import style_factory_helpers, style_factory_ptoolkit
-from mycli.completion_refresher import CompletionRefresher
 from mycli.config import (
+    ConfigViews,
     get_mylogin_cnf_path,
     open_mylogin_cnf,
     read_config_file,
-    read_config_files,
     write_default_config,
 )
+from mycli.connection_pool import ConnectionPool, ControlConnection
 from mycli.constants import DEFAULT_PROMPT
-from mycli.main_modes import repl as repl_package
 from mycli.output import OutputMixin
 from mycli.packages import special
 from mycli.packages.special.dsn_aliases import DsnAliases
 from mycli.packages.special.favoritequeries import FavoriteQueries
 from mycli.packages.tabular_output import sql_format
 from mycli.schema_prefetcher import SchemaPrefetcher
-from mycli.sqlcompleter import SQLCompleter
 from mycli.sqlexecute import SQLExecute
 from mycli.ssh_tunnel import SshTunnel
 from mycli.types import Query
 
+if TYPE_CHECKING:
+    from mycli.completion_refresher import CompletionRefresher
+    from mycli.sqlcompleter import SQLCompleter
+
 sqlparse.engine.grouping.MAX_GROUPING_DEPTH = None  # type: ignore[assignment]
 sqlparse.engine.grouping.MAX_GROUPING_TOKENS = None  # type: ignore[assignment]
 
@@ -100,11 +104,9 @@ class MyCli(AppStateMixin, OutputMixin, ClientCommandsMixin, ClientConnectionMix
         # Load config.
         config_files: list[str | IO[str]] = self.system_config_files + [myclirc]
 
-        c = self.config = read_config_files(config_files)
-        # only needed in --checkup mode. todo: only load when needed
-        self.config_without_package_defaults = read_config_files(config_files, ignore_package_defaults=True)
-        # only needed in --checkup mode. todo: only load when needed
-        self.config_without_user_options = read_config_files(config_files, ignore_user_options=True)
+        self.config_views = ConfigViews(config_files)
+        c = self.config = self.config_views.config
+        self.config_without_package_defaults = self.config_views.without_package_defaults
         self.multi_line = c["main"].as_bool("multi_line")
         self.key_bindings = c["main"]["key_bindings"]
         self.emacs_ttimeoutlen = c['keys'].as_float('emacs_ttimeoutlen')
@@ -156,6 +158,7 @@ class MyCli(AppStateMixin, OutputMixin, ClientCommandsMixin, ClientConnectionMix
         self.destructive_warning = c_dest_warning if warn is None else warn
         self.login_path_as_host = c["main"].as_bool("login_path_as_host")
         self.post_redirect_command = c['main'].get('post_redirect_command')
+        self.redirect_buffer_size = c['main'].as_int('redirect_buffer_size')
         self.null_string = c['main'].get('null_string')
         self.numeric_alignment = c['main'].get('numeric_alignment', 'right') or 'right'
         self.binary_display = c['main'].get('binary_display')
@@ -165,6 +168,11 @@ class MyCli(AppStateMixin, OutputMixin, ClientCommandsMixin, ClientConnectionMix
         self.plot_scale_factor = c['dataframe'].as_float('plot_scale_factor')
         self.plot_ppi = c['dataframe'].as_int('plot_ppi')
         self.plot_theme = c['dataframe'].get('plot_theme', 'carbong90') or 'carbong90'
+        self.export_row_group_size, export_row_group_size_error = normalize_export_row_group_size(
+            c['dataframe'].as_int('export_row_group_size')
+        )
+        if export_row_group_size_error:
+            self.echo(export_row_group_size_error, err=True, fg='red')
         self.llm_prompt_field_truncate, self.llm_prompt_section_truncate = llm_prompt_truncation(c)
 
         self.ssl_mode, ssl_mode_error = normalize_ssl_mode(c, self.config_without_package_defaults)
@@ -186,36 +194,31 @@ class MyCli(AppStateMixin, OutputMixin, ClientCommandsMixin, ClientConnectionMix
                 self.echo("Error: Unable to open the audit log file. Your queries will not be logged.", err=True, fg="red")
                 self.logfile = False
 
-        self.completion_refresher = CompletionRefresher(self._invalidate_prompt_session)
+        self.connection_pool = ConnectionPool(
+            max_size=c["main"].as_int("connection_pool_size"),
+            max_idle=c["main"].as_float("connection_pool_idle_seconds"),
+        )
+        self.control_connection = ControlConnection() if c["main"].as_bool("control_connection") else None
         self.prefetch_schemas_mode = c["main"].get("prefetch_schemas_mode", "always") or "always"
         raw_prefetch_list = c["main"].as_list("prefetch_schemas_list") if "prefetch_schemas_list" in c["main"] else []
         self.prefetch_schemas_list = [s.strip() for s in raw_prefetch_list if s and s.strip()]
+        self.prefetch_schemas_parallelism = c["main"].as_int("prefetch_schemas_parallelism")
         self.schema_prefetcher = SchemaPrefetcher(self)
 
         self.logger = logging.getLogger(__name__)
         self.initialize_logging()
 
-        keyword_casing = c["main"].get("keyword_casing", "auto")
-        indexed_column_suffix = c['main'].get('indexed_column_suffix', '')
+        self.keyword_casing = c["main"].get("keyword_casing", "auto")
+        self.indexed_column_suffix = c['main'].get('indexed_column_suffix', '')
 
         self.highlight_preview = c['search'].as_bool('highlight_preview')
 
         self.query_history: list[Query] = []
 
-        # Initialize completer.
         self.smart_completion = c["main"].as_bool("smart_completion")
-        self.completer = SQLCompleter(
-            self.smart_completion,
-            supported_formats=self.main_formatter.supported_formats,
-            keyword_casing=keyword_casing,
-            indexed_column_suffix=indexed_column_suffix,
-            config_property_names=get_config_property_names(self.config),
-        )
         self._completer_lock = threading.Lock()
 
         self.min_completion_trigger = c["main"].as_int("min_completion_trigger")
-        # a hack, pending a better way to handle settings and state
-        repl_package.MIN_COMPLETION_TRIGGER = self.min_completion_trigger
         self.last_prompt_message = to_formatted_text('')
         self.last_custom_toolbar_message = to_formatted_text('')
 
@@ -237,19 +240,58 @@ class MyCli(AppStateMixin, OutputMixin, ClientCommandsMixin, ClientConnectionMix
         self.destructive_keywords = destructive_keywords_from_config(c)
         special.set_destructive_keywords(self.destructive_keywords)
 
+    @cached_property
+    def config_without_user_options(self) -> ConfigObj:
+        # only needed in --checkup mode
+        return self.config_views.without_user_options
+
+    # The completer and the refresher which fills it are only needed by the
+    # REPL, so --execute and --batch never import the completion machinery.
+    @cached_property
+    def completer(self) -> SQLCompleter:
+        from mycli.sqlcompleter import SQLCompleter
+
+        return SQLCompleter(
+            self.smart_completion,
+            supported_formats=self.main_formatter.supported_formats,
+            keyword_casing=self.keyword_casing,
+            indexed_column_suffix=self.indexed_column_suffix,
+            config_property_names=get_config_property_names(self.config),
+        )
+
+    @cached_property
+    def completion_refresher(self) -> CompletionRefresher:
+        from mycli.completion_refresher import CompletionRefresher
+
+        return CompletionRefresher(
+            self._invalidate_prompt_session,
+            cache_dir=self.config["main"].get("completion_cache_dir") or None,
+            pool=self.connection_pool,
+        )
+
     def _invalidate_prompt_session(self) -> None:
         if self.prompt_session:
             self.prompt_session.app.invalidate()
 
     def close(self) -> None:
         try:
-            self.completion_refresher.stop()
+            if 'completion_refresher' in vars(self):
+                self.completion_refresher.stop()
         except Exception:
             pass
         try:
             self.schema_prefetcher.stop()
         except Exception:
             pass
+        try:
+            self.connection_pool.close()
+        except Exception:
+            pass
+        try:
+            if self.control_connection is not None:
+                self.control_connection.close()
+        except Exception:
+            pass
         if self.sqlexecute is not None:
             try:
                 self.sqlexecute.close()
@@ -267,4 +309,8 @@ class MyCli(AppStateMixin, OutputMixin, ClientCommandsMixin, ClientConnectionMix
                 pass
 
     def run_cli(self) -> None:
+        from mycli.main_modes import repl as repl_package
+
+        # a hack, pending a better way to handle settings and state
+        repl_package.MIN_COMPLETION_TRIGGER = self.min_completion_trigger
         repl_package.main_repl(self)
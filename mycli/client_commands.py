@@ -12,7 +12,6 @@ import sqlparse
 
 from mycli.compat import WIN
 from mycli.config import write_default_config
-from mycli.main_modes.repl import set_all_external_titles
 from mycli.packages import special
 from mycli.packages.batch_utils import statements_from_filehandle
 from mycli.packages.filepaths import dir_path_exists
@@ -389,6 +388,8 @@ class ClientCommandsMixin:
 
         # todo: this jump back to repl.py is a sign that separation is incomplete.
         # also: it should not be needed.  Don't titles update on every new prompt?
+        from mycli.main_modes.repl import set_all_external_titles
+
         set_all_external_titles(cast(Any, self))
 
         yield SQLResult(status=msg)
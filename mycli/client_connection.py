@@ -62,6 +62,7 @@ class ClientConnectionMixin:
         ssl: dict[str, Any] | None = None,
         init_command: str | None = "",
         unbuffered: bool | None = None,
+        multi_statements: bool | None = None,
         use_keyring: bool | None = None,
         reset_keyring: bool | None = None,
         keepalive_ticks: int | None = None,
@@ -303,6 +304,7 @@ class ClientConnectionMixin:
             'init_command': init_command,
             'unbuffered': unbuffered,
             'display_dsn': display_dsn,
+            'multi_statements': multi_statements,
         }
         if self.ssh_tunnel and self.ssh_tunnel.local_socket:
             connection_info['host'] = None
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import logging
 from typing import IO, TYPE_CHECKING, Any
 
 import click
+import pymysql
 from pymysql.cursors import Cursor
 
 from mycli.packages import special
+from mycli.packages.sql_utils import DDLTarget
 from mycli.packages.sqlresult import SQLResult
-from mycli.sqlcompleter import SQLCompleter
+
+if TYPE_CHECKING:
+    from mycli.sqlcompleter import SQLCompleter
+
+_logger = logging.getLogger(__name__)
 
 
 class QueryError(Exception):
@@ -64,6 +71,41 @@ class ClientQueryMixin:
 
         return [SQLResult(status="Auto-completion refresh started in the background.")]
 
+    def refresh_changed_objects(self, targets: list[DDLTarget]) -> bool:
+        """Patch the completions for objects changed by DDL, in place.
+
+        Each changed table costs one small metadata query, and routines and
+        databases cost none.  Returns False, having changed nothing, when a
+        full refresh is needed instead.
+        """
+        if self.completion_refresher.is_refreshing():
+            # The refresh may have read the catalog before the DDL ran.
+            return False
+        assert self.sqlexecute is not None
+        dbname = self.sqlexecute.dbname
+        tables = {}
+        try:
+            for target in targets:
+                schema = target.schema or dbname
+                if target.kind == 'table' and schema and (schema, target.name) not in tables:
+                    tables[(schema, target.name)] = self.sqlexecute.table_metadata(target.name, schema)
+        except pymysql.Error as e:
+            _logger.error('could not refresh completions for %r: %r', targets, e)
+            return False
+
+        with self._completer_lock:
+            for (schema, table), metadata in tables.items():
+                self.completer.update_table_metadata(schema, table, *metadata)
+            for target in targets:
+                schema = target.schema or dbname
+                if target.kind == 'database':
+                    self.completer.update_database_name(target.name, dropped=target.dropped)
+                elif target.kind == 'function' and schema:
+                    self.completer.update_routine_metadata(schema, 'functions', target.name, dropped=target.dropped)
+                elif target.kind == 'procedure' and schema:
+                    self.completer.update_routine_metadata(schema, 'procedures', target.name, dropped=target.dropped)
+        return True
+
     def _on_completions_refreshed(self, new_completer: SQLCompleter) -> None:
         """Swap the completer object in cli with the newly created completer."""
         with self._completer_lock:
@@ -93,24 +135,11 @@ class ClientQueryMixin:
             self.checkpoint = click.open_file(checkpoint, mode='a')
         results = self.sqlexecute.run(query)
         for result in results:
-            self.main_formatter.query = query
-            self.redirect_formatter.query = query
-            self.explorer_formatter.query = query
             if result.is_error and raise_on_error:
                 message = result.status_plain or 'Query failed.'
                 self.log_output(message)
                 raise QueryError(message)
-            output = self.format_sqlresult(
-                result,
-                is_expanded=special.is_expanded_output(),
-                is_redirected=special.is_redirected(),
-                null_string=self.null_string,
-                numeric_alignment=self.numeric_alignment,
-                binary_display=self.binary_display,
-            )
-            for line in output:
-                self.log_output(line)
-                click.echo(line, nl=new_line)
+            self._echo_result(query, result, new_line)
 
             # get and display warnings if enabled
             if special.is_show_warnings_enabled() and isinstance(result.rows, Cursor) and result.rows.warning_count > 0:
@@ -131,6 +160,61 @@ class ClientQueryMixin:
             self.checkpoint.write(query.rstrip('\n') + '\n')
             self.checkpoint.flush()
 
+    def run_packed_queries(
+        self,
+        queries: list[str],
+        checkpoint: str | None = None,
+        new_line: bool = True,
+    ) -> None:
+        """Runs plain SQL *queries* in a single multi-statement round-trip.
+
+        Each query must produce a single result.  Queries are written to
+        the checkpoint file once their results have been shown, so that a
+        failure part-way through records exactly the queries which succeeded.
+        """
+        assert self.sqlexecute is not None
+        for query in queries:
+            self.log_query(query)
+        if checkpoint and not self.checkpoint:
+            self.checkpoint = click.open_file(checkpoint, mode='a')
+        completed = 0
+        shown = 0
+        try:
+            for index, result in self.sqlexecute.run_packed(queries):
+                self._checkpoint_queries(queries[completed:index])
+                completed = index
+                self._echo_result(queries[index], result, new_line)
+                shown = index + 1
+        except Exception:
+            # the failing query is the one after the last result shown
+            self._checkpoint_queries(queries[completed:shown])
+            raise
+        self._checkpoint_queries(queries[completed:])
+
+    def _echo_result(self, query: str, result: SQLResult, new_line: bool) -> None:
+        """Format *result* of *query* and echo it, logging each line."""
+        self.main_formatter.query = query
+        self.redirect_formatter.query = query
+        self.explorer_formatter.query = query
+        output = self.format_sqlresult(
+            result,
+            is_expanded=special.is_expanded_output(),
+            is_redirected=special.is_redirected(),
+            null_string=self.null_string,
+            numeric_alignment=self.numeric_alignment,
+            binary_display=self.binary_display,
+        )
+        for line in output:
+            self.log_output(line)
+            click.echo(line, nl=new_line)
+
+    def _checkpoint_queries(self, queries: list[str]) -> None:
+        if not self.checkpoint or not queries:
+            return
+        for query in queries:
+            self.checkpoint.write(query.rstrip('\n') + '\n')
+        self.checkpoint.flush()
+
     def get_last_query(self) -> str | None:
         """Get the last query executed or None."""
         return self.query_history[-1][0] if self.query_history else None
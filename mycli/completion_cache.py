@@ -0,0 +1,110 @@
+"""On-disk cache of completion metadata, keyed by server, user and schema.
+
+A completion refresh first restores the cached completer state, if there is
+any, so that completions are available before the server has been asked for
+anything.  The cache is then revalidated against a fingerprint of the schema
+computed by the server, and the full refresh only runs when it has changed.
+
+The state is stored with `marshal`, which is compact and quick to load but
+specific to the Python version, so the version is part of the file header.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import marshal
+import os
+import sys
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from mycli import __version__
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from mycli.sqlcompleter import SQLCompleter
+
+_logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+
+# The SQLCompleter attributes populated by the completion refreshers.
+CACHED_ATTRIBUTES = (
+    'dbname',
+    'databases',
+    'users',
+    'character_sets',
+    'collations',
+    'show_items',
+    'special_commands',
+    'keywords',
+    'functions',
+    'dbmetadata',
+    'all_completions',
+)
+
+
+class CachedCompletions(NamedTuple):
+    fingerprint: tuple
+    state: dict[str, Any]
+
+
+def _header() -> tuple:
+    return (CACHE_FORMAT_VERSION, __version__, tuple(sys.version_info[:2]))
+
+
+def cache_path(
+    cache_dir: str,
+    host: str | None,
+    port: int | None,
+    socket: str | None,
+    user: str | None,
+    schema: str | None,
+) -> str:
+    """Return the cache file for completions of *schema* on a server."""
+    key = '\0'.join(str(part or '') for part in (host, port, socket, user, schema))
+    digest = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+    return os.path.join(os.path.expanduser(cache_dir), f'{digest}.cache')
+
+
+def load(path: str) -> CachedCompletions | None:
+    """Read the cached completions at *path*, or None if they are missing,
+    unreadable, or were written by another version."""
+    try:
+        with open(path, 'rb') as f:
+            header, fingerprint, state = marshal.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, TypeError) as e:
+        _logger.debug('ignoring unreadable completion cache %r: %r', path, e)
+        return None
+    if header != _header():
+        return None
+    return CachedCompletions(fingerprint, state)
+
+
+def save(path: str, fingerprint: tuple, completer: SQLCompleter) -> None:
+    """Write the state of *completer* to *path*, replacing it atomically."""
+    state = {name: getattr(completer, name) for name in CACHED_ATTRIBUTES}
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        data = marshal.dumps((_header(), tuple(fingerprint), state))
+        # the cache holds schema and user names, so only the owner may read it
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except (OSError, ValueError) as e:
+        _logger.error('could not write completion cache %r: %r', path, e)
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def restore(completer: SQLCompleter, state: dict[str, Any]) -> None:
+    """Populate *completer* from cached *state*."""
+    for name in CACHED_ATTRIBUTES:
+        if name in state:
+            setattr(completer, name, state[name])
+    completer.metadata_generation += 1
@@ -5,6 +5,8 @@ from typing import Callable
 import pymysql
 from pymysql.constants.ER import BAD_DB_ERROR
 
+from mycli import completion_cache
+from mycli.connection_pool import ConnectionPool
 from mycli.packages.special.main import COMMANDS
 from mycli.packages.sqlresult import SQLResult
 from mycli.sqlcompleter import SQLCompleter
@@ -16,7 +18,12 @@ MIN_COMPLETION_REFRESH_MESSAGE_SECONDS = 1.0
 class CompletionRefresher:
     refreshers: dict = {}
 
-    def __init__(self, invalidate_app: Callable[[], None] | None = None) -> None:
+    def __init__(
+        self,
+        invalidate_app: Callable[[], None] | None = None,
+        cache_dir: str | None = None,
+        pool: ConnectionPool | None = None,
+    ) -> None:
         self._completer_thread: threading.Thread | None = None
         self._restart_refresh = threading.Event()
         self._stop_refresh = threading.Event()
@@ -25,6 +32,8 @@ class CompletionRefresher:
         self._refresh_visible_until = 0.0
         self._visibility_timer: threading.Timer | None = None
         self._invalidate_app = invalidate_app
+        self.cache_dir = cache_dir
+        self.pool = pool
 
     def refresh(
         self,
@@ -99,33 +108,50 @@ class CompletionRefresher:
     ) -> None:
         completer = SQLCompleter(**completer_options)
 
-        # Create a new sqlexecute method to populate the completions.
+        # If callbacks is a single function then push it into a list.
+        if callable(callbacks):
+            callbacks = [callbacks]
+
+        # Offer cached completions while the server is consulted.
         e = sqlexecute
+        cache_file = self._cache_file(e)
+        cached = completion_cache.load(cache_file) if cache_file else None
+        if cached is not None and not self._stop_refresh.is_set():
+            cached_completer = SQLCompleter(**completer_options)
+            completion_cache.restore(cached_completer, cached.state)
+            for callback in callbacks:
+                callback(cached_completer)
+
+        # Borrow or create a sqlexecute to populate the completions.
         try:
-            executor = SQLExecute(
-                e.dbname,
-                e.user,
-                e.password,
-                e.host,
-                e.port,
-                e.socket,
-                e.character_set,
-                e.local_infile,
-                e.ssl,
-            )
+            if self.pool is not None:
+                executor = self.pool.acquire(e)
+            else:
+                executor = SQLExecute(
+                    e.dbname,
+                    e.user,
+                    e.password,
+                    e.host,
+                    e.port,
+                    e.socket,
+                    e.character_set,
+                    e.local_infile,
+                    e.ssl,
+                )
         except pymysql.err.OperationalError:
             self._finish_refreshing()
             return
 
         with self._executor_lock:
             self._active_executor = executor
+        discard = False
         try:
             if self._stop_refresh.is_set():
                 return
 
-            # If callbacks is a single function then push it into a list.
-            if callable(callbacks):
-                callbacks = [callbacks]
+            fingerprint = executor.schema_fingerprint() if cache_file else None
+            if cached is not None and fingerprint is not None and fingerprint == cached.fingerprint:
+                return
 
             while 1:
                 for refresher in self.refreshers.values():
@@ -145,12 +171,16 @@ class CompletionRefresher:
                 continue
 
             if not self._stop_refresh.is_set():
+                if cache_file and fingerprint is not None:
+                    completion_cache.save(cache_file, fingerprint, completer)
                 for callback in callbacks:
                     callback(completer)
         except pymysql.err.OperationalError as error:
+            discard = True
             if not self._stop_refresh.is_set() and error.args[0] != BAD_DB_ERROR:
                 raise
         except Exception:
+            discard = True
             if not self._stop_refresh.is_set():
                 raise
         finally:
@@ -158,13 +188,28 @@ class CompletionRefresher:
                 if self._active_executor is executor:
                     self._active_executor = None
             try:
-                executor.close()
+                if self.pool is not None:
+                    self.pool.release(executor, discard=discard or self._stop_refresh.is_set())
+                else:
+                    executor.close()
             except Exception:
                 if not self._stop_refresh.is_set():
                     raise
             finally:
                 self._finish_refreshing()
 
+    def _cache_file(self, sqlexecute: SQLExecute) -> str | None:
+        if not self.cache_dir:
+            return None
+        return completion_cache.cache_path(
+            self.cache_dir,
+            sqlexecute.host,
+            sqlexecute.port,
+            sqlexecute.socket,
+            sqlexecute.user,
+            sqlexecute.dbname,
+        )
+
     def _finish_refreshing(self) -> None:
         self._invalidate()
         remaining = self._refresh_visible_until - monotonic()
@@ -1,4 +1,5 @@
 from copy import copy
+from functools import cached_property
 from importlib import resources
 from io import BytesIO, TextIOWrapper
 import logging
@@ -108,12 +109,60 @@ def read_config_files(
         _config = read_config_file(_file, list_values=list_values)
 
         if _config is not None:
-            config.merge(_config)
-            config.filename = _config.filename
+            _merge_config(config, _config)
 
     return config
 
 
+def _merge_config(config: ConfigObj, other: ConfigObj) -> None:
+    config.merge(other)
+    config.filename = other.filename
+
+
+class ConfigViews:
+    """The config files in *files* seen with and without the package
+    defaults, and the package defaults on their own.
+
+    Each file is read and parsed once, however many of the views are used,
+    and each view is only composed the first time it is used.  The views can
+    be changed and written independently.
+    """
+
+    def __init__(self, files: list[str | IO[str]], list_values: bool = True) -> None:
+        self.files = list(files)
+        self.list_values = list_values
+
+    @cached_property
+    def _user_configs(self) -> list[ConfigObj]:
+        configs = (read_config_file(f, list_values=self.list_values) for f in self.files)
+        return [config for config in configs if config is not None]
+
+    @cached_property
+    def config(self) -> ConfigObj:
+        """The same as ``read_config_files(files)``."""
+        config = create_default_config(list_values=self.list_values)
+        for user_config in self._user_configs:
+            config.merge(user_config.dict())
+            config.filename = user_config.filename
+        return config
+
+    @cached_property
+    def without_package_defaults(self) -> ConfigObj:
+        """The same as ``read_config_files(files, ignore_package_defaults=True)``."""
+        # Merging shares the sections of the parsed files, comments and all,
+        # with this view, so compose the other one from them first.
+        _ = self.config
+        config = ConfigObj()
+        for user_config in self._user_configs:
+            _merge_config(config, user_config)
+        return config
+
+    @cached_property
+    def without_user_options(self) -> ConfigObj:
+        """The same as ``read_config_files(files, ignore_user_options=True)``."""
+        return create_default_config(list_values=self.list_values)
+
+
 def create_default_config(list_values: bool = True) -> ConfigObj:
     import mycli
 
@@ -0,0 +1,236 @@
+"""A small pool of warm connections for background metadata work.
+
+The completion refresher and the schema prefetcher used to open a fresh
+`SQLExecute` every time they ran, paying for the TCP and TLS handshakes,
+authentication and the connection-id and version probes each time, which
+is slow through an SSH or Boundary tunnel.  They now borrow connections
+from a pool owned by `MyCli` and hand them back when done.
+
+Connections are keyed by everything but the database, which is switched
+with ``USE`` when it differs.  Idle connections are kept for a while, are
+checked with a ping before being lent out again, and any beyond the size
+of the pool are closed when returned.
+
+`ControlConnection` keeps one more connection open beside the interactive
+one, so that Ctrl-C can send ``KILL QUERY`` at once instead of connecting
+first, and without reconnecting the interrupted session.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+import logging
+import threading
+from time import monotonic
+from typing import Iterator
+
+import pymysql
+
+from mycli.sqlexecute import SQLExecute
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_POOL_IDLE_SECONDS = 300.0
+DEFAULT_CONTROL_KEEPALIVE_SECONDS = 60.0
+
+
+def _connection_key(sqlexecute: SQLExecute) -> tuple:
+    return (
+        sqlexecute.user,
+        sqlexecute.password,
+        sqlexecute.host,
+        sqlexecute.port,
+        sqlexecute.socket,
+        sqlexecute.character_set,
+        sqlexecute.local_infile,
+        repr(sqlexecute.ssl),
+    )
+
+
+class ConnectionPool:
+    """Lend out connections like a template `SQLExecute`, reusing idle ones.
+
+    max_size - the number of idle connections kept; 0 disables pooling.
+    max_idle - seconds after which an idle connection is closed.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_POOL_SIZE, max_idle: float = DEFAULT_POOL_IDLE_SECONDS) -> None:
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle: list[tuple[tuple, float, SQLExecute]] = []
+
+    def acquire(self, sqlexecute: SQLExecute) -> SQLExecute:
+        """Return a connection to the server and database of *sqlexecute*."""
+        key = _connection_key(sqlexecute)
+        now = monotonic()
+        with self._lock:
+            stale = [executor for entry_key, released, executor in self._idle if entry_key != key or now - released > self.max_idle]
+            self._idle = [entry for entry in self._idle if entry[2] not in stale]
+        for executor in stale:
+            self._close(executor)
+
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                _key, _released, executor = self._idle.pop()
+            if self._revive(executor, sqlexecute.dbname):
+                return executor
+            self._close(executor)
+
+        return SQLExecute(
+            sqlexecute.dbname,
+            sqlexecute.user,
+            sqlexecute.password,
+            sqlexecute.host,
+            sqlexecute.port,
+            sqlexecute.socket,
+            sqlexecute.character_set,
+            sqlexecute.local_infile,
+            sqlexecute.ssl,
+        )
+
+    def release(self, executor: SQLExecute, discard: bool = False) -> None:
+        """Return *executor* to the pool, or close it if *discard* is set,
+        it was closed, or the pool is full."""
+        conn = executor.conn
+        if not discard and conn is not None and conn.open:
+            with self._lock:
+                if len(self._idle) < self.max_size:
+                    self._idle.append((_connection_key(executor), monotonic(), executor))
+                    return
+        self._close(executor)
+
+    @contextmanager
+    def connection(self, sqlexecute: SQLExecute) -> Iterator[SQLExecute]:
+        """Borrow a connection for the duration of a ``with`` block.  It is
+        discarded if the block raises."""
+        executor = self.acquire(sqlexecute)
+        try:
+            yield executor
+        except BaseException:
+            self.release(executor, discard=True)
+            raise
+        self.release(executor)
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for _key, _released, executor in idle:
+            self._close(executor)
+
+    @staticmethod
+    def _revive(executor: SQLExecute, dbname: str | None) -> bool:
+        """Check that an idle *executor* still works, and switch it to *dbname*."""
+        conn = executor.conn
+        if conn is None:
+            return False
+        try:
+            conn.ping(reconnect=False)
+            if executor.dbname != dbname:
+                if not dbname:
+                    return False
+                executor.change_db(dbname)
+        except pymysql.Error as e:
+            _logger.debug('discarding pooled connection: %r', e)
+            return False
+        return True
+
+    @staticmethod
+    def _close(executor: SQLExecute) -> None:
+        try:
+            executor.close()
+        except Exception:  # pragma: no cover - defensive
+            pass
+
+
+class ControlConnection:
+    """A spare connection used to kill queries running on the main one.
+
+    keepalive - seconds after which the connection is pinged again before
+    the next query.
+    """
+
+    def __init__(self, keepalive: float = DEFAULT_CONTROL_KEEPALIVE_SECONDS) -> None:
+        self.keepalive = keepalive
+        self._lock = threading.Lock()
+        self._executor: SQLExecute | None = None
+        self._key: tuple | None = None
+        self._checked = 0.0
+        self._thread: threading.Thread | None = None
+
+    def warm_up(self, sqlexecute: SQLExecute) -> None:
+        """Make sure, in the background, that a connection to the server of
+        *sqlexecute* is open by the time a query may need killing."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if self._key == _connection_key(sqlexecute) and monotonic() - self._checked < self.keepalive:
+            return
+        self._thread = threading.Thread(target=self._warm_up, args=(sqlexecute,), name='control_connection')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _warm_up(self, sqlexecute: SQLExecute) -> None:
+        try:
+            with self._lock:
+                self._ensure(sqlexecute)
+        except Exception as e:
+            _logger.debug('could not open control connection: %r', e)
+
+    def kill_query(self, sqlexecute: SQLExecute, connection_id: int) -> None:
+        """Kill the statement running on *connection_id*, reconnecting once
+        if the control connection has gone away."""
+        with self._lock:
+            for attempt in range(2):
+                executor = self._ensure(sqlexecute, check=attempt > 0)
+                assert executor.conn is not None
+                try:
+                    with executor.conn.cursor() as cur:
+                        cur.execute(f'KILL QUERY {int(connection_id)}')
+                    return
+                except pymysql.OperationalError as e:
+                    if attempt:
+                        raise
+                    _logger.debug('reconnecting control connection: %r', e)
+                    self._discard()
+
+    def close(self) -> None:
+        with self._lock:
+            self._discard()
+
+    def _ensure(self, sqlexecute: SQLExecute, check: bool = True) -> SQLExecute:
+        """Return an open connection to the server of *sqlexecute*.  The
+        lock must be held."""
+        key = _connection_key(sqlexecute)
+        executor = self._executor
+        if executor is not None and self._key == key and executor.conn is not None:
+            if not check or monotonic() - self._checked < self.keepalive:
+                return executor
+            try:
+                executor.conn.ping(reconnect=False)
+                self._checked = monotonic()
+                return executor
+            except pymysql.Error as e:
+                _logger.debug('control connection lost: %r', e)
+        self._discard()
+        executor = SQLExecute(
+            None,
+            sqlexecute.user,
+            sqlexecute.password,
+            sqlexecute.host,
+            sqlexecute.port,
+            sqlexecute.socket,
+            sqlexecute.character_set,
+            sqlexecute.local_infile,
+            sqlexecute.ssl,
+        )
+        self._executor, self._key, self._checked = executor, key, monotonic()
+        return executor
+
+    def _discard(self) -> None:
+        executor, self._executor, self._key = self._executor, None, None
+        if executor is not None:
+            ConnectionPool._close(executor)
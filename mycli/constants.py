@@ -35,6 +35,9 @@ TEST_DATABASE = 'mycli_test_db'
 DEFAULT_WIDTH = 80
 DEFAULT_HEIGHT = 25
 
+# Rows per Parquet row group, or Arrow record batch, in streamed exports.
+DEFAULT_ROW_GROUP_SIZE = 100_000
+
 # MySQL error codes not available in pymysql.constants.ER
 ER_MUST_CHANGE_PASSWORD_LOGIN = 1862
 ER_MUST_CHANGE_PASSWORD = 1820
@@ -296,10 +296,18 @@ class CliArgs:
         default=0.0,
         help='Pause in seconds between queries in batch mode.',
     )
+    batch_pack: int | None = clickdc.option(
+        type=int,
+        help='In batch mode, send up to <int> plain statements to the server in each round-trip.',
+    )
     progress: bool = clickdc.option(
         is_flag=True,
         help='Show progress on the standard error with --batch.',
     )
+    progress_count: bool = clickdc.option(
+        is_flag=True,
+        help='With --progress, count statements in the background to show a total.',
+    )
     use_keyring: str | None = clickdc.option(
         type=click.Choice(['auto', 'true', 'false', 'reset']),
         default=None,
@@ -425,6 +433,10 @@ def preprocess_cli_args(
         click.secho('Error: --resume requires a --batch file.', err=True, fg='red')
         sys.exit(1)
 
+    if cli_args.batch_pack is not None and cli_args.batch_pack < 1:
+        click.secho('Error: --batch-pack must be at least 1.', err=True, fg='red')
+        sys.exit(1)
+
     if (
         cli_args.checkpoint
         and os.path.exists(cli_args.checkpoint)
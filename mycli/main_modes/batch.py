@@ -1,30 +1,155 @@
 from __future__ import annotations
 
 import os
+import queue
 import sys
+import threading
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Generic, Iterable, Iterator, TypeVar
 
 import click
 import prompt_toolkit
+from prompt_toolkit.formatted_text import AnyFormattedText
+from prompt_toolkit.layout.dimension import AnyDimension, D
 from prompt_toolkit.shortcuts import ProgressBar
 from prompt_toolkit.shortcuts.progress_bar import formatters as progress_bar_formatters
 import pymysql
 from yaspin import yaspin
 
-from mycli.packages.batch_utils import statements_from_filehandle
+from mycli.packages import special
+from mycli.packages.batch_utils import statements_and_offsets_from_filehandle, statements_from_filehandle
 from mycli.packages.interactive_utils import confirm_destructive_query
 from mycli.packages.sql_utils import is_destructive
 
 if TYPE_CHECKING:
+    from prompt_toolkit.shortcuts.progress_bar.base import ProgressBarCounter
+
     from mycli.client import MyCli
     from mycli.main import CliArgs
 
+# how many parsed statements may wait ahead of the one being executed
+BATCH_PIPELINE_DEPTH = 64
+
+_BatchItem = TypeVar('_BatchItem', tuple[str, int], tuple[str, int, int])
+_PIPELINE_DONE = object()
+UNPACKABLE_PREFIXES = ('call', 'delimiter')
+UNPACKABLE_SUFFIXES = ('\\g', '\\G', '\\x')
+
 
 class CheckpointReplayError(Exception):
     pass
 
 
+class BatchPipeline(threading.Thread, Generic[_BatchItem]):
+    """Split and classify batch statements on a worker thread.
+
+    Items from *statements* (tuples whose first element is the statement)
+    are queued ahead of execution, paired with whether the statement is
+    destructive, so that the client-side parsing overlaps with the server
+    running earlier statements.  Iterating the pipeline yields the items in
+    their original order, and re-raises any error from reading the input at
+    the point where it occurred.
+    """
+
+    def __init__(
+        self,
+        statements: Iterable[_BatchItem],
+        destructive_keywords: list[str] | None = None,
+        depth: int = BATCH_PIPELINE_DEPTH,
+    ) -> None:
+        super().__init__(name='mycli-batch-pipeline', daemon=True)
+        self._statements: Iterable[_BatchItem] = statements
+        self._destructive_keywords = destructive_keywords
+        self._queue: queue.Queue[object] = queue.Queue(maxsize=depth)
+        self._stopped = threading.Event()
+
+    def _put(self, entry: object) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self) -> None:
+        try:
+            for item in self._statements:
+                destructive = self._destructive_keywords is not None and is_destructive(self._destructive_keywords, item[0])
+                if not self._put((item, destructive)):
+                    return
+        except Exception as e:
+            self._put(e)
+            return
+        self._put(_PIPELINE_DONE)
+
+    def __iter__(self) -> Iterator[tuple[_BatchItem, bool]]:
+        if self.ident is None:
+            self.start()
+        while True:
+            entry = self._queue.get()
+            if entry is _PIPELINE_DONE:
+                return
+            if isinstance(entry, Exception):
+                raise entry
+            yield entry  # type: ignore[misc]
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+class StatementCounter(threading.Thread):
+    """Count the statements in a batch file in the background, so that
+    execution need not wait for the count."""
+
+    def __init__(self, batch_path: str) -> None:
+        super().__init__(name='mycli-batch-counter', daemon=True)
+        self.batch_path = batch_path
+        self.count = 0
+        self.finished = False
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        try:
+            with click.open_file(self.batch_path) as batch_h:
+                for _statement, _counter in statements_from_filehandle(batch_h):
+                    if self._stopped.is_set():
+                        return
+                    self.count += 1
+        except (OSError, ValueError):
+            return
+        self.finished = True
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+class StatementProgress(progress_bar_formatters.Formatter):
+    """Display the number of statements run, against the total from a
+    StatementCounter when one is running."""
+
+    def __init__(self, counter: StatementCounter | None = None) -> None:
+        self.counter = counter
+        self.completed = 0
+
+    def _text(self) -> str:
+        if self.counter is None:
+            return f'{self.completed} statements'
+        total = f'{self.counter.count}' if self.counter.finished else f'{self.counter.count}+'
+        return f'{self.completed}/{total} statements'
+
+    def format(
+        self,
+        progress_bar: ProgressBar,
+        progress: ProgressBarCounter[object],
+        width: int,
+    ) -> AnyFormattedText:
+        return self._text().rjust(width)
+
+    def get_width(self, progress_bar: ProgressBar) -> AnyDimension:
+        return D(min=len(self._text()))
+
+
 def replay_checkpoint_file(
     batch_path: str,
     checkpoint_path: str | None,
@@ -89,12 +214,7 @@ def replay_checkpoint_file(
     return completed_count
 
 
-def dispatch_batch_statements(
-    mycli: 'MyCli',
-    cli_args: 'CliArgs',
-    statements: str,
-    batch_counter: int,
-) -> None:
+def set_batch_output_format(mycli: 'MyCli', cli_args: 'CliArgs', batch_counter: int) -> None:
     if batch_counter:
         if cli_args.format == 'csv':
             mycli.main_formatter.format_name = 'csv-noheader'
@@ -114,8 +234,20 @@ def dispatch_batch_statements(
         else:
             mycli.main_formatter.format_name = 'tsv'
 
+
+def dispatch_batch_statements(
+    mycli: 'MyCli',
+    cli_args: 'CliArgs',
+    statements: str,
+    batch_counter: int,
+    destructive: bool | None = None,
+) -> None:
+    set_batch_output_format(mycli, cli_args, batch_counter)
+
+    if destructive is None:
+        destructive = cli_args.warn_batch and is_destructive(mycli.destructive_keywords, statements)
     execution_confirmed: bool | None = True
-    if cli_args.warn_batch and is_destructive(mycli.destructive_keywords, statements):
+    if cli_args.warn_batch and destructive:
         try:
             # this seems to work, even though we are reading from stdin above
             sys.stdin = open('/dev/tty')
@@ -129,8 +261,83 @@ def dispatch_batch_statements(
         mycli.run_query(statements, checkpoint=cli_args.checkpoint, new_line=True)
 
 
+def strip_leading_comments(statement: str) -> str:
+    """*statement* without the comments and whitespace before its first word.
+
+    Executable comments (``/*! ... */``) are kept, since the server runs them.
+    """
+    statement = statement.lstrip()
+    while True:
+        if statement.startswith(('--', '#')):
+            _comment, _newline, statement = statement.partition('\n')
+        elif statement.startswith('/*') and not statement.startswith('/*!'):
+            _comment, end, rest = statement[2:].partition('*/')
+            statement = rest if end else ''
+        else:
+            return statement
+        statement = statement.lstrip()
+
+
+def is_packable_statement(statement: str, destructive: bool) -> bool:
+    """Whether *statement* may share a multi-statement round-trip with others."""
+    if destructive:
+        return False
+    if special.get_current_delimiter() != ';':
+        return False
+    if not statement.rstrip(';').strip():
+        return False
+    if statement.endswith(UNPACKABLE_SUFFIXES):
+        return False
+    words = strip_leading_comments(statement).split(None, 1)
+    if not words or words[0].startswith('/*!') or words[0].lower().rstrip(';') in UNPACKABLE_PREFIXES:
+        return False
+    return not special.is_special_command(statement.rstrip(';'))
+
+
+class BatchPacker:
+    """Group consecutive plain statements into multi-statement round-trips
+    of up to --batch-pack statements, dispatching anything else on its own.
+
+    The first statement of a batch is always sent alone, so that only its
+    output carries a header.
+    """
+
+    def __init__(self, mycli: 'MyCli', cli_args: 'CliArgs') -> None:
+        self.mycli = mycli
+        self.cli_args = cli_args
+        self.pack_size = cli_args.batch_pack or 1
+        if cli_args.throttle > 0 or special.is_show_warnings_enabled():
+            self.pack_size = 1
+        self.pending: list[tuple[str, int]] = []
+
+    def add(self, statement: str, counter: int, destructive: bool) -> None:
+        if self.pack_size > 1 and counter > 0 and is_packable_statement(statement, destructive):
+            self.pending.append((statement, counter))
+            if len(self.pending) >= self.pack_size:
+                self.flush()
+            return
+        self.flush()
+        dispatch_batch_statements(self.mycli, self.cli_args, statement, counter, destructive=destructive)
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        if len(pending) == 1:
+            statement, counter = pending[0]
+            dispatch_batch_statements(self.mycli, self.cli_args, statement, counter, destructive=False)
+            return
+        set_batch_output_format(self.mycli, self.cli_args, pending[0][1])
+        self.mycli.run_packed_queries([statement for statement, _counter in pending], checkpoint=self.cli_args.checkpoint, new_line=True)
+
+
+def batch_pipeline(mycli: 'MyCli', cli_args: 'CliArgs', statements: Iterable[_BatchItem]) -> BatchPipeline[_BatchItem]:
+    if cli_args.warn_batch or (cli_args.batch_pack or 1) > 1:
+        return BatchPipeline(statements, mycli.destructive_keywords)
+    return BatchPipeline(statements)
+
+
 def main_batch_with_progress_bar(mycli: 'MyCli', cli_args: 'CliArgs') -> int:
-    goal_statements = 0
     if cli_args.batch is None:
         return 1
     if not sys.stdin.isatty() and cli_args.batch != '-':
@@ -140,47 +347,56 @@ def main_batch_with_progress_bar(mycli: 'MyCli', cli_args: 'CliArgs') -> int:
         return 1
     try:
         completed_statement_count = replay_checkpoint_file(cli_args.batch, cli_args.checkpoint, cli_args.resume, progress=True)
-        batch_count_h = click.open_file(cli_args.batch)
-        with yaspin(text='validating batch    ', side='right', stream=sys.stderr) as spinner:
-            for _statement, _counter in statements_from_filehandle(batch_count_h):
-                goal_statements += 1
-            spinner.ok('✔')
-        batch_count_h.close()
         batch_h = click.open_file(cli_args.batch)
-        batch_gen = statements_from_filehandle(batch_h)
+        goal_bytes = os.path.getsize(cli_args.batch)
     except (OSError, FileNotFoundError):
         click.secho(f'Failed to open --batch file: {cli_args.batch}', err=True, fg='red')
         return 1
-    except ValueError as e:
-        click.secho(f'Error reading --batch file: {cli_args.batch}: {e}', err=True, fg='red')
-        return 1
     except CheckpointReplayError as e:
         name = cli_args.checkpoint if cli_args.checkpoint else 'None'
         click.secho(f'Error replaying --checkpoint file: {name}: {e}', err=True, fg='red')
         return 1
+    statement_counter: StatementCounter | None = None
+    if cli_args.progress_count:
+        statement_counter = StatementCounter(cli_args.batch)
+        statement_counter.start()
+    statement_progress = StatementProgress(statement_counter)
+    pipeline = None
     try:
-        if goal_statements:
-            pb_style = prompt_toolkit.styles.Style.from_dict({'bar-a': 'reverse'})
-            custom_formatters = [
-                progress_bar_formatters.Bar(start='running queries      [', end=']', sym_a=' ', sym_b=' ', sym_c=' '),
-                progress_bar_formatters.Text(' '),
-                progress_bar_formatters.Progress(),
-                progress_bar_formatters.Text(' '),
-                progress_bar_formatters.Text('eta ', style='class:time-left'),
-                progress_bar_formatters.TimeLeft(),
-                progress_bar_formatters.Text(' ', style='class:time-left'),
-            ]
-            err_output = prompt_toolkit.output.create_output(stdout=sys.stderr, always_prefer_tty=True)
-            with ProgressBar(style=pb_style, formatters=custom_formatters, output=err_output) as pb:
-                for _pb_counter in pb(range(goal_statements)):
-                    statement, statement_counter = next(batch_gen)
-                    if statement_counter < completed_statement_count:
-                        continue
-                    dispatch_batch_statements(mycli, cli_args, statement, statement_counter)
+        pipeline = batch_pipeline(mycli, cli_args, statements_and_offsets_from_filehandle(batch_h))
+        pb_style = prompt_toolkit.styles.Style.from_dict({'bar-a': 'reverse'})
+        custom_formatters = [
+            progress_bar_formatters.Bar(start='running queries      [', end=']', sym_a=' ', sym_b=' ', sym_c=' '),
+            progress_bar_formatters.Text(' '),
+            progress_bar_formatters.Percentage(),
+            progress_bar_formatters.Text(' '),
+            statement_progress,
+            progress_bar_formatters.Text(' '),
+            progress_bar_formatters.Text('eta ', style='class:time-left'),
+            progress_bar_formatters.TimeLeft(),
+            progress_bar_formatters.Text(' ', style='class:time-left'),
+        ]
+        err_output = prompt_toolkit.output.create_output(stdout=sys.stderr, always_prefer_tty=True)
+        with ProgressBar(style=pb_style, formatters=custom_formatters, output=err_output) as pb:
+            # progress is measured in bytes, so that execution can begin without first counting statements
+            pb_counter: ProgressBarCounter[object] = pb(total=goal_bytes)
+            packer = BatchPacker(mycli, cli_args)
+            for (statement, counter, offset), destructive in pipeline:
+                if counter >= completed_statement_count:
+                    packer.add(statement, counter, destructive)
+                statement_progress.completed = counter + 1
+                pb_counter.items_completed = min(offset, goal_bytes)
+                pb.invalidate()
+            packer.flush()
+            pb_counter.done = True
     except (ValueError, StopIteration, IOError, OSError, pymysql.err.Error) as e:
         click.secho(str(e), err=True, fg='red')
         return 1
     finally:
+        if pipeline is not None:
+            pipeline.stop()
+        if statement_counter is not None:
+            statement_counter.stop()
         batch_h.close()
     return 0
 
@@ -200,25 +416,38 @@ def main_batch_without_progress_bar(mycli: 'MyCli', cli_args: 'CliArgs') -> int:
         name = cli_args.checkpoint if cli_args.checkpoint else 'None'
         click.secho(f'Error replaying --checkpoint file: {name}: {e}', err=True, fg='red')
         return 1
+    pipeline = None
     try:
-        for statement, counter in statements_from_filehandle(batch_h):
+        pipeline = batch_pipeline(mycli, cli_args, statements_from_filehandle(batch_h))
+        packer = BatchPacker(mycli, cli_args)
+        for (statement, counter), destructive in pipeline:
             if counter < completed_statement_count:
                 continue
-            dispatch_batch_statements(mycli, cli_args, statement, counter)
+            packer.add(statement, counter, destructive)
+        packer.flush()
     except (ValueError, StopIteration, IOError, OSError, pymysql.err.Error) as e:
         click.secho(str(e), err=True, fg='red')
         return 1
     finally:
+        if pipeline is not None:
+            pipeline.stop()
         batch_h.close()
     return 0
 
 
 def main_batch_from_stdin(mycli: 'MyCli', cli_args: 'CliArgs') -> int:
     batch_h = click.get_text_stream('stdin')
+    pipeline = None
     try:
-        for statement, counter in statements_from_filehandle(batch_h):
-            dispatch_batch_statements(mycli, cli_args, statement, counter)
+        pipeline = batch_pipeline(mycli, cli_args, statements_from_filehandle(batch_h))
+        packer = BatchPacker(mycli, cli_args)
+        for (statement, counter), destructive in pipeline:
+            packer.add(statement, counter, destructive)
+        packer.flush()
     except (ValueError, StopIteration, IOError, OSError, pymysql.err.Error) as e:
         click.secho(str(e), err=True, fg='red')
         return 1
+    finally:
+        if pipeline is not None:
+            pipeline.stop()
     return 0
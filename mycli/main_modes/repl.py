@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Generator, Iterable
+from collections.abc import Callable, Generator, Iterable
 from dataclasses import dataclass
 from datetime import datetime
 import functools
@@ -12,8 +12,10 @@ import os
 import random
 import re
 import shutil
+import signal
 import subprocess
 import sys
+import threading
 import time
 import traceback
 from typing import TYPE_CHECKING, Any
@@ -23,7 +25,6 @@ import click
 import prompt_toolkit
 from prompt_toolkit.application.current import get_app
 from prompt_toolkit.auto_suggest import AutoSuggestFromHistory, ThreadedAutoSuggest
-from prompt_toolkit.completion import DynamicCompleter
 from prompt_toolkit.enums import DEFAULT_BUFFER, EditingMode
 from prompt_toolkit.filters import Condition, has_focus, is_done
 from prompt_toolkit.formatted_text import (
@@ -43,14 +44,17 @@ from prompt_toolkit.lexers import PygmentsLexer
 from prompt_toolkit.output import ColorDepth
 from prompt_toolkit.shortcuts import CompleteStyle, PromptSession
 import pymysql
+from pymysql.constants import ER
 from pymysql.cursors import Cursor
 
 import mycli as mycli_package
+from mycli.async_completer import AsyncCompleter
 from mycli.clibuffer import cli_is_multiline
 from mycli.clistyle import style_factory_ptoolkit
 from mycli.clitoolbar import create_toolbar_tokens_func, get_vi_mode
 from mycli.compat import WIN
 from mycli.constants import (
+    DEFAULT_HEIGHT,
     DEFAULT_HOST,
     DEFAULT_WIDTH,
     ER_MUST_CHANGE_PASSWORD,
@@ -70,6 +74,7 @@ from mycli.packages.key_binding_utils import (
 from mycli.packages.polars_transform import (
     PolarsTransform,
     PolarsTransformError,
+    is_streamed_export,
     parse_polars_transform,
     prepare_polars_transform,
     run_polars_transform,
@@ -77,6 +82,7 @@ from mycli.packages.polars_transform import (
 from mycli.packages.ptoolkit.history import FileHistoryWithTimestamp
 from mycli.packages.special.utils import format_uptime, get_ssl_version, get_uptime, get_warning_count
 from mycli.packages.sql_utils import (
+    ddl_targets,
     extract_new_password,
     is_dropping_database,
     is_mutating,
@@ -88,7 +94,8 @@ from mycli.packages.sql_utils import (
 )
 from mycli.packages.sqlresult import SQLResult
 from mycli.packages.string_utils import sanitize_terminal_title
-from mycli.sqlexecute import SQLExecute
+from mycli.packages.watch_screen import WatchScreen
+from mycli.sqlexecute import SQLExecute, is_server_error
 from mycli.types import Query
 
 if TYPE_CHECKING:
@@ -465,6 +472,7 @@ def _output_results(
 
     result_count = 0
     watch_count = 0
+    watch_screen: WatchScreen | None = None
     for result in results:
         mycli.logger.debug('preamble: %r', result.preamble)
         mycli.logger.debug('header: %r', result.header)
@@ -488,6 +496,11 @@ def _output_results(
                     sys.exit(1)
             else:
                 watch_count += 1
+            if result.command.get('clear') and not result.command.get('statement'):
+                if watch_screen is None and not special.is_redirected() and sys.stdout.isatty():
+                    watch_screen = _create_watch_screen(mycli)
+                elif watch_screen is None:
+                    click.clear()
 
         if is_select(result.status_plain) and isinstance(result.rows, Cursor) and result.rows.rowcount > threshold:
             mycli.echo(
@@ -518,17 +531,20 @@ def _output_results(
 
         duration = time.time() - start
         try:
-            if result_count > 0:
-                mycli.echo('')
-            try:
-                mycli.output(formatted, result)
-            except KeyboardInterrupt:
-                pass
+            if watch_screen is not None and result.command is not None and result.command['name'] == 'watch':
+                _draw_watch_result(mycli, watch_screen, formatted, result, _timing_message(duration, result))
+            else:
+                if result_count > 0:
+                    mycli.echo('')
+                try:
+                    mycli.output(formatted, result)
+                except KeyboardInterrupt:
+                    pass
             if mycli.beep_after_seconds > 0 and duration >= mycli.beep_after_seconds:
                 assert mycli.prompt_session is not None
                 mycli.prompt_session.output.bell()
-            if special.is_timing_enabled():
-                mycli.output_timing(f'Time: {duration:0.03f}s')
+            if special.is_timing_enabled() and watch_screen is None:
+                mycli.output_timing(_timing_message(duration, result))
         except KeyboardInterrupt:
             pass
 
@@ -559,6 +575,58 @@ def _output_results(
                 mycli.output_timing(f'Time: {warnings_duration:0.03f}s', is_warnings_style=True)
 
 
+def _timing_message(duration: float, result: SQLResult) -> str:
+    """Return the timing line for *result*, split into the time spent on
+    the server and in the client for the iterations of ``watch``."""
+    message = f'Time: {duration:0.03f}s'
+    if result.command is not None and 'server_seconds' in result.command:
+        server_seconds = float(result.command['server_seconds'])
+        message += f' (server: {server_seconds:0.03f}s, client: {max(duration - server_seconds, 0.0):0.03f}s)'
+    return message
+
+
+def _watch_screen_size(mycli: 'MyCli') -> tuple[int, int]:
+    if mycli.prompt_session is not None:
+        size = mycli.prompt_session.output.get_size()
+        return size.columns, size.rows
+    return DEFAULT_WIDTH, DEFAULT_HEIGHT
+
+
+def _create_watch_screen(mycli: 'MyCli') -> WatchScreen:
+    return WatchScreen(*_watch_screen_size(mycli))
+
+
+def _draw_watch_result(
+    mycli: 'MyCli',
+    screen: WatchScreen,
+    formatted: Iterable[str],
+    result: SQLResult,
+    timing: str,
+) -> None:
+    """Add a result of ``watch -c`` to the next frame, and redraw what
+    changed on screen once every statement of the iteration is in."""
+    assert result.command is not None
+    lines = list(formatted)
+    for line in lines:
+        mycli.log_output(line)
+        special.write_tee(line)
+        special.write_once(line)
+        special.write_pipe_once(line)
+    if result.command.get('statement'):
+        screen.add([''])
+    screen.add(lines)
+    if result.status:
+        mycli.log_output(result.status_plain)
+        screen.add(result.status_plain.split('\n'))
+    if special.is_timing_enabled():
+        mycli.log_output(timing)
+        screen.add([timing])
+    if int(result.command.get('statement', 0)) + 1 >= int(result.command.get('statements', 1)):
+        # the terminal may have been resized since the last frame
+        screen.resize(*_watch_screen_size(mycli))
+        click.echo(screen.render(), nl=False)
+
+
 def _single_paged_output_results(
     mycli: 'MyCli',
     state: ReplState,
@@ -743,8 +811,7 @@ def _build_prompt_session(
                 TabsProcessor(char1=' ', char2=' '),
             ],
             tempfile_suffix='.sql',
-            completer=DynamicCompleter(lambda: mycli.completer),
-            complete_in_thread=True,
+            completer=AsyncCompleter(lambda: mycli.completer),
             history=history,
             auto_suggest=ThreadedAutoSuggest(AutoSuggestFromHistory()),
             complete_while_typing=complete_while_typing_filter,
@@ -765,6 +832,61 @@ def _build_prompt_session(
             mycli.prompt_session.app.ttimeoutlen = mycli.emacs_ttimeoutlen
 
 
+class _QueryCanceller:
+    """A SIGINT handler which, while a statement waits for the server, sends
+    KILL QUERY over the spare control connection and lets the statement's
+    response be read as usual, as the mysql client does.  The connection,
+    and with it the session, is kept.
+
+    An interrupt at any other time, a second one, or one whose kill cannot
+    be sent raises KeyboardInterrupt as before.
+    """
+
+    def __init__(self, mycli: 'MyCli', sqlexecute: SQLExecute) -> None:
+        self.mycli = mycli
+        self.sqlexecute = sqlexecute
+        self.interrupted = False
+        self.killed_id: int | None = None
+        self.previous: Any = None
+
+    @classmethod
+    def install(cls, mycli: 'MyCli', sqlexecute: SQLExecute) -> '_QueryCanceller | None':
+        if mycli.control_connection is None or mycli.sandbox_mode or threading.current_thread() is not threading.main_thread():
+            return None
+        canceller = cls(mycli, sqlexecute)
+        canceller.previous = signal.signal(signal.SIGINT, canceller)
+        return canceller
+
+    def uninstall(self) -> None:
+        signal.signal(signal.SIGINT, self.previous if self.previous is not None else signal.default_int_handler)
+
+    def __call__(self, signum: int, frame: Any) -> None:
+        connection_id = self.sqlexecute.connection_id or 0
+        if self.interrupted or not self.sqlexecute.query_in_flight or connection_id <= 0:
+            raise KeyboardInterrupt
+        self.interrupted = True
+        assert self.mycli.control_connection is not None
+        try:
+            self.mycli.control_connection.kill_query(self.sqlexecute, connection_id)
+        except Exception as e:
+            self.mycli.logger.debug('control connection could not kill query: %r', e)
+            raise KeyboardInterrupt from None
+        self.mycli.logger.debug('sent kill query, connection id: %r', connection_id)
+        self.killed_id = connection_id
+
+
+def _export_progress(output_path: str) -> Callable[[int], None] | None:
+    """A counter of the rows written by a streamed export, shown on the
+    standard error when it is a terminal."""
+    if not sys.stderr.isatty():
+        return None
+
+    def show(rows: int) -> None:
+        click.echo(f'\rWriting {output_path}: {rows:,} rows', err=True, nl=False)
+
+    return show
+
+
 def _one_iteration(
     mycli: 'MyCli',
     state: ReplState,
@@ -903,6 +1025,7 @@ def _one_iteration(
         mycli.completion_refresher.stop()
 
     successful = False
+    canceller: _QueryCanceller | None = None
     try:
         mycli.logger.debug('sql: %r', text)
         polars_transform: PolarsTransform | None = (
@@ -913,8 +1036,12 @@ def _one_iteration(
         special.write_tee(query_history_text)
         mycli.log_query(query_history_text)
 
+        if mycli.control_connection is not None and not mycli.sandbox_mode:
+            mycli.control_connection.warm_up(sqlexecute)
+        canceller = _QueryCanceller.install(mycli, sqlexecute)
         start = time.time()
-        results = sqlexecute.run(text)
+        is_streamed = polars_pipeline is not None and is_streamed_export(polars_pipeline)
+        results = sqlexecute.run(text, unbuffered=True) if is_streamed else sqlexecute.run(text)
         mycli.main_formatter.query = text
         mycli.redirect_formatter.query = text
         mycli.explorer_formatter.query = text
@@ -930,15 +1057,22 @@ def _one_iteration(
                     plot_theme=mycli.plot_theme,
                 )
             else:
-                polars_result = run_polars_transform(
-                    polars_transform,
-                    results,
-                    polars_pipeline.output_path,
-                    image_protocol=mycli.image_protocol,
-                    plot_scale_factor=mycli.plot_scale_factor,
-                    plot_ppi=mycli.plot_ppi,
-                    plot_theme=mycli.plot_theme,
-                )
+                progress = _export_progress(polars_pipeline.output_path) if is_streamed else None
+                try:
+                    polars_result = run_polars_transform(
+                        polars_transform,
+                        results,
+                        polars_pipeline.output_path,
+                        image_protocol=mycli.image_protocol,
+                        plot_scale_factor=mycli.plot_scale_factor,
+                        plot_ppi=mycli.plot_ppi,
+                        plot_theme=mycli.plot_theme,
+                        row_group_size=mycli.export_row_group_size,
+                        progress=progress,
+                    )
+                finally:
+                    if progress is not None:
+                        click.echo('\r\x1b[K', err=True, nl=False)
             if polars_pipeline.output_path is None:
                 if polars_pipeline.output_mode == 'explorer':
                     special.set_explorer_output(True)
@@ -958,7 +1092,8 @@ def _one_iteration(
     except pymysql.err.InterfaceError:
         if not mycli.reconnect():
             return
-        _one_iteration(mycli, state, text)
+        if canceller is None or canceller.killed_id is None:
+            _one_iteration(mycli, state, text)
         return
     except EOFError as e:
         raise e
@@ -999,10 +1134,13 @@ def _one_iteration(
                 err=True,
                 fg='red',
             )
+        elif canceller is not None and canceller.killed_id is not None and e1.args[0] == ER.QUERY_INTERRUPTED:
+            mycli.logger.debug('sql: %r, error: %r', text, e1)
         elif e1.args[0] in (2003, 2006, 2013):
             if not mycli.reconnect():
                 return
-            _one_iteration(mycli, state, text)
+            if canceller is None or canceller.killed_id is None:
+                _one_iteration(mycli, state, text)
             return
         else:
             mycli.logger.error('sql: %r, error: %r', text, e1)
@@ -1012,6 +1150,10 @@ def _one_iteration(
         mycli.logger.error('sql: %r, error: %r', text, e)
         mycli.logger.error('traceback: %r', traceback.format_exc())
         mycli.echo(str(e), err=True, fg='red')
+        if canceller is not None and canceller.killed_id is not None and not is_server_error(e):
+            # The response to the killed statement could not be read, so
+            # the connection is out of step with the server.
+            sqlexecute.connect()
     else:
         if mycli.sandbox_mode and is_password_change(text):
             new_password = extract_new_password(text)
@@ -1035,8 +1177,18 @@ def _one_iteration(
             sqlexecute.connect()
 
         if need_completion_refresh(text):
-            mycli.refresh_completions(reset=dropping_active_database or need_completion_reset(text))
+            reset = dropping_active_database or need_completion_reset(text)
+            # Patch the completions for the objects changed by DDL where
+            # possible, rather than rebuilding them all.
+            targets = None if reset else ddl_targets(text)
+            if targets is None or not mycli.refresh_changed_objects(targets):
+                mycli.refresh_completions(reset=reset)
     finally:
+        if canceller is not None:
+            canceller.uninstall()
+            if canceller.killed_id is not None:
+                mycli.logger.debug('cancelled query, connection id: %r, sql: %r', canceller.killed_id, text)
+                mycli.echo(f'Cancelled query id: {canceller.killed_id}', err=True, fg='blue')
         if dropping_active_database and not successful:
             mycli.refresh_completions()
         if mycli.logfile is False:
@@ -8,7 +8,7 @@ import itertools
 import os
 import shlex
 import shutil
-from typing import Generator, Literal, Protocol
+from typing import Any, Generator, Iterable, Literal, Protocol
 
 from cli_helpers.tabular_output import TabularOutputFormatter, preprocessors
 from cli_helpers.tabular_output.output_formatter import MISSING_VALUE as DEFAULT_MISSING_VALUE
@@ -31,10 +31,9 @@ from pymysql.cursors import Cursor
 
 from mycli.compat import WIN, is_windows_console
 from mycli.constants import DEFAULT_HEIGHT, DEFAULT_WIDTH
-import mycli.main_modes.repl as repl_mode
 from mycli.packages import special
 from mycli.packages.sqlresult import SQLResult
-from mycli.packages.tabular_output import sql_format
+from mycli.packages.tabular_output import sql_format, streaming
 from mycli.sqlexecute import FIELD_TYPES
 
 
@@ -57,6 +56,7 @@ class OutputMixin(MyCliState):
     explorer_command: str
     explorer_trim_footer: bool
     redirect_formatter: TabularOutputFormatter
+    redirect_buffer_size: int
     config: ConfigObj
     logfile: TextIOWrapper | Literal[False] | None
     prompt_session: PromptSession | None
@@ -99,6 +99,8 @@ class OutputMixin(MyCliState):
                 render_counter = self.prompt_session.app.render_counter
             else:
                 render_counter = 0
+            import mycli.main_modes.repl as repl_mode
+
             prompt_string = repl_mode.render_prompt_string(self, self.prompt_format, render_counter)
             self.prompt_lines = to_plain_text(prompt_string).count('\n') + 1
         margin = self.get_reserved_space() + self.prompt_lines
@@ -124,7 +126,9 @@ class OutputMixin(MyCliState):
             elif result.image_protocol == 'kitty':
                 click.secho('')
                 self.output_kitty_image(result.image)
-        if output:
+        if output and special.is_redirected():
+            self.output_redirected(output)
+        elif output:
             if self.prompt_session is not None:
                 size = self.prompt_session.output.get_size()
                 size_columns = size.columns
@@ -135,39 +139,44 @@ class OutputMixin(MyCliState):
 
             margin = self.get_output_margin(result.status_plain)
 
+            def tee_lines() -> Generator[str, None, None]:
+                for line in output:
+                    self.log_output(line)
+                    special.write_tee(line)
+                    special.write_once(line)
+                    special.write_pipe_once(line)
+                    yield line
+
+            def newlinewrapper(text: Iterable[str]) -> Generator[str, None, None]:
+                for line in text:
+                    yield line + "\n"
+
             fits = True
             buf = []
             output_via_pager = self.explicit_pager and special.is_pager_enabled()
-            for i, line in enumerate(output, 1):
-                self.log_output(line)
-                special.write_tee(line)
-                special.write_once(line)
-                special.write_pipe_once(line)
-
-                if special.is_redirected():
-                    pass
-                elif special.is_explorer_output():
+            lines = tee_lines()
+            for i, line in enumerate(lines, 1):
+                if special.is_explorer_output():
+                    buf.append(line)
+                elif output_via_pager:
+                    # the remaining lines are streamed to the pager as they are produced
                     buf.append(line)
-                elif fits or output_via_pager:
+                    break
+                elif fits:
                     buf.append(line)
                     if len(line) > size_columns or i > (size_rows - margin):
                         fits = False
                         if not self.explicit_pager and special.is_pager_enabled():
                             output_via_pager = True
+                            break
 
-                        if not output_via_pager:
-                            for buf_line in buf:
-                                click.secho(buf_line)
-                            buf = []
+                        for buf_line in buf:
+                            click.secho(buf_line)
+                        buf = []
                 else:
                     click.secho(line)
 
             if buf:
-
-                def newlinewrapper(text: list[str]) -> Generator[str, None, None]:
-                    for line in text:
-                        yield line + "\n"
-
                 if special.is_explorer_output():
                     if self.explorer_exists() or not self.explorer_command:
                         old_pager = os.environ.get('PAGER')
@@ -180,7 +189,11 @@ class OutputMixin(MyCliState):
                     else:
                         click.secho(f'Configured explorer command not found: {self.explorer_command}.', err=True, fg='red')
                 elif output_via_pager:
-                    click.echo_via_pager(newlinewrapper(buf))
+                    click.echo_via_pager(newlinewrapper(itertools.chain(buf, lines)))
+                    # The pager may be quit before the end, but the tee file
+                    # and the audit log still get every line.
+                    for _line in lines:
+                        pass
                 else:
                     for line in buf:
                         click.secho(line)
@@ -195,6 +208,23 @@ class OutputMixin(MyCliState):
             styled_status = to_formatted_text(status, style=add_style)
             prompt_toolkit.print_formatted_text(styled_status, style=self.ptoolkit_style)
 
+    def output_redirected(self, output: Iterable[str]) -> None:
+        """Write redirected output to the audit log and redirect destinations
+        in blocks of about redirect_buffer_size characters."""
+        block: list[str] = []
+        block_size = 0
+        for line in output:
+            block.append(line)
+            block_size += len(line) + 1
+            if block_size >= self.redirect_buffer_size:
+                self.log_output('\n'.join(block))
+                special.write_redirected(block)
+                block = []
+                block_size = 0
+        if block:
+            self.log_output('\n'.join(block))
+            special.write_redirected(block)
+
     def output_iterm2_image(self, image: bytes) -> None:
         """Emit a PNG using the iTerm2 inline image protocol."""
         filename = base64.b64encode(b'chart.png').decode('ascii')
@@ -287,19 +317,46 @@ class OutputMixin(MyCliState):
                 else:
                     column_types, colalign = [], []
 
-            if max_width is not None and isinstance(result.rows, Cursor):
-                result_rows = list(result.rows)
-            else:
-                result_rows = result.rows
-
-            formatted = use_formatter.format_output(
-                result_rows,
-                result.header or [],
-                format_name="vertical" if is_expanded else None,
-                column_types=column_types,
-                colalign=colalign,
-                **output_kwargs,
+            result_rows = result.rows
+            sample_rows: list = []
+            if isinstance(result.rows, Cursor):
+                # Results larger than the sample are rendered as they are fetched,
+                # rather than being held in memory in full.
+                sample_rows = list(itertools.islice(result.rows, streaming.SAMPLE_ROWS))
+                result_rows = sample_rows
+            is_streamed = (
+                len(sample_rows) == streaming.SAMPLE_ROWS
+                and not is_expanded
+                and streaming.supports_streaming(use_formatter, use_formatter.format_name)
+                and streaming.can_stream_alignment(colalign)
             )
+            if isinstance(result.rows, Cursor) and not is_streamed:
+                # the rest of the rows are formatted with the sample; a list
+                # when they may be formatted again as vertical output below
+                rest = itertools.chain(sample_rows, result.rows)
+                result_rows = list(rest) if max_width else rest
+
+            formatted: Any
+            if is_streamed:
+                formatted = streaming.format_output(
+                    use_formatter,
+                    itertools.chain(sample_rows, result.rows),
+                    result.header or [],
+                    use_formatter.format_name,
+                    column_types=column_types,
+                    colalign=colalign,
+                    sample_rows=streaming.SAMPLE_ROWS,
+                    **output_kwargs,
+                )
+            else:
+                formatted = use_formatter.format_output(
+                    result_rows,
+                    result.header or [],
+                    format_name="vertical" if is_expanded else None,
+                    column_types=column_types,
+                    colalign=colalign,
+                    **output_kwargs,
+                )
 
             if isinstance(formatted, str):
                 formatted = formatted.splitlines()
@@ -313,6 +370,8 @@ class OutputMixin(MyCliState):
             if not is_expanded and max_width and result.header and result_rows:
                 first_line = next(formatted)
                 if len(strip_ansi(first_line)) > max_width:
+                    if is_streamed:
+                        result_rows = itertools.chain(sample_rows, result.rows)
                     formatted = use_formatter.format_output(
                         result_rows,
                         result.header,
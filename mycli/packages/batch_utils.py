@@ -1,36 +1,156 @@
+from __future__ import annotations
+
+import re
 from typing import IO, Generator
 
-import sqlglot
-import sqlparse
+DELIMITER_COMMAND_RE = re.compile(r'\s*delimiter\s+(\S+)', re.IGNORECASE)
+TRAILING_COMMENT_RE = re.compile(r'[ \t]*(?:#|--(?:\s|$))')
+
+_NORMAL = 'normal'
+_BLOCK_COMMENT = 'block_comment'
+
+# For each quoting state, the pattern which ends it, also matching backslash
+# escapes (which MySQL honours inside single- and double-quoted strings).
+_QUOTE_END_RES = {
+    "'": re.compile(r"\\.|'", re.DOTALL),
+    '"': re.compile(r'\\.|"', re.DOTALL),
+    '`': re.compile(r'`'),
+}
+_BLOCK_COMMENT_END_RE = re.compile(r'\*/')
+
+
+class StatementScanner:
+    """Incrementally split SQL text into statements.
+
+    Lines are fed one at a time, and lexer state (quotes, comments, and the
+    current delimiter) is kept between calls, so each character is examined
+    only once no matter how many lines a statement spans.
+
+    Statements are returned stripped of surrounding whitespace, with the
+    delimiter attached, in the same form as `sqlparse.split()`.  A
+    ``DELIMITER`` command at the start of a statement ends at the end of its
+    line, as with the mysql client, and changes the delimiter used for the
+    following statements.
+    """
 
-MAX_MULTILINE_BATCH_STATEMENT = 5000
+    def __init__(self, delimiter: str = ';') -> None:
+        self._pieces: list[str] = []
+        self._has_code = False
+        self._state = _NORMAL
+        self._set_delimiter(delimiter)
+
+    @property
+    def delimiter(self) -> str:
+        return self._delimiter
+
+    def _set_delimiter(self, delimiter: str) -> None:
+        self._delimiter = delimiter
+        self._normal_re = re.compile(r"['\"`#]|--(?=\s|$)|/\*|" + re.escape(delimiter))
+
+    def _take_statement(self) -> str:
+        statement = ''.join(self._pieces).strip()
+        self._pieces = []
+        self._has_code = False
+        return statement
+
+    def feed(self, line: str) -> list[str]:
+        """Consume one line of input, returning any statements it completes."""
+        statements: list[str] = []
+        start = 0
+        pos = 0
+        length = len(line)
+
+        if self._state == _NORMAL and not self._has_code:
+            match = DELIMITER_COMMAND_RE.match(line)
+            if match:
+                # comments preceding the command are dropped, as the mysql client does
+                self._pieces = [line]
+                statements.append(self._take_statement())
+                self._set_delimiter(match.group(1))
+                return statements
+
+        while pos < length:
+            if self._state == _BLOCK_COMMENT:
+                match = _BLOCK_COMMENT_END_RE.search(line, pos)
+                if not match:
+                    pos = length
+                    break
+                pos = match.end()
+                self._state = _NORMAL
+                continue
+
+            if self._state in _QUOTE_END_RES:
+                quote_end_re = _QUOTE_END_RES[self._state]
+                while True:
+                    match = quote_end_re.search(line, pos)
+                    if not match:
+                        pos = length
+                        break
+                    pos = match.end()
+                    if match.group() == self._state:
+                        self._state = _NORMAL
+                        break
+                continue
+
+            match = self._normal_re.search(line, pos)
+            if not match:
+                if line[pos:].strip():
+                    self._has_code = True
+                pos = length
+                break
+            if line[pos : match.start()].strip():
+                self._has_code = True
+            token = match.group()
+            pos = match.end()
+            if token in _QUOTE_END_RES:
+                self._has_code = True
+                self._state = token
+            elif token == '/*':
+                self._state = _BLOCK_COMMENT
+            elif token in ('#', '--'):
+                pos = length
+            else:
+                # a trailing comment on the same line belongs with the statement
+                if TRAILING_COMMENT_RE.match(line, pos):
+                    pos = length
+                self._pieces.append(line[start:pos])
+                statements.append(self._take_statement())
+                start = pos
+
+        if start < length:
+            self._pieces.append(line[start:])
+        return statements
+
+    def finish(self) -> list[str]:
+        """Return any unterminated statement left over at the end of input."""
+        statement = self._take_statement()
+        return [statement] if statement else []
 
 
 def statements_from_filehandle(file_h: IO) -> Generator[tuple[str, int], None, None]:
-    statements = ''
-    line_counter = 0
+    scanner = StatementScanner()
     batch_counter = 0
     for batch_text in file_h:
-        line_counter += 1
-        if line_counter > MAX_MULTILINE_BATCH_STATEMENT:
-            raise ValueError(f'Saw single input statement greater than {MAX_MULTILINE_BATCH_STATEMENT} lines; assuming a parsing error.')
-        statements += batch_text
-        try:
-            tokens = sqlglot.tokenize(statements, read='mysql')
-            if not tokens:
-                continue
-            # we don't yet handle changing the delimiter within the batch input
-            if tokens[-1].text == ';':
-                # The advantage of sqlparse for splitting is that it preserves the input.
-                # https://github.com/tobymao/sqlglot/issues/2587#issuecomment-1823109501
-                for statement in sqlparse.split(statements):
-                    yield (statement, batch_counter)
-                    batch_counter += 1
-                statements = ''
-                line_counter = 0
-        except sqlglot.errors.TokenError:
-            continue
-    if statements:
-        for statement in sqlparse.split(statements):
+        for statement in scanner.feed(batch_text):
             yield (statement, batch_counter)
             batch_counter += 1
+    for statement in scanner.finish():
+        yield (statement, batch_counter)
+        batch_counter += 1
+
+
+def statements_and_offsets_from_filehandle(file_h: IO) -> Generator[tuple[str, int, int], None, None]:
+    """Like statements_from_filehandle(), also yielding the byte offset at
+    the end of the line which completed each statement."""
+    encoding = getattr(file_h, 'encoding', None) or 'utf-8'
+    scanner = StatementScanner()
+    batch_counter = 0
+    offset = 0
+    for batch_text in file_h:
+        offset += len(batch_text.encode(encoding, errors='replace'))
+        for statement in scanner.feed(batch_text):
+            yield (statement, batch_counter, offset)
+            batch_counter += 1
+    for statement in scanner.finish():
+        yield (statement, batch_counter, offset)
+        batch_counter += 1
@@ -11,7 +11,7 @@ from mycli.packages.special.dsn_aliases import DSN_SUBCOMMANDS
 from mycli.packages.special.favoritequeries import FAVORITE_SUBCOMMANDS
 from mycli.packages.special.main import COMMANDS as SPECIAL_COMMANDS
 from mycli.packages.special.main import parse_special_command
-from mycli.packages.sql_utils import extract_tables, find_prev_keyword, last_word
+from mycli.packages.sql_utils import extract_tables, find_prev_keyword, last_word, split_statements
 
 sqlparse.engine.grouping.MAX_GROUPING_DEPTH = None  # type: ignore[assignment]
 sqlparse.engine.grouping.MAX_GROUPING_TOKENS = None  # type: ignore[assignment]
@@ -695,6 +695,31 @@ def is_inside_quotes(text: str, pos: int) -> Literal[False, 'single', 'double',
         return False
 
 
+def _current_statement(
+    offset: int,
+    statements: tuple[sqlparse.sql.Statement, ...],
+    current_pos: int,
+) -> tuple[int, sqlparse.sql.Statement]:
+    """Find the statement bounding *current_pos*, by cumulatively summing
+    statement lengths from *offset*.  The last statement is taken if the
+    cursor is past all of them, as it is after a partially typed word."""
+    stmt_start, stmt_end = 0, offset
+    for statement in statements:
+        stmt_start, stmt_end = stmt_end, stmt_end + len(str(statement))
+        if stmt_end >= current_pos:
+            break
+    return stmt_start, statement
+
+
+def current_statement_text(full_text: str, text_before_cursor: str) -> str:
+    """Return *full_text* from the start of the statement under the cursor."""
+    offset, statements = split_statements(text_before_cursor)
+    if not statements:
+        return full_text
+    stmt_start, _statement = _current_statement(offset, statements, len(text_before_cursor))
+    return full_text[stmt_start:]
+
+
 def suggest_type(full_text: str, text_before_cursor: str) -> list[dict[str, Any]]:
     """Takes the full_text that is typed so far and also the text before the
     cursor to suggest completion type and scope.
@@ -720,9 +745,9 @@ def suggest_type(full_text: str, text_before_cursor: str) -> list[dict[str, Any]
         # it will always return the list of keywords as completion.
         if word_before_cursor:
             if word_before_cursor.endswith("(") or word_before_cursor.startswith("\\"):
-                parsed = sqlparse.parse(text_before_cursor)
+                offset, parsed = split_statements(text_before_cursor)
             else:
-                parsed = sqlparse.parse(text_before_cursor[: -len(word_before_cursor)])
+                offset, parsed = split_statements(text_before_cursor[: -len(word_before_cursor)])
 
                 # word_before_cursor may include a schema qualification, like
                 # "schema_name.partial_name" or "schema_name.", so parse it
@@ -732,26 +757,15 @@ def suggest_type(full_text: str, text_before_cursor: str) -> list[dict[str, Any]
                 if p.tokens and isinstance(p.tokens[0], Identifier):
                     identifier = p.tokens[0]
         else:
-            parsed = sqlparse.parse(text_before_cursor)
+            offset, parsed = split_statements(text_before_cursor)
     except (TypeError, AttributeError):
         return [{"type": "keyword"}]
 
-    if len(parsed) > 1:
-        # Multiple statements being edited -- isolate the current one by
-        # cumulatively summing statement lengths to find the one that bounds the
-        # current position
-        current_pos = len(text_before_cursor)
-        stmt_start, stmt_end = 0, 0
-
-        for statement in parsed:
-            stmt_len = len(str(statement))
-            stmt_start, stmt_end = stmt_end, stmt_end + stmt_len
-
-            if stmt_end >= current_pos:
-                text_before_cursor = full_text[stmt_start:current_pos]
-                full_text = full_text[stmt_start:]
-                break
-
+    if offset or len(parsed) > 1:
+        # Multiple statements being edited -- isolate the current one
+        stmt_start, statement = _current_statement(offset, parsed, len(text_before_cursor))
+        text_before_cursor = full_text[stmt_start : len(text_before_cursor)]
+        full_text = full_text[stmt_start:]
     elif parsed:
         # A single statement
         statement = parsed[0]
@@ -0,0 +1,98 @@
+"""Precomputed lookups over a large collection of completion candidates.
+
+`SQLCompleter.find_fuzzy_matches()` tries several kinds of match against
+every candidate on each keystroke, which gets slow once the columns of many
+schemas have been prefetched.  Every kind of fuzzy match needs each
+character of the typed word, underscores aside, to appear in the candidate,
+so an index of the candidates containing each character narrows the ones
+to check down to a small fraction before any matching is done.
+
+Prefix completion, used for keywords and functions and when smart
+completion is off, looks candidates up in a sorted array of their
+lowercased forms instead of testing each one.
+
+Each part of the index is built the first time it is needed.  The last
+set of characters looked up is remembered, so that when another character
+is typed only the items found for the shorter word are checked again.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from functools import cached_property
+from itertools import chain
+from typing import Iterable
+
+
+class CompletionIndex:
+    """Lowercased forms of *items*, the positions of the items containing
+    each character, and the lowercased forms in sorted order."""
+
+    def __init__(self, items: Iterable[str]) -> None:
+        self.items = tuple(items)
+        self.lowered = [item.lower() for item in self.items]
+        self._last_containing: tuple[frozenset[str], list[int]] | None = None
+
+    @cached_property
+    def _postings(self) -> dict[str, list[int]]:
+        postings: defaultdict[str, list[int]] = defaultdict(list)
+        for position, lowered in enumerate(self.lowered):
+            for char in set(lowered):
+                postings[char].append(position)
+        return dict(postings)
+
+    @cached_property
+    def _sorted(self) -> tuple[list[str], list[int]]:
+        order = sorted(range(len(self.lowered)), key=self.lowered.__getitem__)
+        return [self.lowered[position] for position in order], order
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def containing(self, chars: Iterable[str]) -> list[int]:
+        """Positions, in order, of the items containing all of *chars* once
+        lowercased."""
+        wanted = frozenset(chars)
+        last = self._last_containing
+        if last is not None and last[0] <= wanted:
+            extra = wanted - last[0]
+            lowered = self.lowered
+            positions = [position for position in last[1] if all(char in lowered[position] for char in extra)]
+        else:
+            positions = self._intersect(wanted)
+        self._last_containing = (wanted, positions)
+        return list(positions)
+
+    def _intersect(self, chars: frozenset[str]) -> list[int]:
+        postings = sorted((self._postings.get(char, []) for char in chars), key=len)
+        if not postings:
+            return list(range(len(self.items)))
+        positions = set(postings[0])
+        for posting in postings[1:]:
+            if not positions:
+                break
+            positions.intersection_update(posting)
+        return sorted(positions)
+
+    def sharing(self, chars: Iterable[str], minimum: int) -> list[int]:
+        """Positions, in order, of the items containing at least *minimum*
+        of *chars* once lowercased."""
+        distinct = set(chars)
+        if minimum <= 0:
+            return list(range(len(self.items)))
+        counts = Counter(chain.from_iterable(self._postings.get(char, ()) for char in distinct))
+        return sorted(position for position, count in counts.items() if count >= minimum)
+
+    def starting_with(self, prefix: str) -> list[int]:
+        """Positions, in order, of the items starting with *prefix* once
+        lowercased."""
+        if not prefix:
+            return list(range(len(self.items)))
+        keys, order = self._sorted
+        positions = []
+        for i in range(bisect_left(keys, prefix), len(keys)):
+            if not keys[i].startswith(prefix):
+                break
+            positions.append(order[i])
+        return sorted(positions)
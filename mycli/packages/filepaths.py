@@ -1,12 +1,42 @@
+from collections import deque
+import logging
 import os
 import platform
+import stat
+
+_logger = logging.getLogger(__name__)
 
 DEFAULT_SOCKET_DIRS: list[str] = []
+# Where MySQL and MariaDB packages put the server's socket.
+KNOWN_SOCKET_PATHS: list[str] = []
+# Option files which may name the socket, most specific first.
+MY_CNF_FILES: list[str] = []
 if os.name == "posix":
     if platform.system() == "Darwin":
         DEFAULT_SOCKET_DIRS = ["/tmp"]
+        KNOWN_SOCKET_PATHS = ["/tmp/mysql.sock"]
+        MY_CNF_FILES = ["~/.my.cnf", "/etc/my.cnf", "/opt/homebrew/etc/my.cnf", "/usr/local/etc/my.cnf"]
     else:
         DEFAULT_SOCKET_DIRS = ["/var/run", "/var/lib"]
+        KNOWN_SOCKET_PATHS = [
+            "/var/run/mysqld/mysqld.sock",
+            "/run/mysqld/mysqld.sock",
+            "/var/lib/mysql/mysql.sock",
+            "/var/run/mysql/mysql.sock",
+            "/tmp/mysql.sock",
+        ]
+        MY_CNF_FILES = ["~/.my.cnf", "/etc/my.cnf", "/etc/mysql/my.cnf"]
+
+# The last socket found, which is tried first next time.
+SOCKET_CACHE_FILE = "~/.cache/mycli/socket"
+# How deep, and through how many directories, to search DEFAULT_SOCKET_DIRS.
+MAX_SOCKET_SEARCH_DEPTH = 3
+MAX_SOCKET_SEARCH_DIRS = 64
+# How deep to follow !include and !includedir in option files.
+MAX_MY_CNF_INCLUDE_DEPTH = 4
+
+MY_CNF_CLIENT_SECTIONS = ("client", "mysql", "client-server", "client-mariadb")
+MY_CNF_SERVER_SECTIONS = ("mysqld", "server", "mariadb", "mariadbd", "mysqld_safe")
 
 
 def list_path(root_dir: str) -> list[str]:
@@ -110,14 +140,131 @@ def dir_path_exists(path: str) -> bool:
     return os.path.exists(os.path.dirname(path))
 
 
-def guess_socket_location() -> str | None:
-    """Try to guess the location of the default mysql socket file."""
-    socket_dirs = filter(os.path.exists, DEFAULT_SOCKET_DIRS)
-    for directory in socket_dirs:
-        for r, dirs, files in os.walk(directory, topdown=True):
-            for filename in files:
-                name, ext = os.path.splitext(filename)
-                if name.startswith("mysql") and name != "mysqlx" and ext in (".socket", ".sock"):
-                    return os.path.join(r, filename)
-            dirs[:] = [d for d in dirs if d.startswith("mysql")]
+def guess_socket_location(cache_file: str | None = SOCKET_CACHE_FILE) -> str | None:
+    """Try to guess the location of the default mysql socket file.
+
+    The socket found last time, kept in *cache_file*, is checked with a
+    single stat.  Otherwise the usual locations are tried, then the sockets
+    named in option files, and then DEFAULT_SOCKET_DIRS are searched breadth
+    first, going only into directories whose names start with "mysql".
+
+    """
+    cached = _read_cached_socket(cache_file) if cache_file else None
+    if cached is not None:
+        return cached
+
+    candidates = KNOWN_SOCKET_PATHS + _sockets_in_my_cnf(MY_CNF_FILES)
+    location = next((path for path in candidates if _is_socket(path)), None) or _search_socket_dirs(DEFAULT_SOCKET_DIRS)
+    if cache_file:
+        _write_cached_socket(cache_file, location)
+    return location
+
+
+def _is_socket(path: str) -> bool:
+    try:
+        return stat.S_ISSOCK(os.stat(path).st_mode)
+    except (OSError, ValueError):
+        return False
+
+
+def _is_socket_name(filename: str) -> bool:
+    name, ext = os.path.splitext(filename)
+    return name.startswith("mysql") and name != "mysqlx" and ext in (".socket", ".sock")
+
+
+def _read_cached_socket(cache_file: str) -> str | None:
+    try:
+        with open(os.path.expanduser(cache_file), encoding="utf-8") as f:
+            path = f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    return path if path and _is_socket(path) else None
+
+
+def _write_cached_socket(cache_file: str, location: str | None) -> None:
+    cache_file = os.path.expanduser(cache_file)
+    try:
+        if location is None:
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+            return
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        partial = f"{cache_file}.{os.getpid()}"
+        with open(partial, "w", encoding="utf-8") as f:
+            f.write(f"{location}\n")
+        os.replace(partial, cache_file)
+    except OSError as e:
+        _logger.debug("could not cache the socket location in %r: %r", cache_file, e)
+
+
+def _sockets_in_my_cnf(files: list[str]) -> list[str]:
+    """The sockets named in the client sections of the option files in
+    *files*, and then those named in their server sections."""
+    client: list[str] = []
+    server: list[str] = []
+    seen: set[str] = set()
+    for filename in files:
+        _read_my_cnf_sockets(os.path.expanduser(filename), client, server, seen, 0)
+    return client + server
+
+
+def _read_my_cnf_sockets(filename: str, client: list[str], server: list[str], seen: set[str], depth: int) -> None:
+    filename = os.path.realpath(filename)
+    if filename in seen or depth > MAX_MY_CNF_INCLUDE_DEPTH:
+        return
+    seen.add(filename)
+    try:
+        with open(filename, encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+    except OSError:
+        return
+
+    section = ""
+    for line in lines:
+        line = line.strip()
+        if line.startswith("!includedir"):
+            directory = line[len("!includedir") :].strip()
+            try:
+                included = sorted(name for name in os.listdir(directory) if name.endswith(".cnf"))
+            except OSError:
+                continue
+            for name in included:
+                _read_my_cnf_sockets(os.path.join(directory, name), client, server, seen, depth + 1)
+        elif line.startswith("!include"):
+            _read_my_cnf_sockets(line[len("!include") :].strip(), client, server, seen, depth + 1)
+        elif line.startswith("[") and line.endswith("]"):
+            section = line[1:-1].strip().lower()
+        elif "=" in line and not line.startswith(("#", ";")):
+            key, value = line.split("=", 1)
+            if key.strip().lower() != "socket":
+                continue
+            value = value.split("#", 1)[0].strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+                value = value[1:-1]
+            if not value:
+                continue
+            if section in MY_CNF_CLIENT_SECTIONS:
+                client.append(value)
+            elif section in MY_CNF_SERVER_SECTIONS:
+                server.append(value)
+
+
+def _search_socket_dirs(directories: list[str]) -> str | None:
+    """Search *directories* breadth first for a mysql socket, going only
+    into subdirectories whose names start with "mysql"."""
+    queue = deque((directory, 0) for directory in directories)
+    searched = 0
+    while queue and searched < MAX_SOCKET_SEARCH_DIRS:
+        directory, depth = queue.popleft()
+        searched += 1
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted((entry for entry in it if entry.name.startswith("mysql")), key=lambda entry: entry.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if _is_socket_name(entry.name) and _is_socket(entry.path):
+                return entry.path
+        if depth < MAX_SOCKET_SEARCH_DEPTH:
+            queue.extend((entry.path, depth + 1) for entry in entries if entry.is_dir(follow_symlinks=False))
     return None
@@ -6,17 +6,39 @@ import datetime
 import decimal
 import fractions
 from io import BytesIO
+import os
+import threading
 from types import CodeType
-from typing import Any, Iterable, Sequence
+from typing import Any, Callable, Iterable, Iterator, Sequence
 
+from pymysql.constants import FIELD_TYPE, FLAG
+from pymysql.cursors import Cursor
 import sqlglot
 
+from mycli.constants import DEFAULT_ROW_GROUP_SIZE
 from mycli.packages.special.delimitercommand import DelimiterCommand
 from mycli.packages.sqlresult import SQLResult
 from mycli.types import ImageProtocol, OutputMode
 
 delimiter_command = DelimiterCommand()
 PLOT_FORMATS = ('png', 'pdf', 'svg', 'html')
+# File formats for DataFrames, by suffix.
+TABLE_FORMATS = {'parquet': 'Parquet', 'arrow': 'Arrow IPC', 'feather': 'Arrow IPC'}
+# Rows fetched from the server, and turned into columns, at a time.
+FETCH_BATCH_SIZE = 10_000
+STRING_FIELD_TYPES = frozenset((
+    FIELD_TYPE.STRING,
+    FIELD_TYPE.VAR_STRING,
+    FIELD_TYPE.VARCHAR,
+    FIELD_TYPE.TINY_BLOB,
+    FIELD_TYPE.BLOB,
+    FIELD_TYPE.MEDIUM_BLOB,
+    FIELD_TYPE.LONG_BLOB,
+    FIELD_TYPE.BIT,
+    FIELD_TYPE.GEOMETRY,
+))
+# The character set number of binary strings.
+BINARY_CHARSET = 63
 
 
 class PolarsTransformError(RuntimeError):
@@ -145,11 +167,26 @@ def _parse_output_path(path: str) -> str:
         path = path[1:-1]
     elif any(character.isspace() for character in path):
         raise PolarsTransformError('File save paths containing spaces must be quoted.')
-    if not path.lower().endswith(('.parquet', '.png', '.pdf', '.svg', '.html')):
-        raise PolarsTransformError('File save paths must end in ".parquet", ".png", ".pdf", ".svg", or ".html".')
+    if not path.lower().endswith(('.parquet', '.arrow', '.feather', '.png', '.pdf', '.svg', '.html')):
+        raise PolarsTransformError('File save paths must end in ".parquet", ".arrow", ".feather", ".png", ".pdf", ".svg", or ".html".')
     return path
 
 
+def _table_format_for_path(path: str) -> str | None:
+    path = path.lower()
+    return next((table_format for table_format in TABLE_FORMATS if path.endswith(f'.{table_format}')), None)
+
+
+def is_streamed_export(pipeline: PolarsPipeline) -> bool:
+    """Whether *pipeline* saves its SQL result as it is, which is streamed
+    to the file rather than loaded into a DataFrame first."""
+    return _is_streamed_export(pipeline.expression, pipeline.output_path)
+
+
+def _is_streamed_export(expression: str | None, output_path: str | None) -> bool:
+    return expression is None and output_path is not None and _table_format_for_path(output_path) is not None
+
+
 def _plot_format_for_path(path: str) -> str | None:
     path = path.lower()
     return next((plot_format for plot_format in PLOT_FORMATS if path.endswith(f'.{plot_format}')), None)
@@ -206,6 +243,194 @@ def _load_vl_convert() -> None:
         raise PolarsTransformError('Altair plot rendering requires vl-convert-python. Install mycli[dataframe].') from exc
 
 
+def _column_dtypes(pl: Any, rows: Cursor | list[tuple], width: int) -> list[Any]:
+    """The Polars types of the columns, where the MySQL type decides them.
+
+    Other columns, and those of results without a cursor, are left to Polars
+    to infer.
+
+    """
+    if not isinstance(rows, Cursor) or not rows.description:
+        return [None] * width
+    # The DB-API description leaves out the flags and character set which
+    # tell unsigned integers and binary strings apart.
+    fields = getattr(getattr(rows, '_result', None), 'fields', None) or [None] * len(rows.description)
+    dtypes = {
+        FIELD_TYPE.TINY: pl.Int64,
+        FIELD_TYPE.SHORT: pl.Int64,
+        FIELD_TYPE.INT24: pl.Int64,
+        FIELD_TYPE.LONG: pl.Int64,
+        FIELD_TYPE.LONGLONG: pl.Int64,
+        FIELD_TYPE.YEAR: pl.Int64,
+        FIELD_TYPE.FLOAT: pl.Float64,
+        FIELD_TYPE.DOUBLE: pl.Float64,
+        FIELD_TYPE.DATE: pl.Date,
+        FIELD_TYPE.DATETIME: pl.Datetime('us'),
+        FIELD_TYPE.TIMESTAMP: pl.Datetime('us'),
+        FIELD_TYPE.TIME: pl.Duration('us'),
+    }
+    column_dtypes = []
+    for column, field in zip(rows.description, fields, strict=True):
+        dtype = dtypes.get(column[1])
+        if field is None:
+            pass
+        elif column[1] == FIELD_TYPE.LONGLONG and field.flags & FLAG.UNSIGNED:
+            dtype = pl.UInt64
+        elif column[1] in STRING_FIELD_TYPES:
+            dtype = pl.Binary if field.charsetnr == BINARY_CHARSET else pl.String
+        column_dtypes.append(dtype)
+    return column_dtypes
+
+
+def _row_batches(rows: Cursor | list[tuple], size: int) -> Iterator[Sequence[tuple]]:
+    if isinstance(rows, Cursor):
+        while batch := rows.fetchmany(size):
+            yield batch
+    else:
+        for start in range(0, len(rows), size):
+            yield rows[start : start + size]
+
+
+def _batch_dataframe(pl: Any, header: list[str], batch: Sequence[tuple], dtypes: list[Any]) -> Any:
+    if any(dtypes):
+        try:
+            return pl.DataFrame(batch, schema=list(zip(header, dtypes, strict=True)), orient='row')
+        except (TypeError, ValueError, OverflowError, pl.exceptions.PolarsError):
+            # eg. unsigned BIGINTs past Int64, or zero dates left as strings
+            pass
+    return pl.DataFrame(batch, schema=header, orient='row', infer_schema_length=None)
+
+
+def _build_dataframe(pl: Any, header: list[str], rows: Cursor | list[tuple]) -> Any:
+    """Build a DataFrame from a result a batch of rows at a time.
+
+    Each batch is turned into typed columns straight away, so with an
+    unbuffered cursor the result is never held as Python tuples in full.
+
+    """
+    dtypes = _column_dtypes(pl, rows, len(header))
+    frames = [_batch_dataframe(pl, header, batch, dtypes) for batch in _row_batches(rows, FETCH_BATCH_SIZE)]
+    if not frames:
+        return pl.DataFrame(schema=list(zip(header, dtypes, strict=True)))
+    if len(frames) == 1:
+        return frames[0]
+    # batches whose types were inferred may differ, eg. all NULL in one of them
+    return pl.concat(frames, how='vertical_relaxed', rechunk=True)
+
+
+def _write_dataframe(dataframe: Any, output_path: str, kind: str) -> None:
+    table_format = _table_format_for_path(output_path)
+    if table_format is None:
+        raise PolarsTransformError(f'Polars {kind} results can only be written to ".parquet", ".arrow", or ".feather" files.')
+    try:
+        if table_format == 'parquet':
+            dataframe.write_parquet(output_path)
+        else:
+            dataframe.write_ipc(output_path)
+    except Exception as exc:
+        raise PolarsTransformError(
+            f'Unable to write {TABLE_FORMATS[table_format]} file "{output_path}": {type(exc).__name__}: {exc}'
+        ) from exc
+
+
+def _remove_partial_file(output_path: str) -> None:
+    try:
+        os.remove(output_path)
+    except OSError:
+        pass
+
+
+def _export_result(
+    pl: Any,
+    header: list[str],
+    rows: Cursor | list[tuple],
+    output_path: str,
+    row_group_size: int,
+    progress: Callable[[int], None] | None,
+) -> SQLResult:
+    """Write a SQL result to a Parquet or Arrow IPC file as it is fetched.
+
+    Each batch of *row_group_size* rows is written before the next is
+    fetched, so only one batch is held in memory at a time when the rows
+    come from an unbuffered cursor.  *progress* is called with the number
+    of rows written so far after each batch.  On an error or an interrupt,
+    the partly written file is removed.
+
+    """
+    from polars.io.plugins import register_io_source
+
+    table_format = _table_format_for_path(output_path)
+    assert table_format is not None
+    dtypes = _column_dtypes(pl, rows, len(header))
+    batches = _row_batches(rows, row_group_size)
+    first = _batch_dataframe(pl, header, next(batches, ()), dtypes)
+    # the types of the first batch hold for the rest; only NULLs seen yet are taken as text
+    schema = pl.Schema({name: pl.String if dtype == pl.Null else dtype for name, dtype in first.schema.items()})
+    written = 0
+    failures: list[BaseException] = []
+    sink_failures: list[BaseException] = []
+    cancelled = threading.Event()
+
+    def source(with_columns: list[str] | None, predicate: Any, n_rows: int | None, batch_size: int | None) -> Iterator[Any]:
+        nonlocal written
+        try:
+            frame = first
+            while not cancelled.is_set():
+                yield frame.cast(schema)
+                written += len(frame)
+                if progress is not None:
+                    progress(written)
+                batch = next(batches, None)
+                if batch is None:
+                    return
+                frame = _batch_dataframe(pl, header, batch, dtypes)
+        except Exception as exc:
+            failures.append(exc)
+            raise
+
+    def sink() -> None:
+        try:
+            lazyframe = register_io_source(source, schema=schema)
+            if table_format == 'parquet':
+                lazyframe.sink_parquet(output_path, row_group_size=row_group_size)
+            else:
+                lazyframe.sink_ipc(output_path, record_batch_size=row_group_size)
+        except BaseException as exc:
+            sink_failures.append(exc)
+
+    # Python runs signal handlers only on the main thread, between bytecodes,
+    # so the sink runs on a thread of its own to keep Ctrl-C working here.
+    thread = threading.Thread(target=sink, name='export', daemon=True)
+    thread.start()
+    try:
+        while thread.is_alive():
+            thread.join(0.1)
+    except BaseException:
+        cancelled.set()
+        try:
+            # Polars may raise its own copy of the interrupt on the sink
+            # thread, which is dropped.  Another Ctrl-C stops the wait.
+            while thread.is_alive():
+                thread.join(0.1)
+        except KeyboardInterrupt:
+            pass
+        _remove_partial_file(output_path)
+        raise
+    if sink_failures:
+        _remove_partial_file(output_path)
+        exc = sink_failures[0]
+        # Polars reports errors raised by the source as its own, but a lost
+        # connection or a killed query must reach the caller as it was.
+        if failures and not isinstance(failures[0], pl.exceptions.PolarsError):
+            raise failures[0] from None
+        if not isinstance(exc, Exception):
+            raise exc
+        raise PolarsTransformError(
+            f'Unable to write {TABLE_FORMATS[table_format]} file "{output_path}": {type(exc).__name__}: {exc}'
+        ) from exc
+    return SQLResult(status=f'Wrote {written} rows to {output_path}.')
+
+
 def run_polars_transform(
     transform: PolarsTransform,
     results: Iterable[SQLResult],
@@ -215,6 +440,8 @@ def run_polars_transform(
     plot_scale_factor: float = 1.0,
     plot_ppi: int = 200,
     plot_theme: str = 'carbong90',
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    progress: Callable[[int], None] | None = None,
 ) -> SQLResult:
     iterator = iter(results)
     try:
@@ -231,7 +458,11 @@ def run_polars_transform(
     if not isinstance(result.header, list) or result.rows is None:
         raise PolarsTransformError('Polars transforms require a tabular SQL result.')
 
-    dataframe = transform.polars.DataFrame(list(result.rows), schema=result.header, orient='row')
+    if _is_streamed_export(transform.expression, output_path):
+        assert output_path is not None
+        return _export_result(transform.polars, result.header, result.rows, output_path, row_group_size, progress)
+
+    dataframe = _build_dataframe(transform.polars, result.header, result.rows)
     try:
         value = eval(
             transform.code,
@@ -263,24 +494,22 @@ def run_polars_transform(
 
     if isinstance(value, transform.polars.DataFrame):
         if output_path is not None:
-            if not output_path.lower().endswith('.parquet'):
-                raise PolarsTransformError('Polars DataFrame results can only be written to ".parquet" files.')
-            try:
-                value.write_parquet(output_path)
-            except Exception as exc:
-                raise PolarsTransformError(f'Unable to write Parquet file "{output_path}": {type(exc).__name__}: {exc}') from exc
+            _write_dataframe(value, output_path, 'DataFrame')
             return SQLResult(status=f'Wrote {len(value)} rows to {output_path}.')
-        return SQLResult(header=list(value.columns), rows=list(value.iter_rows()))
+        return SQLResult(header=list(value.columns), rows=value.rows())
     elif isinstance(value, transform.polars.Series):
         column_name = value.name or 'value'
         if output_path is not None:
-            if not output_path.lower().endswith('.parquet'):
-                raise PolarsTransformError('Polars Series results can only be written to ".parquet" files.')
+            table_format = _table_format_for_path(output_path)
+            if table_format is None:
+                raise PolarsTransformError('Polars Series results can only be written to ".parquet", ".arrow", or ".feather" files.')
             try:
                 series_dataframe = value.rename(column_name).to_frame()
-                series_dataframe.write_parquet(output_path)
             except Exception as exc:
-                raise PolarsTransformError(f'Unable to write Parquet file "{output_path}": {type(exc).__name__}: {exc}') from exc
+                raise PolarsTransformError(
+                    f'Unable to write {TABLE_FORMATS[table_format]} file "{output_path}": {type(exc).__name__}: {exc}'
+                ) from exc
+            _write_dataframe(series_dataframe, output_path, 'Series')
             return SQLResult(status=f'Wrote {len(series_dataframe)} rows to {output_path}.')
         return SQLResult(header=[column_name], rows=[(item,) for item in value])
     elif transform.altair is not None and isinstance(value, transform.altair.TopLevelMixin):
@@ -1,6 +1,7 @@
-import re
 import shlex
 from shutil import which
+import subprocess
+from typing import Iterable, Iterator
 
 from prompt_toolkit import search
 from prompt_toolkit.key_binding.key_processor import KeyPressEvent
@@ -19,6 +20,32 @@ class Fzf(FzfPrompt):
     def is_available(self) -> bool:
         return self.executable is not None
 
+    def prompt_stream(self, choices: Iterable[str], fzf_options: str = '') -> list[str]:
+        """Like `prompt()`, but pipe *choices* to fzf as they are produced,
+        so that it opens at once rather than after all of them are built."""
+        process = subprocess.Popen(
+            f'{self.executable_path} {fzf_options}',
+            shell=True,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            encoding='utf-8',
+        )
+        assert process.stdin is not None and process.stdout is not None
+        try:
+            for choice in choices:
+                process.stdin.write(f'{choice}\n')
+        except BrokenPipeError:
+            # fzf exited before reading everything.
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+        selection = process.stdout.read()
+        process.wait()
+        return [line for line in selection.split('\n') if line]
+
 
 def search_history(
     event: KeyPressEvent,
@@ -36,19 +63,15 @@ def search_history(
         search.start_search(direction=search.SearchDirection.BACKWARD)
         return
 
-    history_items_with_timestamp = history.load_history_with_timestamp()
+    original_history_items: list[str] = []
 
-    formatted_history_items = []
-    original_history_items = []
-    seen = {}
-    for item, timestamp in history_items_with_timestamp:
-        formatted_item = re.sub(r'\s+', ' ', item)
-        timestamp = timestamp.split(".")[0] if "." in timestamp else timestamp
-        if formatted_item in seen:
-            continue
-        seen[formatted_item] = True
-        formatted_history_items.append(f"{timestamp}  {formatted_item}")
-        original_history_items.append(item)
+    def formatted_history_items() -> Iterator[str]:
+        # Each line starts with the position of its entry, hidden from view,
+        # to map the selection back to the entry.
+        for item, timestamp, formatted_item in history.iter_unique_history_with_timestamp():
+            timestamp = timestamp.split(".")[0] if "." in timestamp else timestamp
+            yield f"{len(original_history_items)}\t{timestamp}  {formatted_item}"
+            original_history_items.append(item)
 
     options = [
         '--info=hidden',
@@ -57,20 +80,22 @@ def search_history(
         '--bind=ctrl-r:up,alt-r:up',
         '--preview-window=down:wrap:nohidden',
         '--no-height',
+        "--delimiter='\\t'",
+        '--with-nth=2..',
     ]
 
     if highlight_preview and which('pygmentize'):
-        options.append(f'--preview="printf \'%s\' {{}} | pygmentize -l mysql -P style={shlex.quote(highlight_style)}"')
+        options.append(f'--preview="printf \'%s\' {{2..}} | pygmentize -l mysql -P style={shlex.quote(highlight_style)}"')
     else:
-        options.append('--preview="printf \'%s\' {}"')
+        options.append('--preview="printf \'%s\' {2..}"')
 
-    result = fzf.prompt(
-        formatted_history_items,
+    result = fzf.prompt_stream(
+        formatted_history_items(),
         fzf_options=' '.join(options),
     )
     safe_invalidate_display(event.app)
 
     if result:
-        selected_index = formatted_history_items.index(result[0])
+        selected_index = int(result[0].split('\t', 1)[0])
         buffer.text = original_history_items[selected_index]
         buffer.cursor_position = len(buffer.text)
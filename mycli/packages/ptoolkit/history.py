@@ -1,5 +1,7 @@
+import asyncio
 import os
-from typing import Union
+import re
+from typing import AsyncGenerator, Iterator, Union
 
 from prompt_toolkit.history import FileHistory
 
@@ -7,15 +9,64 @@ from mycli.packages.sql_utils import is_password_change
 
 _StrOrBytesPath = Union[str, bytes, os.PathLike]
 
+# Bytes read at a time when reading the history file backwards.
+_BLOCK_SIZE = 1 << 16
+# Entries loaded for the prompt between yields to the event loop.
+_LOAD_BATCH_SIZE = 1000
+# The start of a line which is not part of an entry's text.
+_ENTRY_BOUNDARY = re.compile(rb'\n[^+]')
+
+
+def _parse_entries(data: bytes) -> list[tuple[str, str]]:
+    """Parse whole lines of a history file into (entry, timestamp) pairs,
+    oldest first."""
+    entries: list[tuple[str, str]] = []
+    lines: list[str] = []
+    timestamp = ''
+    for line in data.decode('utf-8', errors='replace').split('\n'):
+        first = line[:1]
+        if first == '+':
+            lines.append(line[1:])
+            continue
+        if lines:
+            entries.append(('\n'.join(lines), timestamp))
+            lines = []
+        if first == '#':
+            timestamp = line[2:].strip()
+    if lines:
+        entries.append(('\n'.join(lines), timestamp))
+    return entries
+
+
+def _collapse_whitespace(string: str) -> str:
+    return ' '.join(string.split())
+
 
 class FileHistoryWithTimestamp(FileHistory):
     """
     :class:`.FileHistory` class that stores all strings in a file with timestamp.
+
+    The file is read backwards, most recent entries first, and only as far as
+    they are needed.  Parsed entries are kept along with how much of the file
+    they cover, so reading the history again only parses what other sessions
+    have appended since.
     """
 
     def __init__(self, filename: _StrOrBytesPath) -> None:
         self.filename = filename
         super().__init__(filename)
+        self._identity: tuple[int, int] | None = None
+        # Entries appended to the file since it was first read, oldest first,
+        # and the entries before that read so far, most recent first.
+        self._recent: list[tuple[str, str]] = []
+        self._older: list[tuple[str, str]] = []
+        # The entries with runs of whitespace collapsed, computed for all of
+        # the recent entries and for as many older ones as have been needed.
+        self._recent_normalized: list[str] = []
+        self._older_normalized: list[str] = []
+        # The file offsets between which entries have been parsed.
+        self._parsed_from = 0
+        self._parsed_to = 0
 
     def append_string(self, string: str) -> None:
         "Add string to the history."
@@ -24,6 +75,29 @@ class FileHistoryWithTimestamp(FileHistory):
             return
         self.store_string(string)
 
+    async def load(self) -> AsyncGenerator[str, None]:
+        """Yield the history for the prompt, most recent first, giving the
+        event loop a turn every so often so that a large file does not hold
+        up the first prompt."""
+        if self._loaded:
+            for item in self._loaded_strings:
+                yield item
+            return
+
+        strings = []
+        for string in self.load_history_strings():
+            strings.append(string)
+            yield string
+            if len(strings) % _LOAD_BATCH_SIZE == 0:
+                await asyncio.sleep(0)
+        # Strings appended while loading were stored after the file was read.
+        self._loaded_strings.extend(strings)
+        self._loaded = True
+
+    def load_history_strings(self) -> Iterator[str]:
+        for string, _timestamp in self.iter_history_with_timestamp():
+            yield string
+
     def load_history_with_timestamp(self) -> list[tuple[str, str]]:
         """
         Load history entries along with their timestamps.
@@ -32,28 +106,91 @@ class FileHistoryWithTimestamp(FileHistory):
             list[tuple[str, str]]: A list of tuples where each tuple contains
                                    a history entry and its corresponding timestamp.
         """
-        history_with_timestamp: list[tuple[str, str]] = []
-        lines: list[str] = []
-        timestamp: str = ""
-
-        def add() -> None:
-            if lines:
-                # Join and drop trailing newline.
-                string = "".join(lines)[:-1]
-                history_with_timestamp.append((string, timestamp))
-
-        if os.path.exists(self.filename):
-            with open(self.filename, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.startswith("#"):
-                        # Extract timestamp
-                        timestamp = line[2:].strip()
-                    elif line.startswith("+"):
-                        lines.append(line[1:])
-                    else:
-                        add()
-                        lines = []
-
-                add()
-
-        return list(reversed(history_with_timestamp))
+        return list(self.iter_history_with_timestamp())
+
+    def iter_history_with_timestamp(self) -> Iterator[tuple[str, str]]:
+        """Yield history entries with their timestamps, most recent first."""
+        for entries, _normalized, position in self._iter_positions():
+            yield entries[position]
+
+    def iter_unique_history_with_timestamp(self) -> Iterator[tuple[str, str, str]]:
+        """Yield history entries with their timestamps and their text with
+        whitespace collapsed, most recent first, skipping entries which only
+        differ in whitespace from a more recent one."""
+        seen: set[str] = set()
+        for entries, normalized, position in self._iter_positions():
+            if position == len(normalized):
+                normalized.append(_collapse_whitespace(entries[position][0]))
+            if normalized[position] in seen:
+                continue
+            seen.add(normalized[position])
+            string, timestamp = entries[position]
+            yield string, timestamp, normalized[position]
+
+    def _iter_positions(self) -> Iterator[tuple[list[tuple[str, str]], list[str], int]]:
+        self._refresh()
+        recent, recent_normalized = self._recent, self._recent_normalized
+        older, older_normalized = self._older, self._older_normalized
+        for position in range(len(recent) - 1, -1, -1):
+            yield recent, recent_normalized, position
+        position = 0
+        while True:
+            if position < len(older):
+                yield older, older_normalized, position
+                position += 1
+            elif self._parsed_from > 0 and older is self._older:
+                self._read_backwards()
+            else:
+                return
+
+    def _refresh(self) -> None:
+        """Start over if the file was replaced or truncated, or parse what
+        was appended to it."""
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            self._identity = None
+            self._recent, self._older = [], []
+            self._recent_normalized, self._older_normalized = [], []
+            self._parsed_from = self._parsed_to = 0
+            return
+
+        identity = (stat.st_dev, stat.st_ino)
+        if identity != self._identity or stat.st_size < self._parsed_to:
+            self._identity = identity
+            self._recent, self._older = [], []
+            self._recent_normalized, self._older_normalized = [], []
+            self._parsed_from = self._parsed_to = stat.st_size
+        elif stat.st_size > self._parsed_to:
+            with open(self.filename, 'rb') as f:
+                f.seek(self._parsed_to)
+                data = f.read(stat.st_size - self._parsed_to)
+            # Leave a line still being written for next time.
+            data = data[: data.rfind(b'\n') + 1]
+            entries = _parse_entries(data)
+            self._recent.extend(entries)
+            self._recent_normalized.extend(_collapse_whitespace(string) for string, _timestamp in entries)
+            self._parsed_to += len(data)
+
+    def _read_backwards(self) -> None:
+        """Parse the entries in the block of the file before those parsed so
+        far."""
+        end = self._parsed_from
+        size = _BLOCK_SIZE
+        with open(self.filename, 'rb') as f:
+            while True:
+                start = max(0, end - size)
+                f.seek(start)
+                data = f.read(end - start)
+                if start == 0:
+                    boundary = 0
+                    break
+                # The block starts in the middle of an entry, so begin at the
+                # first line after it which is not part of one.
+                match = _ENTRY_BOUNDARY.search(data)
+                if match is not None:
+                    boundary = match.start() + 1
+                    break
+                size *= 2
+        self._older.extend(reversed(_parse_entries(data[boundary:])))
+        self._parsed_from = start + boundary
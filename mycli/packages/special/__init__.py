@@ -51,6 +51,7 @@ from mycli.packages.special.iocommands import (
     unset_once_if_written,
     write_once,
     write_pipe_once,
+    write_redirected,
     write_tee,
 )
 
@@ -140,5 +141,6 @@ __all__: list[str] = [
     'unset_once_if_written',
     'write_once',
     'write_pipe_once',
+    'write_redirected',
     'write_tee',
 ]
@@ -6,7 +6,7 @@ import os
 import re
 import shlex
 import subprocess
-from time import sleep
+from time import monotonic, sleep
 from typing import Any, Generator, Iterable
 from uuid import uuid4
 
@@ -885,6 +885,25 @@ def write_once(output: str) -> None:
         written_to_once_file = True
 
 
+def write_redirected(lines: list[str]) -> None:
+    """Write a block of result lines to the tee, once and pipe_once
+    destinations, with a single write to each."""
+    global written_to_once_file
+    if tee_file:
+        write_tee('\n'.join(lines))
+    if not (once_file or PIPE_ONCE['process']):
+        return
+    nonempty = [line for line in lines if line]
+    if not nonempty:
+        return
+    if once_file:
+        click.echo(''.join(f'{line}\n' for line in nonempty), file=once_file, nl=False)
+        once_file.flush()
+        written_to_once_file = True
+    if PIPE_ONCE['process']:
+        PIPE_ONCE['stdin'].append('\n'.join(nonempty))
+
+
 def unset_once_if_written(post_redirect_command: str) -> None:
     """Unset the once file, if it has been written to."""
     global once_file, written_to_once_file
@@ -990,7 +1009,7 @@ def watch_query(arg: str, **kwargs) -> Generator[SQLResult, None, None]:
     usage = """Syntax: watch [seconds] [-c] query.
     * seconds: The interval at the query will be repeated, in seconds.
                By default 5.
-    * -c: Clears the screen between every iteration.
+    * -c: Clears the screen, then redraws what changed at every iteration.
 """
     if not arg:
         yield SQLResult(status=usage)
@@ -1025,17 +1044,22 @@ def watch_query(arg: str, **kwargs) -> Generator[SQLResult, None, None]:
     sql_list = [(sql.rstrip(";"), f"> {sql}") for sql in sqlparse.split(statement)]
     old_pager_enabled = is_pager_enabled()
     while True:
-        if clear_screen:
-            click.clear()
         try:
             # Somewhere in the code the pager its activated after every yield,
             # so we disable it in every iteration
             set_pager_enabled(False)
-            for sql, preamble in sql_list:
+            for index, (sql, preamble) in enumerate(sql_list):
+                server_start = monotonic()
                 cur.execute(sql)
+                # The screen is cleared, or redrawn, by the caller at the
+                # first statement of each iteration.
                 command: dict[str, str | float] = {
                     "name": "watch",
                     "seconds": seconds,
+                    "clear": clear_screen,
+                    "statement": index,
+                    "statements": len(sql_list),
+                    "server_seconds": monotonic() - server_start,
                 }
                 if cur.description:
                     header = [x[0] for x in cur.description]
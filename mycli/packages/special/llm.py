@@ -1,7 +1,3 @@
-__lazy_modules__ = [
-    'llm',
-]
-
 import contextlib
 import functools
 import io
@@ -15,32 +11,15 @@ from time import time
 from typing import Any
 
 import click
-
-try:
-    if not os.environ.get('MYCLI_LLM_OFF'):
-        import llm
-
-        LLM_IMPORTED = True
-    else:
-        LLM_IMPORTED = False
-except ImportError:
-    LLM_IMPORTED = False
-try:
-    if not os.environ.get('MYCLI_LLM_OFF'):
-        from llm.cli import cli
-
-        LLM_CLI_IMPORTED = True
-    else:
-        LLM_CLI_IMPORTED = False
-except ImportError:
-    LLM_CLI_IMPORTED = False
 from pymysql.cursors import Cursor
 
-from mycli.packages.special.main import CommandVerbosity, parse_special_command
+from mycli.packages.special.main import CommandVerbosity, llm_installed, parse_special_command
 from mycli.packages.sqlresult import SQLResult
 
 log = logging.getLogger(__name__)
 
+LLM_IMPORTED = llm_installed()
+
 LLM_TEMPLATE_NAME = "mycli-llm-template"
 
 SCHEMA_DATA_CACHE: dict[str, str] = {}
@@ -99,6 +78,8 @@ def _build_command_tree(cmd) -> dict[str, Any] | None:
     if isinstance(cmd, click.Group):
         for name, subcmd in cmd.commands.items():
             if cmd.name == "models" and name == "default":
+                import llm
+
                 tree[name] = {x.model_id: None for x in llm.get_models()}
             else:
                 tree[name] = _build_command_tree(subcmd)
@@ -111,15 +92,31 @@ def build_command_tree(cmd) -> dict[str, Any]:
     return _build_command_tree(cmd) or {}
 
 
-# Generate the command tree for autocompletion
-COMMAND_TREE = build_command_tree(cli) if LLM_CLI_IMPORTED is True else {}
+@functools.cache
+def llm_cli() -> click.Group | None:
+    """The llm command line, imported the first time it is needed, or None
+    if llm is not available."""
+    if not LLM_IMPORTED:
+        return None
+    try:
+        from llm.cli import cli
+    except ImportError:
+        return None
+    return cli
+
+
+@functools.cache
+def command_tree() -> dict[str, Any]:
+    """The tree of llm subcommands, for autocompletion."""
+    cli = llm_cli()
+    return build_command_tree(cli) if cli is not None else {}
 
 
 def get_completions(
     tokens: list[str],
     tree: dict[str, Any] | None = None,
 ) -> list[str]:
-    tree = tree or COMMAND_TREE
+    tree = tree or command_tree()
     for token in tokens:
         if token.startswith("-"):
             continue
@@ -218,7 +215,8 @@ def ensure_mycli_template(replace: bool = False) -> None:
 
 @functools.cache
 def cli_commands() -> list[str]:
-    return list(cli.commands.keys())
+    cli = llm_cli()
+    return list(cli.commands.keys()) if cli is not None else []
 
 
 def handle_llm(
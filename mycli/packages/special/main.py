@@ -1,23 +1,30 @@
 from dataclasses import dataclass
 from enum import Enum
+from importlib.util import find_spec
 import logging
 import os
 from typing import Callable
 import webbrowser
 
+from pymysql.cursors import Cursor
+
 from mycli.constants import DOCS_URL, ISSUES_URL
 from mycli.packages.sqlresult import SQLResult
 
-try:
-    if not os.environ.get('MYCLI_LLM_OFF'):
-        import llm  # noqa: F401
 
-        LLM_IMPORTED = True
-    else:
-        LLM_IMPORTED = False
-except ImportError:
-    LLM_IMPORTED = False
-from pymysql.cursors import Cursor
+def llm_installed() -> bool:
+    """Whether llm can be imported, without importing it: llm loads its
+    plugins and the SDKs of its model providers, which takes most of a
+    second, so it is only imported once an /llm command needs it."""
+    if os.environ.get('MYCLI_LLM_OFF'):
+        return False
+    try:
+        return find_spec('llm') is not None
+    except (ImportError, ValueError):
+        return False
+
+
+LLM_IMPORTED = llm_installed()
 
 logger = logging.getLogger(__name__)
 
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+from collections import deque
+import functools
 import re
-from typing import Any, Generator, Literal
+from typing import TYPE_CHECKING, Any, Generator, Literal, NamedTuple
 
-import sqlglot
-import sqlglot.tokens
 import sqlparse
 from sqlparse.sql import Function, Identifier, IdentifierList, Token, TokenList
-from sqlparse.tokens import DML, Keyword, Punctuation
+from sqlparse.tokens import DML, Comment, Keyword, Punctuation, Whitespace
+
+if TYPE_CHECKING:
+    # sqlglot takes a tenth of a second to import and is only needed to
+    # complete, to patch completions after DDL and in sandbox mode, so the
+    # functions which use it import it themselves.
+    import sqlglot.tokens
 
 sqlparse.engine.grouping.MAX_GROUPING_DEPTH = None  # type: ignore[assignment]
 sqlparse.engine.grouping.MAX_GROUPING_TOKENS = None  # type: ignore[assignment]
@@ -198,6 +204,44 @@ def extract_table_identifiers(token_stream: Generator[Any, None, None]) -> Gener
             yield (None, item.get_name(), item.get_name())
 
 
+@functools.lru_cache(maxsize=64)
+def parse_statements(sql: str) -> tuple[sqlparse.sql.Statement, ...]:
+    """`sqlparse.parse()`, cached, since completion parses the same text
+    several times for each keystroke.  The statements must not be modified."""
+    return tuple(sqlparse.parse(sql))
+
+
+# Leading runs of complete statements seen in recently parsed buffers.
+_complete_prefixes: deque[str] = deque(maxlen=16)
+
+
+def split_statements(sql: str) -> tuple[int, tuple[sqlparse.sql.Statement, ...]]:
+    """Parse *sql* into statements like `parse_statements()`, but skip any
+    leading complete statements which were parsed for an earlier buffer, so
+    that typing in a long buffer only re-parses the statement being typed.
+
+    Returns the offset in *sql* of the first statement returned, and the
+    statements from there on.
+    """
+    offset = max((len(prefix) for prefix in tuple(_complete_prefixes) if len(prefix) < len(sql) and sql.startswith(prefix)), default=0)
+    if offset:
+        statements = parse_statements(sql[offset:])
+        first = next(statements[0].flatten(), None) if statements else None
+        # sqlparse ends a statement at the first token after its semicolon
+        # which is neither whitespace nor a "--" comment; those would have
+        # been appended to the previous statement.
+        if first is None or first.ttype in (Whitespace, Comment.Single):
+            offset = 0
+    if not offset:
+        statements = parse_statements(sql)
+    if len(statements) > 1:
+        # All but the last statement are final, whatever follows them.
+        complete = offset + sum(len(str(statement)) for statement in statements[:-1])
+        if sql[:complete] not in _complete_prefixes:
+            _complete_prefixes.append(sql[:complete])
+    return offset, statements
+
+
 # extract_tables is inspired from examples in the sqlparse lib.
 def extract_tables(sql: str) -> list[tuple[str | None, str, str]]:
     """Extract the table names from an SQL statement.
@@ -205,7 +249,7 @@ def extract_tables(sql: str) -> list[tuple[str | None, str, str]]:
     Returns a list of (schema, table, alias) tuples
 
     """
-    parsed = sqlparse.parse(sql)
+    parsed = parse_statements(sql)
     if not parsed:
         return []
 
@@ -275,6 +319,8 @@ def extract_tables_from_complete_statements(sql: str) -> list[tuple[str | None,
     Returns a list of (schema, table, alias) tuples
 
     """
+    import sqlglot
+
     # sqlglot chokes entirely on things like "\T" that it doesn't know about,
     # but is much better at extracting table names from complete statements.
     # sqlparse can extract the series of statements, though it also doesn't
@@ -313,7 +359,7 @@ def find_prev_keyword(sql: str) -> tuple[Token | None, str]:
     if not sql.strip():
         return None, ""
 
-    parsed = sqlparse.parse(sql)[0]
+    parsed = parse_statements(sql)[0]
     flattened = list(parsed.flatten())
 
     logical_operators = ("AND", "OR", "NOT", "BETWEEN")
@@ -469,6 +515,195 @@ def need_completion_reset(queries: str) -> bool:
     return False
 
 
+class DDLTarget(NamedTuple):
+    """A database object whose completion metadata was changed by DDL."""
+
+    kind: Literal['database', 'table', 'function', 'procedure']
+    name: str
+    schema: str | None = None
+    dropped: bool = False
+
+
+_DDL_OBJECT_KINDS = {
+    'DATABASE': 'database',
+    'SCHEMA': 'database',
+    'TABLE': 'table',
+    'VIEW': 'table',
+    'INDEX': 'index',
+    'FUNCTION': 'function',
+    'PROCEDURE': 'procedure',
+}
+
+# Words which may come between CREATE/ALTER/DROP and the kind of object.
+_DDL_MODIFIERS = {
+    'OR',
+    'REPLACE',
+    'TEMPORARY',
+    'UNIQUE',
+    'FULLTEXT',
+    'SPATIAL',
+    'ONLINE',
+    'OFFLINE',
+    'IGNORE',
+    'AGGREGATE',
+    'ALGORITHM',
+    'UNDEFINED',
+    'MERGE',
+    'TEMPTABLE',
+    'DEFINER',
+    'CURRENT_USER',
+    '(',
+    ')',
+    # sqlglot usually reads SQL SECURITY as one token, but not when anything
+    # such as a comment separates the two words.
+    'SQL SECURITY',
+    'SQL',
+    'SECURITY',
+    'INVOKER',
+    '=',
+    '@',
+}
+
+
+def ddl_targets(queries: str) -> list[DDLTarget] | None:
+    """Find the objects whose completion metadata is changed by *queries*.
+
+    Returns None when the statements need a full completion refresh, such as
+    a database switch or DDL on users, triggers or events, or DDL which could
+    not be understood.  Statements which don't change the metadata are
+    ignored.
+
+    >>> ddl_targets('ALTER TABLE orders ADD COLUMN note TEXT')
+    [DDLTarget(kind='table', name='orders', schema=None, dropped=False)]
+    """
+    import sqlglot.tokens
+
+    targets: list[DDLTarget] = []
+    for query in sqlparse.split(queries):
+        words = query.split(None, 1)
+        if not words:
+            continue
+        verb = words[0].lower()
+        if verb not in ('alter', 'create', 'drop', 'rename'):
+            if need_completion_refresh(query):
+                return None
+            continue
+        try:
+            tokens = list(sqlglot.tokenize(words[1] if len(words) > 1 else '', dialect='mysql'))
+        except sqlglot.errors.TokenError:
+            return None
+        statement_targets = _ddl_statement_targets(verb, tokens)
+        if statement_targets is None:
+            return None
+        targets.extend(statement_targets)
+    return targets
+
+
+def _ddl_statement_targets(verb: str, tokens: list[sqlglot.tokens.Token]) -> list[DDLTarget] | None:
+    """The targets of one DDL statement, given the tokens after its verb."""
+    import sqlglot.tokens
+
+    tt = sqlglot.tokens.TokenType
+    texts = ['' if t.token_type in (tt.IDENTIFIER, tt.STRING) else t.text.upper() for t in tokens]
+
+    if verb == 'rename':
+        if texts[:1] != ['TABLE']:
+            return None
+        return _ddl_rename_targets(tokens, texts, 1)
+
+    i = 0
+    while i < len(tokens) and texts[i] not in _DDL_OBJECT_KINDS:
+        if texts[i] and texts[i] not in _DDL_MODIFIERS:
+            return None
+        i += 1
+    if i == len(tokens):
+        return None
+    kind = _DDL_OBJECT_KINDS[texts[i]]
+    i += 1
+    if texts[i : i + 2] == ['IF', 'EXISTS']:
+        i += 2
+    elif texts[i : i + 3] == ['IF', 'NOT', 'EXISTS']:
+        i += 3
+
+    if kind == 'index':
+        # CREATE INDEX name ON table, DROP INDEX name ON table
+        if 'ON' not in texts[i:]:
+            return None
+        name = _ddl_read_name(tokens, texts.index('ON', i) + 1)
+        return None if name is None else [DDLTarget('table', name[1], name[0])]
+
+    if verb == 'alter' and kind != 'table':
+        # ALTER DATABASE, FUNCTION or PROCEDURE change options only.
+        return []
+    if 'SONAME' in texts:
+        # Loadable functions are not completed.
+        return []
+
+    targets = []
+    while True:
+        name = _ddl_read_name(tokens, i)
+        if name is None:
+            return None
+        schema, object_name, i = name
+        targets.append(DDLTarget(kind, object_name, schema, dropped=verb == 'drop'))  # type: ignore[arg-type]
+        if verb != 'drop' or i >= len(tokens) or tokens[i].token_type != tt.COMMA:
+            break
+        i += 1
+
+    if verb == 'alter':
+        for j in range(i, len(tokens)):
+            # ALTER TABLE old RENAME [TO|AS] new, but not RENAME COLUMN/INDEX/KEY
+            if texts[j] != 'RENAME' or texts[j + 1 : j + 2] in (['COLUMN'], ['INDEX'], ['KEY']):
+                continue
+            new_name = _ddl_read_name(tokens, j + 2 if texts[j + 1 : j + 2] in (['TO'], ['AS']) else j + 1)
+            if new_name is None:
+                return None
+            targets.append(DDLTarget('table', new_name[1], new_name[0]))
+    return targets
+
+
+def _ddl_rename_targets(tokens: list[sqlglot.tokens.Token], texts: list[str], i: int) -> list[DDLTarget] | None:
+    """The targets of RENAME TABLE old TO new[, old TO new ...]."""
+    import sqlglot.tokens
+
+    targets = []
+    while True:
+        old_name = _ddl_read_name(tokens, i)
+        if old_name is None or texts[old_name[2] : old_name[2] + 1] != ['TO']:
+            return None
+        new_name = _ddl_read_name(tokens, old_name[2] + 1)
+        if new_name is None:
+            return None
+        targets.append(DDLTarget('table', old_name[1], old_name[0]))
+        targets.append(DDLTarget('table', new_name[1], new_name[0]))
+        i = new_name[2]
+        if i >= len(tokens) or tokens[i].token_type != sqlglot.tokens.TokenType.COMMA:
+            return targets
+        i += 1
+
+
+def _ddl_read_name(tokens: list[sqlglot.tokens.Token], i: int) -> tuple[str | None, str, int] | None:
+    """Read an optionally schema-qualified name at *i*.
+
+    Returns (schema, name, index after the name), or None if there is no name.
+    """
+    import sqlglot.tokens
+
+    tt = sqlglot.tokens.TokenType
+    punctuation = (tt.COMMA, tt.DOT, tt.L_PAREN, tt.R_PAREN, tt.SEMICOLON, tt.EQ, tt.STRING)
+
+    def is_name(j: int) -> bool:
+        return j < len(tokens) and tokens[j].token_type not in punctuation
+
+    if not is_name(i):
+        return None
+    if i + 1 < len(tokens) and tokens[i + 1].token_type == tt.DOT:
+        if not is_name(i + 2):
+            return None
+        return (tokens[i].text, tokens[i + 2].text, i + 3)
+    return (None, tokens[i].text, i + 1)
+
+
 def is_mutating(status_plain: str | None) -> bool:
     """Determines if the statement is mutating based on the status."""
     if not status_plain:
@@ -494,6 +729,8 @@ def classify_sandbox_statement(text: str) -> tuple[str | None, str | None]:
     - 'quit'          — quit, exit, \\q
     - None            — not allowed in sandbox mode
     """
+    import sqlglot.tokens
+
     stripped = text.strip()
     if not stripped:
         return ('quit', None)
@@ -533,6 +770,8 @@ def classify_sandbox_statement(text: str) -> tuple[str | None, str | None]:
 
 def _find_password_after_by(tokens: list[sqlglot.tokens.Token]) -> str | None:
     """Find a password literal following a BY token (for ALTER USER ... IDENTIFIED BY 'pw')."""
+    import sqlglot.tokens
+
     tt = sqlglot.tokens.TokenType
     for i, tok in enumerate(tokens):
         if tok.token_type == tt.VAR and tok.text.upper() == 'BY' and i + 1 < len(tokens):
@@ -544,6 +783,8 @@ def _find_password_after_by(tokens: list[sqlglot.tokens.Token]) -> str | None:
 
 def _find_password_after_eq(tokens: list[sqlglot.tokens.Token]) -> str | None:
     """Find a password literal following an = token (for SET PASSWORD = 'pw')."""
+    import sqlglot.tokens
+
     tt = sqlglot.tokens.TokenType
     for i, tok in enumerate(tokens):
         if tok.token_type == tt.EQ and i + 1 < len(tokens):
@@ -0,0 +1,181 @@
+"""Incremental rendering of large result sets.
+
+`TabularOutputFormatter.format_output()` materializes every row before
+formatting, and tabulate needs every row to size the columns, so a large
+SELECT is held in memory in full before its first line is printed.  The
+renderer here sizes the columns of bordered tables from a leading sample of
+rows instead, then emits one line per row as the rest are fetched.  A value
+in a later row which is wider than anything in the sample pushes out the
+right-hand border of its line.  Formats which are laid out one row at a time
+anyway (CSV, TSV, JSON lines and SQL) are handed the rows lazily.
+"""
+
+from __future__ import annotations
+
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator, Sequence
+
+from cli_helpers.tabular_output import (
+    TabularOutputFormatter,
+    delimited_output_adapter,
+    json_output_adapter,
+    tabulate_adapter,
+    tsv_output_adapter,
+)
+from cli_helpers.utils import strip_ansi, unique_items
+from prompt_toolkit.utils import get_cwidth
+import tabulate
+
+from mycli.packages.tabular_output import sql_format
+
+SAMPLE_ROWS = 1000
+
+_ROW_ADAPTERS = (
+    delimited_output_adapter.adapter,
+    json_output_adapter.adapter,
+    tsv_output_adapter.adapter,
+    sql_format.adapter,
+)
+
+_ALIGNMENTS = ('left', 'right', 'center')
+
+
+def _table_format_name(formatter: TabularOutputFormatter, format_name: str) -> str | None:
+    output_format = formatter._output_formats.get(format_name)
+    if output_format is None or output_format.formatter is not tabulate_adapter.adapter:
+        return None
+    return output_format.formatter_args.get('table_format')
+
+
+def supports_streaming(formatter: TabularOutputFormatter, format_name: str) -> bool:
+    """Whether *format_name* can be rendered row by row."""
+    output_format = formatter._output_formats.get(format_name)
+    if output_format is not None and output_format.formatter in _ROW_ADAPTERS:
+        return True
+    table_format = _table_format_name(formatter, format_name)
+    if table_format is None or table_format in tabulate_adapter.headless_formats:
+        return False
+    fmt = tabulate._table_formats.get(table_format)
+    if fmt is None or fmt.linebetweenrows is not None or fmt.with_header_hide:
+        return False
+    lines = (fmt.lineabove, fmt.linebelowheader, fmt.linebelow)
+    rows = (fmt.headerrow, fmt.datarow)
+    return all(line is None or isinstance(line, tabulate.Line) for line in lines) and all(isinstance(row, tabulate.DataRow) for row in rows)
+
+
+def _cell_width(lines: list[str]) -> int:
+    return max(get_cwidth(strip_ansi(line)) for line in lines)
+
+
+def _align(text: str, width: int, alignment: str) -> str:
+    fill = width - get_cwidth(strip_ansi(text))
+    if fill <= 0:
+        return text
+    if alignment == 'right':
+        return ' ' * fill + text
+    if alignment == 'center':
+        return ' ' * (fill // 2) + text + ' ' * (fill - fill // 2)
+    return text + ' ' * fill
+
+
+def _render_line(line: tabulate.Line | None, widths: list[int], padding: int) -> Iterator[str]:
+    if line is None:
+        return
+    begin, fill, sep, end = line
+    yield (begin + sep.join(fill * (width + 2 * padding) for width in widths) + end).rstrip()
+
+
+def _render_row(
+    row_format: tabulate.DataRow,
+    cells: Sequence[list[str]],
+    widths: list[int],
+    colalign: Sequence[str],
+    padding: int,
+) -> Iterator[str]:
+    begin, sep, end = row_format
+    pad = ' ' * padding
+    height = max((len(lines) for lines in cells), default=1)
+    for i in range(height):
+        parts = [
+            pad + _align(lines[i] if i < len(lines) else '', width, alignment) + pad
+            for lines, width, alignment in zip(cells, widths, colalign, strict=False)
+        ]
+        yield (begin + sep.join(parts) + end).rstrip()
+
+
+def render_table(
+    data: Iterable[Sequence[str]],
+    headers: Sequence[str],
+    table_format: str,
+    colalign: Sequence[str] | None = None,
+    preserve_whitespace: bool = False,
+    sample_rows: int = SAMPLE_ROWS,
+) -> Iterator[str]:
+    """Lay out already-preprocessed *data* in a tabulate *table_format*.
+
+    Column widths are taken from *headers* and the first *sample_rows* rows;
+    output for tables which fit in the sample is the same as tabulate's.
+    """
+    fmt = tabulate._table_formats[table_format]
+    multiline = table_format in tabulate.multiline_formats
+
+    def split_cells(row: Sequence[str]) -> list[list[str]]:
+        if not preserve_whitespace:
+            row = [cell.strip() for cell in row]
+        return [cell.split('\n') if multiline else [cell] for cell in row]
+
+    rows = (split_cells(row) for row in data)
+    sample = list(islice(rows, sample_rows))
+    header_cells = split_cells(headers)
+
+    num_columns = len(header_cells) or max((len(row) for row in sample), default=0)
+    widths = [_cell_width(header) for header in header_cells] or [0] * num_columns
+    for row in sample:
+        for i, cell in enumerate(row):
+            widths[i] = max(widths[i], _cell_width(cell))
+    alignments = list(colalign or ()) + ['left'] * (num_columns - len(colalign or ()))
+
+    yield from _render_line(fmt.lineabove, widths, fmt.padding)
+    if header_cells:
+        yield from _render_row(fmt.headerrow, header_cells, widths, alignments, fmt.padding)
+        yield from _render_line(fmt.linebelowheader, widths, fmt.padding)
+    for row in chain(sample, rows):
+        yield from _render_row(fmt.datarow, row, widths, alignments, fmt.padding)
+    yield from _render_line(fmt.linebelow, widths, fmt.padding)
+
+
+def format_output(
+    formatter: TabularOutputFormatter,
+    data: Iterable[Sequence[Any]],
+    headers: Sequence[str],
+    format_name: str,
+    preprocessors: tuple = (),
+    column_types: list[type] | None = None,
+    colalign: Sequence[str] | None = None,
+    sample_rows: int = SAMPLE_ROWS,
+    **kwargs,
+) -> Iterator[str]:
+    """Like `TabularOutputFormatter.format_output()`, without materializing *data*.
+
+    *format_name* must satisfy `supports_streaming()`.  The formatter's own
+    preprocessors are applied lazily, row by row.
+    """
+    output_format = formatter._output_formats[format_name]
+    fkwargs = dict(output_format.formatter_args)
+    fkwargs.update(kwargs)
+    for preprocessor in unique_items(preprocessors + output_format.preprocessors):
+        data, headers = preprocessor(data, headers, column_types=column_types, **fkwargs)
+    if output_format.formatter in _ROW_ADAPTERS:
+        return iter(output_format.formatter(data, headers, column_types=column_types, **fkwargs))
+    return render_table(
+        data,
+        headers,
+        fkwargs['table_format'],
+        colalign=colalign,
+        preserve_whitespace=fkwargs.get('preserve_whitespace', False),
+        sample_rows=sample_rows,
+    )
+
+
+def can_stream_alignment(colalign: Sequence[str] | None) -> bool:
+    return all(alignment in _ALIGNMENTS for alignment in colalign or ())
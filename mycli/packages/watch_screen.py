@@ -0,0 +1,66 @@
+"""Redraw the output of ``watch -c`` in place.
+
+Clearing the screen and printing every line again on each tick is heavy on
+the terminal when a large result is polled often, and flickers.
+`WatchScreen` keeps the lines of the frame on screen and rewrites only the
+ones that changed, clearing whatever is left of a longer previous frame.
+
+Lines are addressed by screen row, so a frame with lines wider than the
+terminal, which wrap, or taller than it, which scrolls, is repainted whole,
+as is the first frame after the terminal was resized.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from cli_helpers.utils import strip_ansi
+from prompt_toolkit.utils import get_cwidth
+
+CLEAR_SCREEN = '\x1b[H\x1b[J'
+CLEAR_LINE = '\x1b[K'
+CLEAR_BELOW = '\x1b[J'
+
+
+def _cursor_to_row(row: int) -> str:
+    return f'\x1b[{row + 1};1H'
+
+
+class WatchScreen:
+    """The frames of a watched query, drawn on a terminal of *columns* by
+    *rows* characters."""
+
+    def __init__(self, columns: int, rows: int) -> None:
+        self.columns = columns
+        self.rows = rows
+        self._shown: list[str] | None = None
+        self._lines: list[str] = []
+
+    def resize(self, columns: int, rows: int) -> None:
+        """Draw the next frame on a terminal of *columns* by *rows*
+        characters, repainting it whole if the size changed."""
+        if (columns, rows) != (self.columns, self.rows):
+            self.columns = columns
+            self.rows = rows
+            self._shown = None
+
+    def add(self, lines: Iterable[str]) -> None:
+        """Add *lines* to the next frame."""
+        self._lines.extend(lines)
+
+    def render(self) -> str:
+        """Return the text which turns the frame on screen into the one
+        added since, and start another."""
+        lines, self._lines = self._lines, []
+        shown, self._shown = self._shown, lines
+        if shown is None or not self._fits(shown) or not self._fits(lines):
+            return CLEAR_SCREEN + ''.join(f'{line}\n' for line in lines)
+
+        changes = [f'{_cursor_to_row(row)}{line}{CLEAR_LINE}' for row, line in enumerate(lines) if row >= len(shown) or shown[row] != line]
+        if len(lines) < len(shown):
+            changes.append(f'{_cursor_to_row(len(lines))}{CLEAR_BELOW}')
+        changes.append(_cursor_to_row(len(lines)))
+        return ''.join(changes)
+
+    def _fits(self, lines: list[str]) -> bool:
+        return len(lines) < self.rows and all(get_cwidth(strip_ansi(line)) <= self.columns for line in lines)
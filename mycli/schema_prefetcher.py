@@ -13,7 +13,7 @@ from enum import Enum
 import logging
 import threading
 from time import monotonic
-from typing import TYPE_CHECKING, Any, Iterable
+from typing import TYPE_CHECKING, Any, Callable, Iterable
 
 from mycli.sqlexecute import SQLExecute
 
@@ -23,6 +23,10 @@ if TYPE_CHECKING:  # pragma: no cover - typing only
 
 _logger = logging.getLogger(__name__)
 MIN_PREFETCH_MESSAGE_SECONDS = 1.0
+DEFAULT_PREFETCH_PARALLELISM = 1
+# From this many schemas on, metadata is fetched for every schema at once,
+# in one query per kind of metadata, instead of in six queries per schema.
+BULK_PREFETCH_MIN_SCHEMAS = 8
 
 
 class PrefetchMode(str, Enum):
@@ -124,6 +128,7 @@ class SchemaPrefetcher:
         self._invalidate_app()
 
     def _run(self, schemas: list[str] | None) -> None:
+        cancel = self._cancel
         executor: SQLExecute | None = None
         try:
             executor = self._make_executor()
@@ -141,8 +146,69 @@ class SchemaPrefetcher:
             current = self._current_schema()
             existing = set(self.mycli.completer.dbmetadata.get('tables', {}).keys())
             queue = [s for s in schemas if s and s != current and s not in self._loaded and s not in existing]
-            for schema in queue:
-                if self._cancel.is_set():
+            if len(queue) >= BULK_PREFETCH_MIN_SCHEMAS:
+                try:
+                    self._prefetch_bulk(executor, queue, cancel)
+                    return
+                except Exception as e:
+                    _logger.error('bulk schema prefetch failed, prefetching schemas one at a time: %r', e)
+                    queue = [s for s in queue if s not in self._loaded]
+            self._prefetch_all(executor, queue, cancel)
+        finally:
+            self._release_executor(executor, cancel)
+            self._finish_prefetching()
+
+    def _parallelism(self) -> int:
+        parallelism = getattr(self.mycli, 'prefetch_schemas_parallelism', DEFAULT_PREFETCH_PARALLELISM)
+        return max(1, parallelism or DEFAULT_PREFETCH_PARALLELISM)
+
+    def _prefetch_all(self, executor: SQLExecute, schemas: list[str], cancel: threading.Event) -> None:
+        """Prefetch *schemas* over up to ``prefetch_schemas_parallelism``
+        connections, the first of which is *executor*.
+
+        Each extra worker thread opens its own connection.  Results are
+        merged into the completer under ``_completer_lock`` as each schema
+        finishes.
+        """
+        pending = iter(schemas)
+        pending_lock = threading.Lock()
+
+        def next_schema() -> str | None:
+            with pending_lock:
+                return next(pending, None)
+
+        workers = [
+            threading.Thread(
+                target=self._prefetch_worker,
+                args=(None, next_schema, cancel),
+                name=f'schema_prefetcher_{i}',
+                daemon=True,
+            )
+            for i in range(1, min(self._parallelism(), len(schemas)))
+        ]
+        for worker in workers:
+            worker.start()
+        self._prefetch_worker(executor, next_schema, cancel)
+        for worker in workers:
+            worker.join()
+
+    def _prefetch_worker(
+        self,
+        executor: SQLExecute | None,
+        next_schema: Callable[[], str | None],
+        cancel: threading.Event,
+    ) -> None:
+        own_executor = executor is None
+        if executor is None:
+            try:
+                executor = self._make_executor()
+            except Exception as e:
+                _logger.error('schema prefetch could not open connection: %r', e)
+                return
+        try:
+            while not cancel.is_set():
+                schema = next_schema()
+                if schema is None:
                     return
                 try:
                     self._prefetch_one(executor, schema)
@@ -150,11 +216,8 @@ class SchemaPrefetcher:
                 except Exception as e:
                     _logger.error('prefetch failed for schema %r: %r', schema, e)
         finally:
-            try:
-                executor.close()
-            except Exception:  # pragma: no cover - defensive
-                pass
-            self._finish_prefetching()
+            if own_executor:
+                self._release_executor(executor, cancel)
 
     def _finish_prefetching(self) -> None:
         self._invalidate_app()
@@ -171,15 +234,61 @@ class SchemaPrefetcher:
         self._visibility_timer = None
         self._invalidate_app()
 
+    def _prefetch_bulk(self, executor: SQLExecute, schemas: list[str], cancel: threading.Event) -> None:
+        """Prefetch *schemas* with one query per kind of metadata over all of
+        them, partitioning the rows by schema on the client."""
+        _logger.debug('prefetching %d schemas in bulk', len(schemas))
+        rows: dict[str, dict[str, list[tuple]]] = {
+            schema: {'table_rows': [], 'indexed_rows': [], 'fk_rows': [], 'enum_rows': [], 'func_rows': [], 'proc_rows': []}
+            for schema in schemas
+        }
+        sources: list[tuple[str, Callable[[list[str]], Iterable[tuple]]]] = [
+            ('table_rows', executor.all_table_columns),
+            ('indexed_rows', executor.all_indexed_columns),
+            ('fk_rows', executor.all_foreign_keys),
+            ('enum_rows', executor.all_enum_values),
+        ]
+        for kind, fetch in sources:
+            if cancel.is_set():
+                return
+            for schema, *row in fetch(schemas):
+                if schema in rows:
+                    rows[schema][kind].append(tuple(row))
+        if cancel.is_set():
+            return
+        for schema, routine_type, routine_name in executor.all_routines(schemas):
+            if schema in rows:
+                kind = 'func_rows' if routine_type == 'FUNCTION' else 'proc_rows'
+                rows[schema][kind].append((routine_name,))
+
+        for schema in schemas:
+            if cancel.is_set():
+                return
+            self._load_schema(schema, **rows[schema])
+            self._loaded.add(schema)
+
     def _prefetch_one(self, executor: SQLExecute, schema: str) -> None:
         _logger.debug('prefetching schema %r', schema)
-        table_rows = list(executor.table_columns(schema=schema))
-        indexed_rows = list(executor.indexed_columns(schema=schema))
-        fk_rows = list(executor.foreign_keys(schema=schema))
-        enum_rows = list(executor.enum_values(schema=schema))
-        func_rows = list(executor.functions(schema=schema))
-        proc_rows = list(executor.procedures(schema=schema))
+        self._load_schema(
+            schema,
+            table_rows=list(executor.table_columns(schema=schema)),
+            indexed_rows=list(executor.indexed_columns(schema=schema)),
+            fk_rows=list(executor.foreign_keys(schema=schema)),
+            enum_rows=list(executor.enum_values(schema=schema)),
+            func_rows=list(executor.functions(schema=schema)),
+            proc_rows=list(executor.procedures(schema=schema)),
+        )
 
+    def _load_schema(
+        self,
+        schema: str,
+        table_rows: Iterable[tuple],
+        indexed_rows: Iterable[tuple],
+        fk_rows: Iterable[tuple],
+        enum_rows: Iterable[tuple],
+        func_rows: Iterable[tuple],
+        proc_rows: Iterable[tuple],
+    ) -> None:
         # Use the live completer's escape logic so keys match what the
         # completion engine computes when parsing user input.
         completer = self.mycli.completer
@@ -246,6 +355,9 @@ class SchemaPrefetcher:
     def _make_executor(self) -> SQLExecute:
         sqlexecute = self.mycli.sqlexecute
         assert sqlexecute is not None
+        pool = getattr(self.mycli, 'connection_pool', None)
+        if pool is not None:
+            return pool.acquire(sqlexecute)
         return SQLExecute(
             sqlexecute.dbname,
             sqlexecute.user,
@@ -258,6 +370,19 @@ class SchemaPrefetcher:
             sqlexecute.ssl,
         )
 
+    def _release_executor(self, executor: SQLExecute, cancel: threading.Event) -> None:
+        """Hand *executor* back to the connection pool, or close it.  A
+        cancelled prefetch may have left results unread, so its connection
+        is not reused."""
+        pool = getattr(self.mycli, 'connection_pool', None)
+        try:
+            if pool is not None:
+                pool.release(executor, discard=cancel.is_set())
+            else:
+                executor.close()
+        except Exception:  # pragma: no cover - defensive
+            pass
+
     def _invalidate_app(self) -> None:
         prompt_session = getattr(self.mycli, 'prompt_session', None)
         if prompt_session is None:
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 from collections import Counter
 from enum import IntEnum
+import functools
 import logging
 import os
 import re
 import shlex
 import subprocess
-from typing import Any, Collection, Generator, Iterable, Literal
+import threading
+from typing import Any, Callable, Collection, Generator, Hashable, Iterable, Literal, TypeVar, cast
 
 from jinja2 import TemplateError
 from prompt_toolkit.completion import CompleteEvent, Completer, Completion
@@ -16,7 +18,8 @@ from pygments.lexers._mysql_builtins import MYSQL_DATATYPES, MYSQL_FUNCTIONS, MY
 import rapidfuzz
 
 from mycli.compat import WIN
-from mycli.packages.completion_engine import is_inside_quotes, suggest_type
+from mycli.packages.completion_engine import current_statement_text, is_inside_quotes, suggest_type
+from mycli.packages.completion_index import CompletionIndex
 from mycli.packages.filepaths import complete_path, parse_path, suggest_path
 from mycli.packages.special import llm
 from mycli.packages.special.dsn_aliases import DsnAliases
@@ -31,6 +34,29 @@ from mycli.packages.sql_utils import extract_columns_from_select, extract_tables
 _logger = logging.getLogger(__name__)
 _CASE_CHANGE_PAT = re.compile('(?<=[a-z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
 _INDEXED_COLUMN_STYLE = 'class:completion-menu.completion.indexed'
+# Collections at least this large are matched through a CompletionIndex.
+_COMPLETION_INDEX_MIN_ITEMS = 1000
+# How many indexes of recently matched collections are kept.
+_COMPLETION_INDEX_CACHE_SIZE = 4
+# How many candidate collections built from the metadata are kept.
+_COLLECTION_CACHE_SIZE = 16
+
+_F = TypeVar('_F', bound=Callable[..., Any])
+_T = TypeVar('_T')
+
+
+def _changes_metadata(method: _F) -> _F:
+    """Mark a method of SQLCompleter as changing the completion metadata,
+    so that candidates built from the old metadata are not used again."""
+
+    @functools.wraps(method)
+    def wrapper(self: SQLCompleter, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self.metadata_generation += 1
+
+    return cast(_F, wrapper)
 
 
 class Fuzziness(IntEnum):
@@ -943,6 +969,10 @@ class SQLCompleter(Completer):
 
     collations: list[str] = []
 
+    # Bumped whenever the metadata changes; part of the key of every cached
+    # candidate collection.
+    metadata_generation = 0
+
     def __init__(
         self,
         smart_completion: bool = True,
@@ -1006,6 +1036,7 @@ class SQLCompleter(Completer):
             self.users.extend(user)
             self.all_completions.update(user)
 
+    @_changes_metadata
     def extend_schemata(self, schema: str | None) -> None:
         if schema is None:
             return
@@ -1017,6 +1048,7 @@ class SQLCompleter(Completer):
             metadata[schema] = {}
         self.all_completions.update(schema)
 
+    @_changes_metadata
     def extend_relations(self, data: list[tuple[str, str]], kind: Literal['tables', 'views']) -> None:
         """Extend metadata for tables or views
 
@@ -1036,6 +1068,7 @@ class SQLCompleter(Completer):
                 _logger.error("%r %r listed in unrecognized schema %r", kind, relname[0], self.dbname)
             self.all_completions.add(relname[0])
 
+    @_changes_metadata
     def extend_columns(self, column_data: list[tuple[str, str]], kind: Literal['tables', 'views']) -> None:
         """Extend column metadata
 
@@ -1057,6 +1090,7 @@ class SQLCompleter(Completer):
             metadata[self.dbname][relname].append(column)
             self.all_completions.add(column)
 
+    @_changes_metadata
     def extend_indexed_columns(self, index_data: Iterable[tuple[str, str]]) -> None:
         """Extend metadata for columns that lead an index."""
         metadata = self.dbmetadata["indexed_columns"]
@@ -1066,6 +1100,7 @@ class SQLCompleter(Completer):
             column = self.escape_name(column)
             schema_meta.setdefault(table, set()).add(column)
 
+    @_changes_metadata
     def extend_enum_values(self, enum_data: Iterable[tuple[str, str, list[str]]]) -> None:
         metadata = self.dbmetadata["enum_values"]
         if self.dbname not in metadata:
@@ -1077,6 +1112,7 @@ class SQLCompleter(Completer):
             table_meta = metadata[self.dbname].setdefault(relname_escaped, {})
             table_meta[column_escaped] = values
 
+    @_changes_metadata
     def extend_foreign_keys(self, fk_data: Iterable[tuple[str, str, str, str]]) -> None:
         """Extend FK metadata.
 
@@ -1122,6 +1158,7 @@ class SQLCompleter(Completer):
                 conditions.append(f"{lhs}.{fk_col} = {rhs}.{ref_col}")
         return conditions
 
+    @_changes_metadata
     def extend_functions(self, func_data: list[str] | Generator[tuple[str, str]], builtin: bool = False) -> None:
         # if 'builtin' is set this is extending the list of builtin functions
         if builtin:
@@ -1146,6 +1183,7 @@ class SQLCompleter(Completer):
             metadata[self.dbname][func[0]] = None
             self.all_completions.add(func[0])
 
+    @_changes_metadata
     def extend_procedures(self, procedure_data: Generator[tuple]) -> None:
         metadata = self.dbmetadata["procedures"]
         if self.dbname not in metadata:
@@ -1178,9 +1216,11 @@ class SQLCompleter(Completer):
             self.collations.append(elt[0])
             self.all_completions.update(elt[0])
 
+    @_changes_metadata
     def set_dbname(self, dbname: str | None) -> None:
         self.dbname = dbname or ''
 
+    @_changes_metadata
     def load_schema_metadata(
         self,
         schema: str,
@@ -1209,6 +1249,94 @@ class SQLCompleter(Completer):
         self.dbmetadata["foreign_keys"][schema] = foreign_keys
         self._register_schema_completions(schema, table_columns, functions)
 
+    @_changes_metadata
+    def update_table_metadata(
+        self,
+        schema: str,
+        table: str,
+        columns: list[str],
+        indexed_columns: list[str],
+        enum_values: list[tuple[str, list[str]]],
+        foreign_keys: list[tuple[str, str, str, str]],
+    ) -> None:
+        """Replace the metadata for *table* in *schema* after DDL changed it.
+
+        A table without *columns* is removed.  *foreign_keys* replaces every
+        relation the table takes part in.  Schemas which were never loaded
+        are left alone.  As in ``load_schema_metadata``, the per-schema dicts
+        are replaced rather than modified in place.
+        """
+        if schema not in self.dbmetadata["tables"]:
+            return
+        table = self.escape_name(table)
+        table_columns = dict(self.dbmetadata["tables"][schema])
+        schema_indexed_columns = dict(self.dbmetadata["indexed_columns"].get(schema, {}))
+        schema_enum_values = dict(self.dbmetadata["enum_values"].get(schema, {}))
+        table_columns.pop(table, None)
+        schema_indexed_columns.pop(table, None)
+        schema_enum_values.pop(table, None)
+        if columns:
+            table_columns[table] = ["*", *self.escaped_names(columns)]
+            if indexed_columns:
+                schema_indexed_columns[table] = set(self.escaped_names(indexed_columns))
+            if enum_values:
+                schema_enum_values[table] = {self.escape_name(column): values for column, values in enum_values}
+
+        relations = [
+            relation
+            for relation in self.dbmetadata["foreign_keys"].get(schema, {}).get("relations", [])
+            if table not in (relation[0], relation[2])
+        ]
+        for fk_table, col, ref_table, ref_col in foreign_keys:
+            relations.append((self.escape_name(fk_table), self.escape_name(col), self.escape_name(ref_table), self.escape_name(ref_col)))
+        fk_tables: dict[str, set[str]] = {}
+        for fk_table, _col, ref_table, _ref_col in relations:
+            fk_tables.setdefault(fk_table, set()).add(ref_table)
+            fk_tables.setdefault(ref_table, set()).add(fk_table)
+
+        self.dbmetadata["tables"][schema] = table_columns
+        self.dbmetadata["indexed_columns"][schema] = schema_indexed_columns
+        self.dbmetadata["enum_values"][schema] = schema_enum_values
+        self.dbmetadata["foreign_keys"][schema] = {"tables": fk_tables, "relations": relations}
+        if columns:
+            self._register_schema_completions(schema, {table: table_columns[table]}, {})
+
+    @_changes_metadata
+    def update_routine_metadata(
+        self,
+        schema: str,
+        kind: Literal["functions", "procedures"],
+        name: str,
+        dropped: bool = False,
+    ) -> None:
+        """Add or remove the function or procedure *name* in *schema*."""
+        if schema not in self.dbmetadata["tables"]:
+            return
+        name = self.escape_name(name)
+        routines = dict(self.dbmetadata[kind].get(schema, {}))
+        if dropped:
+            routines.pop(name, None)
+        else:
+            routines[name] = None
+            self.all_completions.add(name)
+        self.dbmetadata[kind][schema] = routines
+
+    @_changes_metadata
+    def update_database_name(self, name: str, dropped: bool = False) -> None:
+        """Add or remove the database *name*, with any metadata loaded for it."""
+        escaped = self.escape_name(name)
+        if not dropped:
+            if escaped not in self.databases:
+                self.databases.append(escaped)
+            self.all_completions.add(name)
+            return
+        while escaped in self.databases:
+            self.databases.remove(escaped)
+        for kind, metadata in list(self.dbmetadata.items()):
+            if name in metadata:
+                self.dbmetadata[kind] = {schema: data for schema, data in metadata.items() if schema != name}
+
+    @_changes_metadata
     def copy_other_schemas_from(self, source: "SQLCompleter", exclude: str | None) -> None:
         """Copy per-schema metadata from *source*, skipping *exclude*.
 
@@ -1249,6 +1377,7 @@ class SQLCompleter(Completer):
         for func_name in functions:
             self.all_completions.add(func_name)
 
+    @_changes_metadata
     def reset_completions(self) -> None:
         self.databases: list[str] = []
         self.users: list[str] = []
@@ -1266,6 +1395,8 @@ class SQLCompleter(Completer):
             "indexed_columns": {},
         }
         self.all_completions = set(self.keywords + self.functions)
+        self._completion_indexes: dict[tuple[str, ...], CompletionIndex] = {}
+        self._collections: dict[tuple, Any] = {}
 
     def maybe_quote_identifier(self, item: str) -> str:
         if item.startswith('`'):
@@ -1304,11 +1435,14 @@ class SQLCompleter(Completer):
         pattern: re.Pattern[str],
         under_words_text: list[str],
         case_words_text: list[str],
+        lowered: str | None = None,
     ) -> int | None:
-        if pattern.search(item.lower()):
+        if lowered is None:
+            lowered = item.lower()
+        if pattern.search(lowered):
             return Fuzziness.REGEX
 
-        under_words_item = [x for x in item.lower().split('_') if x]
+        under_words_item = [x for x in lowered.split('_') if x]
         if self.word_parts_match(under_words_text, under_words_item):
             return Fuzziness.UNDER_WORDS
 
@@ -1330,15 +1464,31 @@ class SQLCompleter(Completer):
         under_words_text = [x for x in text.split('_') if x]
         case_words_text = re.split(_CASE_CHANGE_PAT, last)
 
-        for item in collection:
-            fuzziness = self.find_fuzzy_match(item, pattern, under_words_text, case_words_text)
-            if fuzziness is not None:
-                completions.append((item, fuzziness))
+        index = self.completion_index(collection) if len(collection) >= _COMPLETION_INDEX_MIN_ITEMS else None
+        if index is None:
+            candidates: Collection[Any] = collection
+            for item in collection:
+                fuzziness = self.find_fuzzy_match(item, pattern, under_words_text, case_words_text)
+                if fuzziness is not None:
+                    completions.append((item, fuzziness))
+        else:
+            # Every kind of match needs the characters of the word, other
+            # than underscores, to appear in the item.
+            for i in index.containing(set(text) - {'_'}):
+                item = index.items[i]
+                fuzziness = self.find_fuzzy_match(item, pattern, under_words_text, case_words_text, index.lowered[i])
+                if fuzziness is not None:
+                    completions.append((item, fuzziness))
 
         if len(text) >= 4:
+            if index is not None:
+                # Only score items sharing most of the letters and digits of
+                # the word, the only ones likely to pass the cutoff.
+                chars = {char for char in text if char.isalnum()}
+                candidates = [index.items[i] for i in index.sharing(chars, len(chars) - len(chars) // 5)]
             rapidfuzz_matches = rapidfuzz.process.extract(
                 text,
-                collection,
+                candidates,
                 scorer=rapidfuzz.fuzz.WRatio,
                 # todo: maybe make our own processor which only does case-folding
                 # because underscores are valuable info
@@ -1354,6 +1504,30 @@ class SQLCompleter(Completer):
 
         return completions
 
+    def cached_collection(self, build: Callable[..., _T], *args: Hashable) -> _T:
+        """Return ``build(*args)``, reusing the result for the same arguments
+        until the metadata changes."""
+        key = (self.metadata_generation, build.__name__, *args)
+        collection = self._collections.get(key)
+        if collection is None:
+            collection = build(*args)
+            self._collections[key] = collection
+            while len(self._collections) > _COLLECTION_CACHE_SIZE:
+                self._collections.pop(next(iter(self._collections)), None)
+        return collection
+
+    def completion_index(self, collection: Collection[str]) -> CompletionIndex:
+        """Return the index of *collection*, building it the first time the
+        collection is seen with these contents."""
+        key = tuple(collection)
+        index = self._completion_indexes.get(key)
+        if index is None:
+            index = CompletionIndex(key)
+            self._completion_indexes[key] = index
+            while len(self._completion_indexes) > _COMPLETION_INDEX_CACHE_SIZE:
+                self._completion_indexes.pop(next(iter(self._completion_indexes)), None)
+        return index
+
     def find_perfect_matches(
         self,
         text: str,
@@ -1361,6 +1535,13 @@ class SQLCompleter(Completer):
         start_only: bool,
     ) -> list[tuple[str, int]]:
         completions: list[tuple[str, int]] = []
+        if len(collection) >= _COMPLETION_INDEX_MIN_ITEMS:
+            index = self.completion_index(collection)
+            if start_only:
+                positions = index.starting_with(text)
+            else:
+                positions = [i for i in index.containing(text) if text in index.lowered[i]]
+            return [(index.items[i], Fuzziness.PERFECT) for i in positions]
         match_end_limit = len(text) if start_only else None
         for item in collection:
             match_point = item.lower().find(text, 0, match_end_limit)
@@ -1432,7 +1613,10 @@ class SQLCompleter(Completer):
         document: Document,
         complete_event: CompleteEvent | None,
         smart_completion: bool | None = None,
+        cancelled: threading.Event | None = None,
     ) -> Iterable[Completion]:
+        """Return the completions for *document*, or none at all once
+        *cancelled* is set, which is checked between kinds of suggestion."""
         word_before_cursor = document.get_word_before_cursor(WORD=True)
         last_for_len = last_word(word_before_cursor, include="most_punctuations")
         text_for_len = last_for_len.lower()
@@ -1464,22 +1648,16 @@ class SQLCompleter(Completer):
 
         rank = 0
         for suggestion in suggestions:
+            if cancelled is not None and cancelled.is_set():
+                return []
             _logger.debug("Suggestion type: %r", suggestion["type"])
             rank += 1
 
             if suggestion["type"] == "column":
                 tables = suggestion["tables"]
                 _logger.debug("Completion column scope: %r", tables)
-                scoped_cols = self.populate_scoped_cols(tables)
-                if suggestion.get("drop_unique"):
-                    # drop_unique is used for 'tb11 JOIN tbl2 USING (...'
-                    # which should suggest only columns that appear in more than
-                    # one table
-                    scoped_cols = [col for (col, count) in Counter(scoped_cols).items() if count > 1 and col != "*"]
-                elif not tables:
-                    # if tables was empty, this is a naked SELECT and we are
-                    # showing all columns. So make them unique and sort them.
-                    scoped_cols = sorted(set(scoped_cols), key=lambda s: s.strip('`'))
+                drop_unique = bool(suggestion.get("drop_unique"))
+                scoped_cols = self.cached_collection(self._scoped_column_candidates, tuple(tables), drop_unique)
 
                 cols = list(
                     self.find_matches(
@@ -1488,7 +1666,7 @@ class SQLCompleter(Completer):
                         text_before_cursor=document.text_before_cursor,
                     )
                 )
-                indexed_columns = {self._strip_backticks(column).casefold() for column in self.populate_scoped_indexed_columns(tables)}
+                indexed_columns = self.cached_collection(self._indexed_column_names, tuple(tables))
                 indexed_column_candidates.update(
                     candidate for candidate, _fuzziness in cols if self._strip_backticks(candidate).casefold() in indexed_columns
                 )
@@ -1496,7 +1674,7 @@ class SQLCompleter(Completer):
 
             elif suggestion["type"] == "function":
                 # suggest user-defined functions using substring matching
-                funcs = self.populate_schema_objects(suggestion["schema"], "functions")
+                funcs = self.cached_collection(self._schema_object_candidates, suggestion["schema"] or None, "functions")
                 user_funcs = self.find_matches(
                     word_before_cursor,
                     funcs,
@@ -1520,7 +1698,7 @@ class SQLCompleter(Completer):
                     completions.extend([(*x, rank) for x in predefined_funcs])
 
             elif suggestion["type"] == "procedure":
-                procs = self.populate_schema_objects(suggestion["schema"], "procedures")
+                procs = self.cached_collection(self._schema_object_candidates, suggestion["schema"] or None, "procedures")
                 procs_m = self.find_matches(
                     word_before_cursor,
                     procs,
@@ -1558,15 +1736,13 @@ class SQLCompleter(Completer):
                 # then only return tables that have one or more of the given columns.
                 # If no columns are given (or able to be parsed), return all tables
                 # as usual.
-                columns = extract_columns_from_select(document.text)
-                if columns:
-                    tables = self.populate_schema_objects(suggestion["schema"], "tables", columns)
-                else:
-                    tables = self.populate_schema_objects(suggestion["schema"], "tables")
+                statement_text = current_statement_text(document.text, document.text_before_cursor)
+                columns = extract_columns_from_select(statement_text)
+                tables = self.cached_collection(self._schema_object_candidates, suggestion["schema"] or None, "tables", tuple(columns))
 
                 if suggestion.get("join"):
                     # For JOINs, suggest FK-related tables first (lower rank = higher priority)
-                    current_tables = extract_tables(document.text)
+                    current_tables = extract_tables(statement_text)
                     fk_map = self.dbmetadata["foreign_keys"].get(self.dbname, {}).get("tables", {})
                     fk_related: set[str] = set()
                     for tbl_schema, tbl, _alias in current_tables:
@@ -1598,7 +1774,7 @@ class SQLCompleter(Completer):
                     completions.extend([(*x, rank) for x in tables_m])
 
             elif suggestion["type"] == "view":
-                views = self.populate_schema_objects(suggestion["schema"], "views")
+                views = self.cached_collection(self._schema_object_candidates, suggestion["schema"] or None, "views")
                 views_m = self.find_matches(
                     word_before_cursor,
                     views,
@@ -1821,6 +1997,9 @@ class SQLCompleter(Completer):
             # todo add alpha here, or original order?
             return (fuzziness, rank, 0)
 
+        if cancelled is not None and cancelled.is_set():
+            return []
+
         if rigid_sort:
             uniq_completions_str = dict.fromkeys(x[0] for x in completions)
         else:
@@ -1881,6 +2060,25 @@ class SQLCompleter(Completer):
             return f'"{path}' if WIN else f"'{path}"
         return subprocess.list2cmdline([path]) if WIN else shlex.quote(path)
 
+    def _scoped_column_candidates(self, scoped_tbls: tuple[tuple[str | None, str, str | None], ...], drop_unique: bool) -> tuple[str, ...]:
+        scoped_cols = self.populate_scoped_cols(list(scoped_tbls))
+        if drop_unique:
+            # drop_unique is used for 'tb11 JOIN tbl2 USING (...'
+            # which should suggest only columns that appear in more than
+            # one table
+            return tuple(col for (col, count) in Counter(scoped_cols).items() if count > 1 and col != "*")
+        if not scoped_tbls:
+            # if tables was empty, this is a naked SELECT and we are
+            # showing all columns. So make them unique and sort them.
+            return tuple(sorted(set(scoped_cols), key=lambda s: s.strip('`')))
+        return tuple(scoped_cols)
+
+    def _indexed_column_names(self, scoped_tbls: tuple[tuple[str | None, str, str | None], ...]) -> frozenset[str]:
+        return frozenset(self._strip_backticks(column).casefold() for column in self.populate_scoped_indexed_columns(list(scoped_tbls)))
+
+    def _schema_object_candidates(self, schema: str | None, obj_type: str, columns: tuple[str, ...] = ()) -> tuple[str, ...]:
+        return tuple(self.populate_schema_objects(schema, obj_type, list(columns) or None))
+
     def populate_scoped_cols(self, scoped_tbls: list[tuple[str | None, str, str | None]]) -> list[str]:
         """Find all columns in a set of scoped_tables
         :param scoped_tbls: list of (schema, table, alias) tuples
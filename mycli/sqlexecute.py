@@ -5,7 +5,7 @@ import enum
 import logging
 import re
 import ssl
-from typing import Any, Generator, Iterable
+from typing import Any, Generator, Iterable, NamedTuple
 
 from prompt_toolkit.formatted_text import FormattedText
 import pymysql
@@ -26,6 +26,15 @@ FIELD_TYPES.update({FIELD_TYPE.NULL: type(None)})
 
 
 ERROR_CODE_ACCESS_DENIED = 1045
+# Error codes from this number up are raised by the client library.
+CLIENT_ERROR_MIN = 2000
+
+
+def is_server_error(error: BaseException) -> bool:
+    """Whether *error* was reported by the server, after which the connection
+    is still in step with it."""
+    code = error.args[0] if isinstance(error, pymysql.err.MySQLError) and error.args else None
+    return isinstance(code, int) and code < CLIENT_ERROR_MIN
 
 
 class ServerSpecies(enum.Enum):
@@ -85,6 +94,15 @@ class ServerInfo:
             return self.version_str
 
 
+class TableMetadata(NamedTuple):
+    """The completion metadata of a single table, as fetched after DDL."""
+
+    columns: list[str]
+    indexed_columns: list[str]
+    enum_values: list[tuple[str, list[str]]]
+    foreign_keys: list[tuple[str, str, str, str]]
+
+
 class SQLExecute:
     databases_query = """SHOW DATABASES"""
 
@@ -123,6 +141,60 @@ class SQLExecute:
                                     FROM information_schema.KEY_COLUMN_USAGE
                                     WHERE TABLE_SCHEMA = %s AND REFERENCED_TABLE_NAME IS NOT NULL"""
 
+    # Queries for many schemas at once, used to prefetch them in bulk.
+    all_table_columns_query = """select TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME from information_schema.columns
+                                    where table_schema in %(schemas)s
+                                    order by table_schema,table_name,ordinal_position"""
+
+    all_indexed_columns_query = """SELECT DISTINCT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME
+                                    FROM information_schema.STATISTICS
+                                    WHERE TABLE_SCHEMA IN %(schemas)s
+                                      AND SEQ_IN_INDEX = 1
+                                      AND COLUMN_NAME IS NOT NULL
+                                    ORDER BY TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME"""
+
+    all_enum_values_query = """select TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, COLUMN_TYPE from information_schema.columns
+                                    where table_schema in %(schemas)s and data_type = 'enum'
+                                    order by table_schema,table_name,ordinal_position"""
+
+    all_foreign_keys_query = """SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME
+                                    FROM information_schema.KEY_COLUMN_USAGE
+                                    WHERE TABLE_SCHEMA IN %(schemas)s AND REFERENCED_TABLE_NAME IS NOT NULL"""
+
+    all_routines_query = """SELECT ROUTINE_SCHEMA, ROUTINE_TYPE, ROUTINE_NAME FROM INFORMATION_SCHEMA.ROUTINES
+                                    WHERE ROUTINE_SCHEMA IN %(schemas)s AND ROUTINE_TYPE IN ("FUNCTION", "PROCEDURE")"""
+
+    # Everything completion knows about a single table, in one round trip.
+    table_metadata_query = """SELECT 'column', ORDINAL_POSITION, COLUMN_NAME, COLUMN_TYPE, NULL, NULL
+            FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = %(schema)s AND TABLE_NAME = %(table)s
+        UNION ALL
+        SELECT DISTINCT 'index', 0, COLUMN_NAME, NULL, NULL, NULL
+            FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = %(schema)s AND TABLE_NAME = %(table)s
+              AND SEQ_IN_INDEX = 1 AND COLUMN_NAME IS NOT NULL
+        UNION ALL
+        SELECT 'foreign_key', 0, TABLE_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME
+            FROM information_schema.KEY_COLUMN_USAGE
+            WHERE TABLE_SCHEMA = %(schema)s AND REFERENCED_TABLE_NAME IS NOT NULL
+              AND (TABLE_NAME = %(table)s OR REFERENCED_TABLE_NAME = %(table)s)
+        ORDER BY 1, 2"""
+
+    # A cheap summary of the completion metadata of a schema, which changes
+    # whenever the databases, columns, indexes, foreign keys or routines do.
+    schema_fingerprint_query = """SELECT
+        (SELECT CONCAT(COUNT(*), ':', COALESCE(SUM(CRC32(SCHEMA_NAME)), 0))
+            FROM information_schema.SCHEMATA),
+        (SELECT CONCAT(COUNT(*), ':', COALESCE(SUM(CRC32(CONCAT_WS(',', TABLE_NAME, COLUMN_NAME, ORDINAL_POSITION, COLUMN_TYPE))), 0))
+            FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = %(schema)s),
+        (SELECT CONCAT(COUNT(*), ':', COALESCE(SUM(CRC32(CONCAT_WS(',', TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX, COLUMN_NAME))), 0))
+            FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = %(schema)s),
+        (SELECT CONCAT(COUNT(*), ':', COALESCE(SUM(CRC32(CONCAT_WS(',', CONSTRAINT_NAME, TABLE_NAME, COLUMN_NAME,
+                                                                   REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME))), 0))
+            FROM information_schema.KEY_COLUMN_USAGE WHERE TABLE_SCHEMA = %(schema)s),
+        (SELECT CONCAT(COUNT(*), ':', COALESCE(SUM(CRC32(CONCAT_WS(',', ROUTINE_TYPE, ROUTINE_NAME, LAST_ALTERED))), 0))
+            FROM information_schema.ROUTINES WHERE ROUTINE_SCHEMA = %(schema)s)"""
+
     now_query = """SELECT NOW()"""
 
     @staticmethod
@@ -175,6 +247,7 @@ class SQLExecute:
         init_command: str | None = None,
         unbuffered: bool | None = None,
         display_dsn: str | None = None,
+        multi_statements: bool | None = None,
     ) -> None:
         self.dbname = database
         self.user = user
@@ -190,7 +263,9 @@ class SQLExecute:
         self.connection_id: int | None = None
         self.init_command = init_command
         self.unbuffered = unbuffered
+        self.multi_statements = multi_statements
         self.conn: Connection | None = None
+        self.query_in_flight = False
         self.connect()
 
     def connect(
@@ -253,7 +328,7 @@ class SQLExecute:
         defer_connect = False
 
         client_flag = pymysql.constants.CLIENT.INTERACTIVE
-        if init_command and len(list(iocommands.split_queries(init_command))) > 1:
+        if self.multi_statements or (init_command and len(list(iocommands.split_queries(init_command))) > 1):
             client_flag |= pymysql.constants.CLIENT.MULTI_STATEMENTS
         client_flag |= pymysql.constants.CLIENT.HANDLE_EXPIRED_PASSWORDS
 
@@ -354,8 +429,12 @@ class SQLExecute:
             _logger.debug("Doris detection failed: %s", e)
         return None
 
-    def run(self, statement: str) -> Generator[SQLResult, None, None]:
-        """Execute the sql in the database and return the results."""
+    def run(self, statement: str, unbuffered: bool = False) -> Generator[SQLResult, None, None]:
+        """Execute the sql in the database and return the results.
+
+        With *unbuffered*, rows are read from the server as the results are
+        consumed, whatever cursor class the connection was made with.
+        """
 
         # Remove spaces and EOL
         statement = statement.strip()
@@ -389,21 +468,63 @@ class SQLExecute:
                 sql = sql[:-2].strip()
 
             assert isinstance(self.conn, Connection)
-            cur = self.conn.cursor()
+            cur = self.conn.cursor(pymysql.cursors.SSCursor) if unbuffered else self.conn.cursor()
             try:  # Special command
                 _logger.debug("Trying a dbspecial command. sql: %r", sql)
                 yield from execute(cur, sql)
             except CommandNotFound:  # Regular SQL
                 _logger.debug("Regular sql statement. sql: %r", sql)
+                # query_in_flight is set while waiting for the server, when an
+                # interrupt should kill the statement rather than stop reading.
+                # Unbuffered rows are still being sent while they are consumed.
+                # Special commands, such as watch, are interrupted as before.
+                self.query_in_flight = True
                 cur.execute(sql)
                 while True:
+                    self.query_in_flight = unbuffered
                     yield self.get_result(cur)
+                    self.query_in_flight = True
 
                     # PyMySQL returns an extra, empty result set with stored
                     # procedures. We skip it (rowcount is zero and no
                     # description).
                     if not cur.nextset() or (not cur.rowcount and cur.description is None):
                         break
+            finally:
+                self.query_in_flight = False
+
+    def run_packed(self, statements: list[str]) -> Generator[tuple[int, SQLResult], None, None]:
+        """Execute plain SQL *statements* in a single round-trip, yielding
+        each result with the index of the statement which produced it.
+
+        The connection must have been made with multi_statements, and each
+        statement must produce a single result.  The server stops at the
+        first failing statement, and the error is raised
+        after the results of the statements before it.  More results than
+        statements raise ProgrammingError once the rest have been read.
+        """
+        assert isinstance(self.conn, Connection)
+        cur = self.conn.cursor()
+        _logger.debug("Packed sql statements. count: %r", len(statements))
+        self.query_in_flight = True
+        cur.execute('\n'.join(statements))
+        index = 0
+        while True:
+            self.query_in_flight = False
+            yield (index, self.get_result(cur))
+            self.query_in_flight = True
+            if not cur.nextset():
+                break
+            index += 1
+            if index == len(statements):
+                # eg. a CALL, whose status follows its result sets
+                while cur.nextset():
+                    pass
+                self.query_in_flight = False
+                raise pymysql.err.ProgrammingError(
+                    f'{len(statements)} packed statements returned more results than statements; their output may be misattributed.'
+                )
+        self.query_in_flight = False
 
     def get_result(self, cursor: Cursor) -> SQLResult:
         """Get the current result's data from the cursor."""
@@ -514,6 +635,90 @@ class SQLExecute:
             else:
                 yield from cur
 
+    def table_metadata(self, table: str, schema: str | None = None) -> TableMetadata:
+        """Returns the completion metadata of *table* in *schema*.
+
+        A table which does not exist has no columns.  Foreign keys are those
+        of tables in *schema* which reference *table* or are defined on it.
+        """
+        target = schema if schema is not None else self.dbname
+        metadata = TableMetadata([], [], [], [])
+        assert isinstance(self.conn, Connection)
+        with self.conn.cursor() as cur:
+            _logger.debug("Table Metadata Query. sql: %r schema: %r table: %r", self.table_metadata_query, target, table)
+            cur.execute(self.table_metadata_query, {'schema': target, 'table': table})
+            for kind, _position, *values in cur:
+                if kind == 'column':
+                    metadata.columns.append(values[0])
+                    enum_values = self._parse_enum_values(values[1])
+                    if enum_values:
+                        metadata.enum_values.append((values[0], enum_values))
+                elif kind == 'index':
+                    metadata.indexed_columns.append(values[0])
+                else:
+                    metadata.foreign_keys.append(tuple(values))
+        return metadata
+
+    def schema_fingerprint(self, schema: str | None = None) -> tuple | None:
+        """Returns a summary of the completion metadata of *schema*, or None
+        if the server could not compute one."""
+        target = schema if schema is not None else self.dbname
+        assert isinstance(self.conn, Connection)
+        with self.conn.cursor() as cur:
+            _logger.debug("Schema Fingerprint Query. sql: %r schema: %r", self.schema_fingerprint_query, target)
+            try:
+                cur.execute(self.schema_fingerprint_query, {'schema': target})
+                row = cur.fetchone()
+            except pymysql.DatabaseError as e:
+                _logger.error('No schema fingerprint due to %r', e)
+                return None
+        return tuple(row) if row else None
+
+    def _stream_all_schemas(self, query: str, schemas: list[str], description: str) -> Generator[tuple, None, None]:
+        """Yields the rows of a metadata *query* over *schemas*, unbuffered."""
+        assert isinstance(self.conn, Connection)
+        if not schemas:
+            return
+        with self.conn.cursor(pymysql.cursors.SSCursor) as cur:
+            _logger.debug("%s Query. sql: %r schemas: %d", description, query, len(schemas))
+            cur.execute(query, {'schemas': tuple(schemas)})
+            yield from cur
+
+    def all_table_columns(self, schemas: list[str]) -> Generator[tuple[str, str, str], None, None]:
+        """Yields (schema name, table name, column name) tuples for *schemas*."""
+        yield from self._stream_all_schemas(self.all_table_columns_query, schemas, "All Columns")
+
+    def all_indexed_columns(self, schemas: list[str]) -> Generator[tuple[str, str, str], None, None]:
+        """Yields leading indexed (schema name, table name, column name) tuples for *schemas*."""
+        try:
+            yield from self._stream_all_schemas(self.all_indexed_columns_query, schemas, "All Indexed Columns")
+        except Exception as e:
+            _logger.error('No indexed-column metadata due to %r', e)
+
+    def all_enum_values(self, schemas: list[str]) -> Generator[tuple[str, str, str, list[str]], None, None]:
+        """Yields (schema name, table name, column name, enum values) tuples for *schemas*."""
+        for schema_name, table_name, column_name, column_type in self._stream_all_schemas(
+            self.all_enum_values_query, schemas, "All Enum Values"
+        ):
+            values = self._parse_enum_values(column_type)
+            if values:
+                yield (schema_name, table_name, column_name, values)
+
+    def all_foreign_keys(self, schemas: list[str]) -> Generator[tuple[str, str, str, str, str], None, None]:
+        """Yields (schema name, table name, column name, referenced table name,
+        referenced column name) tuples for *schemas*."""
+        try:
+            yield from self._stream_all_schemas(self.all_foreign_keys_query, schemas, "All Foreign Keys")
+        except Exception as e:
+            _logger.error('No foreign key completions due to %r', e)
+
+    def all_routines(self, schemas: list[str]) -> Generator[tuple[str, str, str], None, None]:
+        """Yields (schema name, routine type, routine name) tuples for *schemas*."""
+        try:
+            yield from self._stream_all_schemas(self.all_routines_query, schemas, "All Routines")
+        except pymysql.DatabaseError as e:
+            _logger.error('No routine completions due to %r', e)
+
     def character_sets(self) -> Generator[tuple, None, None]:
         """Yields tuples of (character_set_name, )"""
 
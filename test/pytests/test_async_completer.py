@@ -0,0 +1,63 @@
+# type: ignore
+
+import asyncio
+import threading
+import time
+
+from prompt_toolkit.completion import CompleteEvent, Completion
+from prompt_toolkit.document import Document
+
+from mycli.async_completer import AsyncCompleter
+from mycli.sqlcompleter import SQLCompleter
+
+
+def collect(completer, document):
+    async def run():
+        return [completion async for completion in completer.get_completions_async(document, CompleteEvent())]
+
+    return asyncio.run(run())
+
+
+def test_completes_in_worker_thread_like_the_wrapped_completer() -> None:
+    sql_completer = SQLCompleter()
+    document = Document(text='SEL', cursor_position=3)
+    completer = AsyncCompleter(lambda: sql_completer, lambda: document)
+
+    expected = [c.text for c in sql_completer.get_completions(document, CompleteEvent())]
+
+    assert [c.text for c in collect(completer, document)] == expected
+    assert [c.text for c in completer.get_completions(document, CompleteEvent())] == expected
+
+
+class SlowCompleter:
+    def __init__(self) -> None:
+        self.cancelled = None
+        self.thread = None
+
+    def get_completions(self, document, complete_event, cancelled=None):
+        self.cancelled = cancelled
+        self.thread = threading.current_thread()
+        cancelled.wait(5)
+        if cancelled.is_set():
+            return []
+        return [Completion('too_late')]
+
+
+def test_stale_request_is_cancelled_when_the_input_changes() -> None:
+    slow = SlowCompleter()
+    document = Document(text='SELECT a', cursor_position=8)
+    completer = AsyncCompleter(lambda: slow, lambda: Document(text='SELECT ab', cursor_position=9), poll_interval=0.01)
+
+    start = time.monotonic()
+    assert collect(completer, document) == []
+
+    assert time.monotonic() - start < 2
+    assert slow.cancelled.is_set()
+    assert slow.thread is not threading.current_thread()
+
+
+def test_get_completions_returns_nothing_once_cancelled() -> None:
+    cancelled = threading.Event()
+    cancelled.set()
+
+    assert SQLCompleter().get_completions(Document(text='SEL', cursor_position=3), None, cancelled=cancelled) == []
@@ -2,10 +2,7 @@
 
 from io import StringIO
 
-import pytest
-
-import mycli.packages.batch_utils
-from mycli.packages.batch_utils import statements_from_filehandle
+from mycli.packages.batch_utils import StatementScanner, statements_and_offsets_from_filehandle, statements_from_filehandle
 
 
 def collect_statements(sql: str) -> list[tuple[str, int]]:
@@ -47,11 +44,13 @@ def test_statements_from_filehandle_yields_trailing_statement_without_newline_03
     assert statements == [('select 1\nwhere 1 == 1;', 0)]
 
 
-def test_statements_from_filehandle_rejects_overlong_statement(monkeypatch) -> None:
-    monkeypatch.setattr(mycli.packages.batch_utils, 'MAX_MULTILINE_BATCH_STATEMENT', 2)
+def test_statements_from_filehandle_accepts_long_statement() -> None:
+    values = ',\n'.join(f'({i})' for i in range(10000))
+    statements = collect_statements(f'insert into t values\n{values};\nselect 1;')
 
-    with pytest.raises(ValueError, match='Saw single input statement greater than 2 lines'):
-        list(statements_from_filehandle(StringIO('select 1,\n2\nwhere 1 = 1;')))
+    assert len(statements) == 2
+    assert statements[0][0].endswith('(9999);')
+    assert statements[1] == ('select 1;', 1)
 
 
 def test_statements_from_filehandle_yields_incorrect_sql() -> None:
@@ -80,22 +79,56 @@ def test_statements_from_filehandle_yields_invalid_sql_02() -> None:
     ]
 
 
-def test_statements_from_filehandle_continues_when_tokenizer_returns_no_tokens(monkeypatch) -> None:
-    tokenize_calls: list[str] = []
-    original_tokenize = mycli.packages.batch_utils.sqlglot.tokenize
+def test_statements_from_filehandle_ignores_delimiter_in_quotes() -> None:
+    statements = collect_statements("select 'a;\nb', \"c;\", `d;`;\nselect 'e\\';f';\n")
 
-    def fake_tokenize(sql: str, read: str):
-        tokenize_calls.append(sql)
-        if len(tokenize_calls) == 1:
-            return []
-        return original_tokenize(sql, read=read)
+    assert statements == [
+        ("select 'a;\nb', \"c;\", `d;`;", 0),
+        ("select 'e\\';f';", 1),
+    ]
 
-    monkeypatch.setattr(mycli.packages.batch_utils.sqlglot, 'tokenize', fake_tokenize)
 
-    statements = list(statements_from_filehandle(StringIO('select 1;\nselect 2;')))
+def test_statements_from_filehandle_ignores_delimiter_in_comments() -> None:
+    statements = collect_statements('select 1 /* x;\ny; */ + 2;\n-- z;\nselect 3 # w;\n;\nselect 4; -- trailing;\nselect 5;--6;\n')
+
+    assert statements == [
+        ('select 1 /* x;\ny; */ + 2;', 0),
+        ('-- z;\nselect 3 # w;\n;', 1),
+        ('select 4; -- trailing;', 2),
+        ('select 5;', 3),
+        ('--6;', 4),
+    ]
+
+
+def test_statements_from_filehandle_follows_delimiter_changes() -> None:
+    sql = 'select 1;\n-- procedures\nDELIMITER $$\ncreate procedure p()\nbegin\n  select 2;\nend$$\ndelimiter ;\ncall p();\n'
+    statements = collect_statements(sql)
 
-    assert tokenize_calls[0] == 'select 1;\n'
     assert statements == [
         ('select 1;', 0),
-        ('select 2;', 1),
+        ('DELIMITER $$', 1),
+        ('create procedure p()\nbegin\n  select 2;\nend$$', 2),
+        ('delimiter ;', 3),
+        ('call p();', 4),
+    ]
+
+
+def test_statement_scanner_keeps_state_across_feeds() -> None:
+    scanner = StatementScanner()
+
+    assert scanner.feed("select 'x\n") == []
+    assert scanner.feed("y;';") == ["select 'x\ny;';"]
+    assert scanner.feed(' select 2') == []
+    assert scanner.finish() == ['select 2']
+    assert scanner.finish() == []
+
+
+def test_statements_and_offsets_from_filehandle_reports_byte_offsets() -> None:
+    statements = list(statements_and_offsets_from_filehandle(StringIO("select 'é';\nselect 2; select 3;\nselect 4")))
+
+    assert statements == [
+        ("select 'é';", 0, 13),
+        ('select 2;', 1, 33),
+        ('select 3;', 2, 33),
+        ('select 4', 3, 41),
     ]
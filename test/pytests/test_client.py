@@ -10,6 +10,8 @@ import pytest
 
 import mycli.client as client_module
 from mycli.client import MyCli
+from mycli.constants import DEFAULT_ROW_GROUP_SIZE
+from mycli.main_modes import repl as repl_mode
 from mycli.packages.special.dsn_aliases import DsnAliases
 from mycli.packages.special.favoritequeries import FavoriteQueries
 
@@ -55,6 +57,7 @@ def test_init_configures_image_protocol(monkeypatch: pytest.MonkeyPatch, tmp_pat
         plot_scale_factor = 1.5
         plot_ppi = 144
         plot_theme = dark
+        export_row_group_size = 5000
         """,
     )
 
@@ -65,6 +68,31 @@ def test_init_configures_image_protocol(monkeypatch: pytest.MonkeyPatch, tmp_pat
     assert cli.plot_ppi == 144
     assert isinstance(cli.plot_ppi, int)
     assert cli.plot_theme == 'dark'
+    assert cli.export_row_group_size == 5000
+
+
+@pytest.mark.parametrize('row_group_size', ['0', '-5'])
+def test_init_falls_back_to_default_export_row_group_size(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, row_group_size: str) -> None:
+    patch_constructor_side_effects(monkeypatch)
+    echo_calls: list[tuple[str, dict[str, Any]]] = []
+    monkeypatch.setattr(MyCli, 'echo', lambda self, message, **kwargs: echo_calls.append((message, kwargs)))
+    myclirc = write_myclirc(
+        tmp_path,
+        f"""
+        [dataframe]
+        export_row_group_size = {row_group_size}
+        """,
+    )
+
+    cli = MyCli(myclirc=myclirc)
+
+    assert cli.export_row_group_size == DEFAULT_ROW_GROUP_SIZE
+    assert echo_calls == [
+        (
+            f'Invalid config option provided for export_row_group_size ({row_group_size}); using {DEFAULT_ROW_GROUP_SIZE}.',
+            {'err': True, 'fg': 'red'},
+        )
+    ]
 
 
 def test_init_uses_default_plot_theme_for_empty_value(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
@@ -289,13 +317,13 @@ def test_init_uses_default_myclirc_when_xdg_config_is_missing(monkeypatch: pytes
     monkeypatch.setattr(client_module.os.path, 'exists', lambda path: False)
     monkeypatch.setattr(client_module, 'write_default_config', lambda destination: None)
 
-    original_read_config_files = client_module.read_config_files
+    original_config_views = client_module.ConfigViews
 
-    def read_config_files(files: list[str | Any], *args: Any, **kwargs: Any) -> Any:
+    def config_views(files: list[str | Any], *args: Any, **kwargs: Any) -> Any:
         config_file_args.append(files)
-        return original_read_config_files(files, *args, **kwargs)
+        return original_config_views(files, *args, **kwargs)
 
-    monkeypatch.setattr(client_module, 'read_config_files', read_config_files)
+    monkeypatch.setattr(client_module, 'ConfigViews', config_views)
 
     cli = MyCli(myclirc=None)
 
@@ -442,9 +470,12 @@ def test_invalidate_prompt_session_invalidates_prompt_app() -> None:
 
 def test_run_cli_delegates_to_main_repl(monkeypatch: pytest.MonkeyPatch) -> None:
     cli = MyCli.__new__(MyCli)
+    cli.min_completion_trigger = 3
     calls: list[MyCli] = []
-    monkeypatch.setattr(client_module.repl_package, 'main_repl', lambda target: calls.append(target))
+    monkeypatch.setattr(repl_mode, 'main_repl', lambda target: calls.append(target))
+    monkeypatch.setattr(repl_mode, 'MIN_COMPLETION_TRIGGER', 1)
 
     MyCli.run_cli(cli)
 
     assert calls == [cli]
+    assert repl_mode.MIN_COMPLETION_TRIGGER == 3
@@ -11,6 +11,7 @@ import pytest
 
 from mycli import client_commands
 from mycli.client_commands import ClientCommandsMixin
+from mycli.main_modes import repl as repl_mode
 from mycli.packages import special
 from mycli.packages.special import main as special_main
 from mycli.packages.sqlresult import SQLResult
@@ -521,7 +522,7 @@ def test_change_db_unquotes_mysql_identifier(monkeypatch: pytest.MonkeyPatch) ->
     client = DummyClient()
     client.sqlexecute = FakeSQLExecute()
     title_calls: list[DummyClient] = []
-    monkeypatch.setattr(client_commands, 'set_all_external_titles', lambda value: title_calls.append(value))
+    monkeypatch.setattr(repl_mode, 'set_all_external_titles', lambda value: title_calls.append(value))
 
     assert result_statuses(client.change_db('`new``db`')) == ['You are now connected to database "new`db" as user "alice"']
     assert client.sqlexecute.changed_to == ['new`db']
@@ -532,7 +533,7 @@ def test_change_db_reports_when_database_is_already_selected(monkeypatch: pytest
     client = DummyClient()
     client.sqlexecute = FakeSQLExecute(dbname='same_db')
     title_calls: list[DummyClient] = []
-    monkeypatch.setattr(client_commands, 'set_all_external_titles', lambda value: title_calls.append(value))
+    monkeypatch.setattr(repl_mode, 'set_all_external_titles', lambda value: title_calls.append(value))
 
     assert result_statuses(client.change_db('same_db')) == ['You are already connected to database "same_db" as user "alice"']
     assert client.sqlexecute.changed_to == []
@@ -196,6 +196,67 @@ def test_on_completions_refreshed_starts_schema_prefetch() -> None:
     assert state['prefetch_started'] == [True]
 
 
+def make_ddl_cli(refreshing: bool = False) -> tuple[Any, dict[str, Any]]:
+    cli = make_bare_mycli()
+    state: dict[str, Any] = {'queries': [], 'tables': [], 'routines': [], 'databases': [], 'entered_lock': {'count': 0}}
+
+    def table_metadata(table: str, schema: str | None = None) -> tuple[list[str], ...]:
+        state['queries'].append((schema, table))
+        return (['id'], [], [], [])
+
+    cli.sqlexecute = SimpleNamespace(dbname='current', table_metadata=table_metadata)
+    cli.completion_refresher = SimpleNamespace(is_refreshing=lambda: refreshing)
+    cli.completer = SimpleNamespace(
+        update_table_metadata=lambda *args: state['tables'].append(args),
+        update_routine_metadata=lambda *args, **kwargs: state['routines'].append((*args, kwargs)),
+        update_database_name=lambda *args, **kwargs: state['databases'].append((*args, kwargs)),
+    )
+    cli._completer_lock = ReusableLock(lambda: state['entered_lock'].__setitem__('count', state['entered_lock']['count'] + 1))
+    return cli, state
+
+
+def test_refresh_changed_objects_queries_each_table_once() -> None:
+    cli, state = make_ddl_cli()
+    targets = [
+        client_query.DDLTarget('table', 'orders'),
+        client_query.DDLTarget('table', 'orders', 'current'),
+        client_query.DDLTarget('table', 'items', 'other', dropped=True),
+        client_query.DDLTarget('function', 'fn'),
+        client_query.DDLTarget('procedure', 'proc', 'other', dropped=True),
+        client_query.DDLTarget('database', 'new_db'),
+    ]
+
+    assert main.MyCli.refresh_changed_objects(cli, targets) is True
+
+    assert state['queries'] == [('current', 'orders'), ('other', 'items')]
+    assert state['tables'] == [('current', 'orders', ['id'], [], [], []), ('other', 'items', ['id'], [], [], [])]
+    assert state['routines'] == [
+        ('current', 'functions', 'fn', {'dropped': False}),
+        ('other', 'procedures', 'proc', {'dropped': True}),
+    ]
+    assert state['databases'] == [('new_db', {'dropped': False})]
+    assert state['entered_lock'] == {'count': 1}
+
+
+def test_refresh_changed_objects_defers_to_running_refresh() -> None:
+    cli, state = make_ddl_cli(refreshing=True)
+
+    assert main.MyCli.refresh_changed_objects(cli, [client_query.DDLTarget('table', 'orders')]) is False
+    assert state['queries'] == []
+
+
+def test_refresh_changed_objects_falls_back_when_metadata_query_fails() -> None:
+    cli, state = make_ddl_cli()
+
+    def table_metadata(table: str, schema: str | None = None) -> None:
+        raise client_query.pymysql.OperationalError(1142, 'denied')
+
+    cli.sqlexecute.table_metadata = table_metadata
+
+    assert main.MyCli.refresh_changed_objects(cli, [client_query.DDLTarget('table', 'orders')]) is False
+    assert state['tables'] == []
+
+
 def run_query_with_state(monkeypatch, tmp_path, *, warnings_enabled: bool = True) -> dict[str, Any]:
     cli = make_bare_mycli()
     normal_rows = FakeCursorBase(rows=[('one',)], warning_count=1)
@@ -365,6 +426,61 @@ def test_run_query_displays_set_buffer_fallback_outside_repl(monkeypatch) -> Non
     assert echoed == [status]
 
 
+def run_packed_queries_with_state(monkeypatch, tmp_path, queries: list[str], error_after: int | None = None) -> dict[str, Any]:
+    cli = make_bare_mycli()
+    state: dict[str, Any] = {
+        'logged_queries': [],
+        'echoed': [],
+        'checkpoint_path': tmp_path / 'checkpoint.sql',
+    }
+
+    def run_packed(packed: list[str]):
+        for index, query in enumerate(packed):
+            if index == error_after:
+                raise client_query.QueryError('packed failure')
+            yield (index, SQLResult(status=f'ok {query}'))
+
+    monkeypatch.setattr(client_query.special, 'is_expanded_output', lambda: False)
+    monkeypatch.setattr(client_query.special, 'is_redirected', lambda: False)
+    monkeypatch.setattr(client_query.click, 'echo', lambda line, nl=True: state['echoed'].append(line))
+
+    cli.sqlexecute = SimpleNamespace(run_packed=run_packed)
+    cli.log_query = lambda query: state['logged_queries'].append(query)
+    cli.log_output = lambda line: None
+    cli.format_sqlresult = lambda result, **_kwargs: [str(result.status)]
+    state['cli'] = cli
+    try:
+        main.MyCli.run_packed_queries(cli, queries, checkpoint=str(state['checkpoint_path']))
+    except client_query.QueryError as e:
+        state['error'] = e
+    cli.checkpoint.close()
+    return state
+
+
+def test_run_packed_queries_echoes_each_result(monkeypatch, tmp_path) -> None:
+    state = run_packed_queries_with_state(monkeypatch, tmp_path, ['select 1;', 'select 2;'])
+
+    assert state['logged_queries'] == ['select 1;', 'select 2;']
+    assert state['echoed'] == ['ok select 1;', 'ok select 2;']
+    assert state['cli'].main_formatter.query == 'select 2;'
+    assert state['checkpoint_path'].read_text(encoding='utf-8') == 'select 1;\nselect 2;\n'
+
+
+def test_run_packed_queries_checkpoints_queries_before_failure(monkeypatch, tmp_path) -> None:
+    state = run_packed_queries_with_state(monkeypatch, tmp_path, ['select 1;', 'select 2;', 'select 3;'], error_after=2)
+
+    assert str(state['error']) == 'packed failure'
+    assert state['echoed'] == ['ok select 1;', 'ok select 2;']
+    assert state['checkpoint_path'].read_text(encoding='utf-8') == 'select 1;\nselect 2;\n'
+
+
+def test_run_packed_queries_checkpoints_nothing_when_first_query_fails(monkeypatch, tmp_path) -> None:
+    state = run_packed_queries_with_state(monkeypatch, tmp_path, ['select 1;', 'select 2;'], error_after=0)
+
+    assert state['echoed'] == []
+    assert state['checkpoint_path'].read_text(encoding='utf-8') == ''
+
+
 def test_get_last_query_returns_none() -> None:
     cli = make_bare_mycli()
 
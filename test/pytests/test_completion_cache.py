@@ -0,0 +1,97 @@
+# type: ignore
+
+import marshal
+import os
+import stat
+import sys
+
+import pytest
+
+from mycli import completion_cache
+from mycli.sqlcompleter import SQLCompleter
+
+
+def make_completer() -> SQLCompleter:
+    completer = SQLCompleter()
+    completer.extend_database_names(['db', 'other'])
+    completer.extend_schemata('db')
+    completer.set_dbname('db')
+    completer.extend_relations([('orders',)], kind='tables')
+    completer.extend_columns([('orders', 'id'), ('orders', 'customer_id')], kind='tables')
+    completer.extend_indexed_columns([('orders', 'id')])
+    completer.extend_foreign_keys([('orders', 'customer_id', 'customers', 'id')])
+    completer.extend_enum_values([('orders', 'status', ['new', 'done'])])
+    completer.extend_users([('app@localhost',)])
+    completer.extend_show_items([('DATABASES',)])
+    return completer
+
+
+def test_cache_path_is_keyed_by_server_user_and_schema(tmp_path) -> None:
+    path = completion_cache.cache_path(str(tmp_path), 'host', 3306, None, 'user', 'db')
+
+    assert path.startswith(str(tmp_path))
+    assert path == completion_cache.cache_path(str(tmp_path), 'host', 3306, None, 'user', 'db')
+    assert path != completion_cache.cache_path(str(tmp_path), 'host', 3306, None, 'user', 'other')
+    assert path != completion_cache.cache_path(str(tmp_path), 'host', 3307, None, 'user', 'db')
+
+
+def test_save_load_restore_roundtrip(tmp_path) -> None:
+    path = str(tmp_path / 'nested' / 'db.cache')
+    completer = make_completer()
+
+    completion_cache.save(path, ('1:2', '3:4'), completer)
+    cached = completion_cache.load(path)
+
+    assert cached.fingerprint == ('1:2', '3:4')
+    restored = SQLCompleter()
+    completion_cache.restore(restored, cached.state)
+    assert restored.dbname == 'db'
+    assert restored.databases == completer.databases
+    assert restored.users == ['app@localhost']
+    assert restored.show_items == ['DATABASES']
+    assert restored.dbmetadata == completer.dbmetadata
+    assert restored.all_completions == completer.all_completions
+    assert list(tmp_path.joinpath('nested').iterdir()) == [tmp_path / 'nested' / 'db.cache']
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='POSIX permissions')
+def test_save_is_only_readable_by_the_owner(tmp_path) -> None:
+    path = str(tmp_path / 'nested' / 'db.cache')
+    old_umask = os.umask(0o022)
+    try:
+        completion_cache.save(path, ('1:2',), make_completer())
+    finally:
+        os.umask(old_umask)
+
+    assert stat.S_IMODE(os.stat(tmp_path / 'nested').st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+
+def test_load_missing_file_returns_none(tmp_path) -> None:
+    assert completion_cache.load(str(tmp_path / 'missing.cache')) is None
+
+
+def test_load_ignores_unreadable_file(tmp_path) -> None:
+    path = tmp_path / 'broken.cache'
+    path.write_bytes(b'not marshal data')
+
+    assert completion_cache.load(str(path)) is None
+
+
+def test_load_ignores_other_versions(tmp_path) -> None:
+    path = tmp_path / 'old.cache'
+    path.write_bytes(marshal.dumps(((0, 'old', (2, 7)), ('1:2',), {'dbname': 'db'})))
+
+    assert completion_cache.load(str(path)) is None
+
+
+def test_save_logs_and_cleans_up_on_error(tmp_path, caplog) -> None:
+    path = str(tmp_path / 'db.cache')
+    completer = make_completer()
+    completer.users = [object()]
+
+    with caplog.at_level('ERROR', logger='mycli.completion_cache'):
+        completion_cache.save(path, ('1:2',), completer)
+
+    assert list(tmp_path.iterdir()) == []
+    assert 'could not write completion cache' in caplog.text
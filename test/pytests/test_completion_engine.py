@@ -7,7 +7,7 @@ import sqlparse
 from sqlparse import tokens
 from sqlparse.sql import Statement, Token
 
-from mycli.packages import completion_engine, special
+from mycli.packages import completion_engine, special, sql_utils
 from mycli.packages.completion_engine import (
     DSN_SUBCOMMANDS,
     FAVORITE_SUBCOMMANDS,
@@ -52,6 +52,7 @@ from mycli.packages.completion_engine import (
     _tokens_wo_space,
     _word_starts_with_digit_or_dot,
     _word_starts_with_quote,
+    current_statement_text,
     identifies,
     is_inside_quotes,
     suggest_based_on_last_token,
@@ -62,6 +63,13 @@ from mycli.packages.completion_engine import (
 SOURCE_FILE_SUGGESTION = {'type': 'file_name', 'quote_spaces': True, 'source_filename': ''}
 
 
+@pytest.fixture(autouse=True)
+def clear_parse_caches():
+    # Several tests replace sqlparse.parse and count its calls.
+    sql_utils.parse_statements.cache_clear()
+    sql_utils._complete_prefixes.clear()
+
+
 def sorted_dicts(dicts):
     """input is a list of dicts."""
     return sorted(tuple(x.items()) for x in dicts)
@@ -1788,6 +1796,43 @@ def test_3_statements_2nd_current():
     ])
 
 
+def test_2_statements_2nd_current_with_partially_typed_word():
+    suggestions = suggest_type("select * from a; select * from b where x", "select * from a; select * from b where x")
+    assert sorted_dicts(suggestions) == sorted_dicts([
+        {"type": "alias", "aliases": ["b"]},
+        {"type": "column", "tables": [(None, "b", None)]},
+        {"type": "function", "schema": []},
+        {"type": "introducer"},
+    ])
+
+
+def test_current_statement_text():
+    assert current_statement_text("select 1; select * from b", "select 1; sel") == "select * from b"
+    assert current_statement_text("select * from a", "select") == "select * from a"
+    assert current_statement_text("", "") == ""
+
+
+def test_suggest_type_reparses_only_the_current_statement_of_a_large_buffer(monkeypatch):
+    statement = "select o.id, count(*) from orders o join customers c on o.customer_id = c.id where o.status = 'open' group by 1;\n"
+    head = statement * 100 + "select * from orders where "
+    suggest_type(head + "s", head + "s")
+
+    parsed = []
+    parse = sqlparse.parse
+
+    def recording_parse(sql, *args, **kwargs):
+        parsed.append(sql)
+        return parse(sql, *args, **kwargs)
+
+    monkeypatch.setattr(sqlparse, "parse", recording_parse)
+    text = head + "status = 'open' and s"
+    suggestions = suggest_type(text, text)
+
+    assert {"type": "column", "tables": [(None, "orders", None)]} in suggestions
+    assert parsed
+    assert all(len(sql) <= 2 * len(statement) for sql in parsed)
+
+
 def test_create_db_with_template():
     suggestions = suggest_type("create database foo with template ", "create database foo with template ")
 
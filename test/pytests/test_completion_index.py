@@ -0,0 +1,56 @@
+# type: ignore
+
+from mycli.packages.completion_index import CompletionIndex
+
+
+def test_completion_index_keeps_items_and_lowercased_forms():
+    index = CompletionIndex(['Orders', 'user_id'])
+
+    assert index.items == ('Orders', 'user_id')
+    assert index.lowered == ['orders', 'user_id']
+    assert len(index) == 2
+
+
+def test_containing_returns_positions_of_items_with_every_character():
+    index = CompletionIndex(['orders', 'Order_Items', 'users', 'ids'])
+
+    assert index.containing('ro') == [0, 1]
+    assert index.containing('sd') == [0, 1, 3]
+    assert index.containing('di') == [1, 3]
+    assert index.containing('q') == []
+    assert index.containing('') == [0, 1, 2, 3]
+
+
+def test_sharing_returns_positions_of_items_with_enough_characters():
+    index = CompletionIndex(['customer', 'costumer', 'cost', 'zebra'])
+
+    assert index.sharing('custom', 6) == [0, 1]
+    assert index.sharing('custom', 4) == [0, 1, 2]
+    assert index.sharing('custom', 0) == [0, 1, 2, 3]
+    assert index.sharing('xyz', 1) == [3]
+
+
+def test_starting_with_returns_positions_of_items_with_prefix():
+    index = CompletionIndex(['SELECT', 'sum', 'Set', 'session', 'ascii'])
+
+    assert index.starting_with('se') == [0, 2, 3]
+    assert index.starting_with('set') == [2]
+    assert index.starting_with('x') == []
+    assert index.starting_with('') == [0, 1, 2, 3, 4]
+
+
+def test_containing_narrows_the_previous_lookup_as_characters_are_added(monkeypatch):
+    index = CompletionIndex(['customer', 'costumer', 'cost', 'user_id', 'account'])
+    assert index.containing('cu') == [0, 1, 4]
+
+    def fail(chars):
+        raise AssertionError('postings should not be intersected again')
+
+    monkeypatch.setattr(index, '_intersect', fail)
+    assert index.containing('cus') == [0, 1]
+    assert index.containing('cust') == [0, 1]
+    assert index.containing('cust') == [0, 1]
+
+    monkeypatch.undo()
+    assert index.containing('ad') == []
+    assert index.containing('co') == [0, 1, 2, 4]
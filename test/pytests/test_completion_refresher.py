@@ -524,6 +524,121 @@ def test_bg_refresh_restarts_wraps_callbacks_and_closes(monkeypatch, refresher)
     ]
 
 
+class CachingExecutor:
+    fingerprint = ('1:1',)
+    instances: list = []
+
+    def __init__(self, *args) -> None:
+        CachingExecutor.instances.append(self)
+
+    def schema_fingerprint(self):
+        return self.fingerprint
+
+    def close(self) -> None:
+        pass
+
+
+def test_bg_refresh_offers_cached_completions_and_skips_unchanged_schema(monkeypatch, tmp_path) -> None:
+    refresher = completion_refresher.CompletionRefresher(cache_dir=str(tmp_path))
+    refresher_calls: list[str] = []
+    callback_calls: list[object] = []
+
+    def fill(completer, executor) -> None:
+        refresher_calls.append('fill')
+        completer.extend_database_names(['cached_db'])
+
+    monkeypatch.setattr(completion_refresher, 'SQLExecute', CachingExecutor)
+    refresher.refreshers = {'fill': fill}
+
+    refresher._bg_refresh(make_sqlexecute(), callback_calls.append, {})
+    assert refresher_calls == ['fill']
+    assert len(callback_calls) == 1
+    assert len(list(tmp_path.iterdir())) == 1
+
+    refresher._bg_refresh(make_sqlexecute(), callback_calls.append, {})
+    assert refresher_calls == ['fill']
+    assert len(callback_calls) == 2
+    assert callback_calls[1].databases == ['cached_db']
+
+
+def test_bg_refresh_refreshes_and_rewrites_cache_when_schema_changes(monkeypatch, tmp_path) -> None:
+    refresher = completion_refresher.CompletionRefresher(cache_dir=str(tmp_path))
+    callback_calls: list[object] = []
+    names = iter(['app_one', 'app_two'])
+
+    def fill(completer, executor) -> None:
+        completer.extend_database_names([next(names)])
+
+    monkeypatch.setattr(completion_refresher, 'SQLExecute', CachingExecutor)
+    refresher.refreshers = {'fill': fill}
+
+    refresher._bg_refresh(make_sqlexecute(), callback_calls.append, {})
+    monkeypatch.setattr(CachingExecutor, 'fingerprint', ('2:2',))
+    refresher._bg_refresh(make_sqlexecute(), callback_calls.append, {})
+
+    assert [completer.databases for completer in callback_calls] == [['app_one'], ['app_one'], ['app_two']]
+    cache_file = refresher._cache_file(make_sqlexecute())
+    cached = completion_refresher.completion_cache.load(cache_file)
+    assert cached.fingerprint == ('2:2',)
+    assert cached.state['databases'] == ['app_two']
+
+
+def test_bg_refresh_does_not_cache_without_fingerprint(monkeypatch, tmp_path) -> None:
+    refresher = completion_refresher.CompletionRefresher(cache_dir=str(tmp_path))
+    callback_calls: list[object] = []
+
+    monkeypatch.setattr(completion_refresher, 'SQLExecute', CachingExecutor)
+    monkeypatch.setattr(CachingExecutor, 'fingerprint', None)
+    refresher.refreshers = {}
+
+    refresher._bg_refresh(make_sqlexecute(), callback_calls.append, {})
+
+    assert len(callback_calls) == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+class FakePool:
+    def __init__(self) -> None:
+        self.acquired: list[object] = []
+        self.released: list[tuple[object, bool]] = []
+
+    def acquire(self, sqlexecute):
+        executor = SimpleNamespace(dbname=sqlexecute.dbname, close=Mock())
+        self.acquired.append(executor)
+        return executor
+
+    def release(self, executor, discard: bool = False) -> None:
+        self.released.append((executor, discard))
+
+
+def test_bg_refresh_borrows_executor_from_pool(monkeypatch) -> None:
+    pool = FakePool()
+    refresher = completion_refresher.CompletionRefresher(pool=pool)
+    used: list[object] = []
+    monkeypatch.setattr(completion_refresher, 'SQLExecute', Mock(side_effect=AssertionError('no new connection')))
+    refresher.refreshers = {'use': lambda completer, executor: used.append(executor)}
+
+    refresher._bg_refresh(make_sqlexecute(), lambda completer: None, {})
+
+    assert used == pool.acquired
+    assert pool.released == [(pool.acquired[0], False)]
+    pool.acquired[0].close.assert_not_called()
+
+
+def test_bg_refresh_discards_pooled_executor_after_error() -> None:
+    pool = FakePool()
+    refresher = completion_refresher.CompletionRefresher(pool=pool)
+
+    def fail(completer, executor) -> None:
+        raise completion_refresher.pymysql.err.OperationalError(completion_refresher.BAD_DB_ERROR, 'gone')
+
+    refresher.refreshers = {'fail': fail}
+
+    refresher._bg_refresh(make_sqlexecute(), lambda completer: None, {})
+
+    assert pool.released == [(pool.acquired[0], True)]
+
+
 def test_bg_refresh_wraps_single_callback_callable(monkeypatch, refresher) -> None:
     completers: list[SimpleNamespace] = []
 
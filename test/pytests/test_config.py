@@ -15,6 +15,7 @@ import pytest
 
 from mycli import config as config_module
 from mycli.config import (
+    ConfigViews,
     LimiitedQuotePreservingConfigObj,
     _remove_pad,
     create_default_config,
@@ -237,6 +238,63 @@ def test_read_config_files_can_ignore_user_options(monkeypatch: pytest.MonkeyPat
     assert config is defaults
 
 
+def test_config_views_parse_each_file_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    create_calls: list[bool] = []
+    read_calls: list[str] = []
+
+    def create_default_config(list_values: bool = True) -> config_module.ConfigObj:
+        create_calls.append(list_values)
+        return config_module.ConfigObj({'main': {'default': 'yes', 'color': 'default'}})
+
+    def read_config_file(path: str, list_values: bool = True) -> config_module.ConfigObj | None:
+        read_calls.append(path)
+        if path == 'missing.cnf':
+            return None
+        config = config_module.ConfigObj({'main': {'color': path.split('.')[0]}})
+        config.filename = f'/tmp/{path}'
+        return config
+
+    monkeypatch.setattr(config_module, 'create_default_config', create_default_config)
+    monkeypatch.setattr(config_module, 'read_config_file', read_config_file)
+
+    views = ConfigViews(['blue.cnf', 'missing.cnf', 'green.cnf'])
+
+    assert views.config['main'] == {'default': 'yes', 'color': 'green'}
+    assert views.config.filename == '/tmp/green.cnf'
+    assert views.without_package_defaults['main'] == {'color': 'green'}
+    assert views.without_package_defaults.filename == '/tmp/green.cnf'
+    assert read_calls == ['blue.cnf', 'missing.cnf', 'green.cnf']
+    assert create_calls == [True]
+
+    assert views.without_user_options['main'] == {'default': 'yes', 'color': 'default'}
+    assert create_calls == [True, True]
+    assert read_calls == ['blue.cnf', 'missing.cnf', 'green.cnf']
+
+
+def test_config_views_can_be_changed_independently(tmp_path) -> None:
+    myclirc = tmp_path / 'myclirc'
+    myclirc.write_text('[main]\nssl_mode = on\n\n[alias_dsn]\nlocal = mysql://local/db\n')
+    views = ConfigViews([str(myclirc)])
+
+    del views.without_package_defaults['main']['ssl_mode']
+    del views.without_package_defaults['alias_dsn']['local']
+
+    assert views.config['main']['ssl_mode'] == 'on'
+    assert views.config['alias_dsn']['local'] == 'mysql://local/db'
+    assert views.without_package_defaults['main'] == {}
+
+
+def test_config_views_match_read_config_files(tmp_path) -> None:
+    myclirc = tmp_path / 'myclirc'
+    myclirc.write_text('[main]\nmulti_line = True\n\n[colors]\nkeyword = red\n')
+    files = [str(tmp_path / 'missing'), str(myclirc)]
+    views = ConfigViews(files)
+
+    assert views.config == read_config_files(files)
+    assert views.without_package_defaults == read_config_files(files, ignore_package_defaults=True)
+    assert views.without_user_options == read_config_files(files, ignore_user_options=True)
+
+
 def test_log_prints_to_stderr_when_root_logger(capsys) -> None:
     fake_logger = SimpleNamespace(parent=SimpleNamespace(name='root'), log=lambda level, message: None)
 
@@ -0,0 +1,261 @@
+# type: ignore
+
+from types import SimpleNamespace
+
+import pymysql
+import pytest
+
+from mycli import connection_pool
+from mycli.connection_pool import ConnectionPool, ControlConnection
+
+
+class FakeCursor:
+    def __init__(self, connection) -> None:
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args) -> None:
+        return None
+
+    def execute(self, sql: str) -> None:
+        if self.connection.execute_error is not None:
+            raise self.connection.execute_error
+        self.connection.executed.append(sql)
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.open = True
+        self.pings = 0
+        self.ping_error: Exception | None = None
+        self.execute_error: Exception | None = None
+        self.executed: list[str] = []
+
+    def cursor(self) -> FakeCursor:
+        return FakeCursor(self)
+
+    def ping(self, reconnect: bool = True) -> None:
+        assert reconnect is False
+        self.pings += 1
+        if self.ping_error is not None:
+            raise self.ping_error
+
+
+class FakeExecutor:
+    instances: list = []
+
+    def __init__(self, dbname, user, password, host, port, socket, character_set, local_infile, ssl) -> None:
+        self.dbname = dbname
+        self.user = user
+        self.password = password
+        self.host = host
+        self.port = port
+        self.socket = socket
+        self.character_set = character_set
+        self.local_infile = local_infile
+        self.ssl = ssl
+        self.conn = FakeConnection()
+        self.closed = False
+        self.changed_db: list[str] = []
+        FakeExecutor.instances.append(self)
+
+    def change_db(self, db: str) -> None:
+        self.changed_db.append(db)
+        self.dbname = db
+
+    def close(self) -> None:
+        self.closed = True
+        self.conn.open = False
+
+
+@pytest.fixture(autouse=True)
+def fake_executor(monkeypatch):
+    FakeExecutor.instances = []
+    monkeypatch.setattr(connection_pool, 'SQLExecute', FakeExecutor)
+
+
+def make_template(**overrides) -> SimpleNamespace:
+    fields = {
+        'dbname': 'db',
+        'user': 'user',
+        'password': 'pw',
+        'host': 'host',
+        'port': 3306,
+        'socket': None,
+        'character_set': 'utf8mb4',
+        'local_infile': False,
+        'ssl': None,
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def test_acquire_reuses_released_connection_after_ping() -> None:
+    pool = ConnectionPool()
+
+    first = pool.acquire(make_template())
+    pool.release(first)
+    second = pool.acquire(make_template())
+
+    assert second is first
+    assert first.conn.pings == 1
+    assert len(FakeExecutor.instances) == 1
+
+
+def test_acquire_switches_database_of_pooled_connection() -> None:
+    pool = ConnectionPool()
+    pool.release(pool.acquire(make_template()))
+
+    executor = pool.acquire(make_template(dbname='other'))
+
+    assert executor.changed_db == ['other']
+    assert len(FakeExecutor.instances) == 1
+
+
+def test_acquire_does_not_reuse_connection_without_database_for_none() -> None:
+    pool = ConnectionPool()
+    first = pool.acquire(make_template())
+    pool.release(first)
+
+    second = pool.acquire(make_template(dbname=None))
+
+    assert second is not first
+    assert first.closed is True
+
+
+def test_acquire_discards_connections_to_another_server_or_expired() -> None:
+    pool = ConnectionPool(max_idle=60)
+    other_server = pool.acquire(make_template(host='other'))
+    expired = pool.acquire(make_template())
+    pool.release(other_server)
+    pool.release(expired)
+    pool._idle[-1] = (pool._idle[-1][0], pool._idle[-1][1] - 120, expired)
+
+    executor = pool.acquire(make_template())
+
+    assert executor not in (other_server, expired)
+    assert other_server.closed is True
+    assert expired.closed is True
+    assert pool._idle == []
+
+
+def test_acquire_discards_connection_failing_health_check() -> None:
+    pool = ConnectionPool()
+    dead = pool.acquire(make_template())
+    pool.release(dead)
+    dead.conn.ping_error = pymysql.OperationalError(2013, 'lost')
+
+    executor = pool.acquire(make_template())
+
+    assert executor is not dead
+    assert dead.closed is True
+
+
+def test_release_closes_discarded_closed_and_surplus_connections() -> None:
+    pool = ConnectionPool(max_size=1)
+    kept, surplus, discarded, closed = (pool.acquire(make_template()) for _ in range(4))
+    closed.close()
+
+    pool.release(kept)
+    pool.release(surplus)
+    pool.release(discarded, discard=True)
+    pool.release(closed)
+
+    assert [entry[2] for entry in pool._idle] == [kept]
+    assert kept.closed is False
+    assert surplus.closed is True
+    assert discarded.closed is True
+
+
+def test_connection_context_discards_on_error_and_close_empties_pool() -> None:
+    pool = ConnectionPool()
+
+    with pytest.raises(RuntimeError):
+        with pool.connection(make_template()) as failed:
+            raise RuntimeError('boom')
+    with pool.connection(make_template()) as executor:
+        pass
+
+    assert failed.closed is True
+    assert executor.closed is False
+    pool.close()
+    assert executor.closed is True
+    assert pool._idle == []
+
+
+def test_zero_size_pool_never_keeps_connections() -> None:
+    pool = ConnectionPool(max_size=0)
+
+    executor = pool.acquire(make_template())
+    pool.release(executor)
+
+    assert executor.closed is True
+    assert pool._idle == []
+
+
+def test_control_connection_warms_up_in_background_and_kills_query() -> None:
+    control = ControlConnection()
+
+    control.warm_up(make_template())
+    control._thread.join()
+    control.kill_query(make_template(), 42)
+
+    assert len(FakeExecutor.instances) == 1
+    executor = FakeExecutor.instances[0]
+    assert executor.dbname is None
+    assert executor.conn.executed == ['KILL QUERY 42']
+
+    thread = control._thread
+    control.warm_up(make_template())
+    assert control._thread is thread
+
+
+def test_control_connection_pings_after_keepalive_and_reconnects_when_lost() -> None:
+    control = ControlConnection(keepalive=0)
+
+    control.warm_up(make_template())
+    control._thread.join()
+    first = FakeExecutor.instances[0]
+    first.conn.ping_error = pymysql.OperationalError(2006, 'gone away')
+    control.warm_up(make_template())
+    control._thread.join()
+
+    assert first.conn.pings == 1
+    assert first.closed is True
+    assert len(FakeExecutor.instances) == 2
+
+    control.warm_up(make_template(host='other'))
+    control._thread.join()
+    assert FakeExecutor.instances[1].closed is True
+    assert FakeExecutor.instances[2].host == 'other'
+
+
+def test_control_connection_retries_kill_once_on_a_new_connection(monkeypatch) -> None:
+    control = ControlConnection()
+    control.kill_query(make_template(), 1)
+    first = FakeExecutor.instances[0]
+    first.conn.execute_error = pymysql.OperationalError(2013, 'lost')
+
+    control.kill_query(make_template(), 2)
+
+    assert first.closed is True
+    assert FakeExecutor.instances[1].conn.executed == ['KILL QUERY 2']
+
+    def lost(self, sql: str) -> None:
+        raise pymysql.OperationalError(2013, 'lost')
+
+    monkeypatch.setattr(FakeCursor, 'execute', lost)
+    with pytest.raises(pymysql.OperationalError):
+        control.kill_query(make_template(), 3)
+
+
+def test_control_connection_close() -> None:
+    control = ControlConnection()
+    control.kill_query(make_template(), 1)
+
+    control.close()
+
+    assert FakeExecutor.instances[0].closed is True
+    assert control._executor is None
@@ -2,9 +2,12 @@ import importlib.util
 import os
 from pathlib import Path
 import platform
+import shutil
+import socket
 import sys
+import tempfile
 from types import ModuleType
-from typing import Any
+from typing import Iterator
 
 import pytest
 
@@ -34,12 +37,17 @@ def load_filepaths_variant(
 def test_default_socket_dirs_import_variants(monkeypatch: pytest.MonkeyPatch) -> None:
     darwin = load_filepaths_variant(monkeypatch, os_name='posix', system_name='Darwin')
     assert darwin.DEFAULT_SOCKET_DIRS == ['/tmp']
+    assert darwin.KNOWN_SOCKET_PATHS == ['/tmp/mysql.sock']
 
     linux = load_filepaths_variant(monkeypatch, os_name='posix', system_name='Linux')
     assert linux.DEFAULT_SOCKET_DIRS == ['/var/run', '/var/lib']
+    assert linux.KNOWN_SOCKET_PATHS[0] == '/var/run/mysqld/mysqld.sock'
+    assert '/etc/mysql/my.cnf' in linux.MY_CNF_FILES
 
     windows = load_filepaths_variant(monkeypatch, os_name='nt', system_name='Windows')
     assert windows.DEFAULT_SOCKET_DIRS == []
+    assert windows.KNOWN_SOCKET_PATHS == []
+    assert windows.MY_CNF_FILES == []
 
 
 def test_list_path_lists_sql_files_and_directories(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -101,30 +109,114 @@ def test_dir_path_exists(tmp_path: Path) -> None:
     assert filepaths.dir_path_exists(str(tmp_path / 'missing' / 'mycli.log')) is False
 
 
-@pytest.mark.skipif(os.name == 'nt', reason='todo: unknown')
-def test_guess_socket_location_returns_matching_socket(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr(filepaths, 'DEFAULT_SOCKET_DIRS', ['/a', '/b'])
-    monkeypatch.setattr(filepaths.os.path, 'exists', lambda path: path == '/b')
-    monkeypatch.setattr(
-        filepaths.os,
-        'walk',
-        lambda directory, topdown=True: iter([
-            ('/b', ['mysql-data', 'other'], ['mysqlx.sock', 'mysql.socket']),
-        ]),
-    )
-    assert filepaths.guess_socket_location() == '/b/mysql.socket'
-
-
-def test_guess_socket_location_prunes_dirs_and_returns_none(monkeypatch: pytest.MonkeyPatch) -> None:
-    monkeypatch.setattr(filepaths, 'DEFAULT_SOCKET_DIRS', ['/a'])
-    monkeypatch.setattr(filepaths.os.path, 'exists', lambda path: True)
-    walked_dirs: list[list[str]] = []
-
-    def fake_walk(directory: str, topdown: bool = True) -> Any:
-        dirs = ['mysql-data', 'tmp', 'mysqlx', 'other']
-        walked_dirs.append(dirs)
-        yield (directory, dirs, ['mysqlx.sock', 'readme.txt'])
-
-    monkeypatch.setattr(filepaths.os, 'walk', fake_walk)
-    assert filepaths.guess_socket_location() is None
-    assert walked_dirs[0] == ['mysql-data', 'mysqlx']
+@pytest.fixture
+def socket_dir() -> Iterator[Path]:
+    # AF_UNIX paths are limited to about 100 bytes, which pytest's tmp_path can exceed
+    directory = Path(tempfile.mkdtemp(prefix='mycli', dir='/tmp'))
+    yield directory
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def make_socket(path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sock = socket.socket(socket.AF_UNIX)
+    sock.bind(str(path))
+    sock.close()
+    return path
+
+
+def isolate_socket_search(
+    monkeypatch: pytest.MonkeyPatch,
+    *,
+    known: list[str] | None = None,
+    my_cnf: list[str] | None = None,
+    dirs: list[str] | None = None,
+) -> None:
+    monkeypatch.setattr(filepaths, 'KNOWN_SOCKET_PATHS', known or [])
+    monkeypatch.setattr(filepaths, 'MY_CNF_FILES', my_cnf or [])
+    monkeypatch.setattr(filepaths, 'DEFAULT_SOCKET_DIRS', dirs or [])
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='unix sockets')
+def test_guess_socket_location_prefers_known_paths(monkeypatch: pytest.MonkeyPatch, socket_dir: Path) -> None:
+    known = make_socket(socket_dir / 'mysqld' / 'mysqld.sock')
+    make_socket(socket_dir / 'mysql.sock')
+    isolate_socket_search(monkeypatch, known=[str(socket_dir / 'missing.sock'), str(known)], dirs=[str(socket_dir)])
+
+    assert filepaths.guess_socket_location(cache_file=None) == str(known)
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='unix sockets')
+def test_guess_socket_location_ignores_files_which_are_not_sockets(monkeypatch: pytest.MonkeyPatch, socket_dir: Path) -> None:
+    (socket_dir / 'mysql.sock').write_text('')
+    isolate_socket_search(monkeypatch, known=[str(socket_dir / 'mysql.sock')], dirs=[str(socket_dir)])
+
+    assert filepaths.guess_socket_location(cache_file=None) is None
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='unix sockets')
+def test_guess_socket_location_reads_my_cnf(monkeypatch: pytest.MonkeyPatch, socket_dir: Path) -> None:
+    server = make_socket(socket_dir / 'server.sock')
+    client = make_socket(socket_dir / 'client.sock')
+    (socket_dir / 'conf.d').mkdir()
+    (socket_dir / 'conf.d' / 'client.cnf').write_text(f'[client]\nsocket = "{client}"  # the client socket\n')
+    (socket_dir / 'conf.d' / 'ignored.txt').write_text(f'[client]\nsocket = {server}\n')
+    my_cnf = socket_dir / 'my.cnf'
+    my_cnf.write_text(f'[mysqld]\nsocket={server}\n!includedir {socket_dir / "conf.d"}\n!include {my_cnf}\n')
+    isolate_socket_search(monkeypatch, my_cnf=[str(socket_dir / 'missing.cnf'), str(my_cnf)])
+
+    assert filepaths._sockets_in_my_cnf([str(my_cnf)]) == [str(client), str(server)]
+    assert filepaths.guess_socket_location(cache_file=None) == str(client)
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='unix sockets')
+def test_guess_socket_location_searches_mysql_dirs_breadth_first(monkeypatch: pytest.MonkeyPatch, socket_dir: Path) -> None:
+    make_socket(socket_dir / 'mysqlx.sock')
+    make_socket(socket_dir / 'other' / 'mysql.sock')
+    make_socket(socket_dir / 'mysql-a' / 'mysql-b' / 'mysql.sock')
+    shallow = make_socket(socket_dir / 'mysql-c' / 'mysql.socket')
+    isolate_socket_search(monkeypatch, dirs=[str(socket_dir / 'missing'), str(socket_dir)])
+
+    assert filepaths.guess_socket_location(cache_file=None) == str(shallow)
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='unix sockets')
+def test_guess_socket_location_search_is_bounded(monkeypatch: pytest.MonkeyPatch, socket_dir: Path) -> None:
+    deep = make_socket(socket_dir / 'mysql1' / 'mysql2' / 'mysql3' / 'mysql.sock')
+    isolate_socket_search(monkeypatch, dirs=[str(socket_dir)])
+
+    monkeypatch.setattr(filepaths, 'MAX_SOCKET_SEARCH_DEPTH', 3)
+    assert filepaths.guess_socket_location(cache_file=None) == str(deep)
+    monkeypatch.setattr(filepaths, 'MAX_SOCKET_SEARCH_DEPTH', 2)
+    assert filepaths.guess_socket_location(cache_file=None) is None
+    monkeypatch.setattr(filepaths, 'MAX_SOCKET_SEARCH_DEPTH', 3)
+    monkeypatch.setattr(filepaths, 'MAX_SOCKET_SEARCH_DIRS', 3)
+    assert filepaths.guess_socket_location(cache_file=None) is None
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='unix sockets')
+def test_guess_socket_location_caches_the_socket(monkeypatch: pytest.MonkeyPatch, socket_dir: Path) -> None:
+    first = make_socket(socket_dir / 'mysql-a' / 'mysql.sock')
+    cache_file = socket_dir / 'cache' / 'socket'
+    isolate_socket_search(monkeypatch, dirs=[str(socket_dir)])
+
+    assert filepaths.guess_socket_location(cache_file=str(cache_file)) == str(first)
+    assert cache_file.read_text() == f'{first}\n'
+
+    # a valid cached socket is returned without searching
+    isolate_socket_search(monkeypatch)
+    monkeypatch.setattr(filepaths, '_search_socket_dirs', lambda directories: pytest.fail('searched'))
+    assert filepaths.guess_socket_location(cache_file=str(cache_file)) == str(first)
+    monkeypatch.undo()
+
+    # a stale cache is replaced
+    first.unlink()
+    second = make_socket(socket_dir / 'mysql-b' / 'mysql.sock')
+    isolate_socket_search(monkeypatch, dirs=[str(socket_dir)])
+    assert filepaths.guess_socket_location(cache_file=str(cache_file)) == str(second)
+    assert cache_file.read_text() == f'{second}\n'
+
+    # and removed when no socket is found
+    second.unlink()
+    assert filepaths.guess_socket_location(cache_file=str(cache_file)) is None
+    assert not cache_file.exists()
@@ -68,6 +68,7 @@ from test.utils import (
     DummyFormatter,
     DummyLogger,
     FakeCursorBase,
+    FetchingCursor,
     RecordingSQLExecute,
     ReusableLock,
     call_click_entrypoint_direct,
@@ -2328,7 +2329,7 @@ def test_format_sqlresult_uses_redirect_formatter_when_redirected() -> None:
 def test_format_sqlresult_materializes_cursor_rows_when_width_is_limited(monkeypatch: pytest.MonkeyPatch) -> None:
     cli = make_bare_mycli()
     cli.main_formatter = DummyFormatter()
-    rows = FakeCursorBase(rows=[(1,)], rowcount=1, description=[('id', 3)])
+    rows = FetchingCursor(rows=[(1,)], rowcount=1, description=[('id', 3)])
     monkeypatch.setattr(output_module, 'Cursor', FakeCursorBase)
 
     result = SQLResult(header=['id'], rows=cast(Any, rows), status='ok')
@@ -29,6 +29,8 @@ class DummyCliArgs:
     checkpoint: str | TextIOWrapper | None = None
     batch: str | None = None
     resume: bool = False
+    progress_count: bool = False
+    batch_pack: int | None = None
 
 
 @dataclass
@@ -52,12 +54,16 @@ class DummyMyCli:
         self.logger = DummyLogger()
         self.run_query_error = run_query_error
         self.ran_queries: list[tuple[str, str | TextIOWrapper | None, bool]] = []
+        self.packed_queries: list[list[str]] = []
 
     def run_query(self, query: str, checkpoint: str | TextIOWrapper | None = None, new_line: bool = True) -> None:
         if self.run_query_error is not None:
             raise self.run_query_error
         self.ran_queries.append((query, checkpoint, new_line))
 
+    def run_packed_queries(self, queries: list[str], checkpoint: str | TextIOWrapper | None = None, new_line: bool = True) -> None:
+        self.packed_queries.append(queries)
+
 
 class DummyFile:
     def __init__(self, name: str) -> None:
@@ -85,11 +91,19 @@ class DummyStream:
         return None
 
 
+class DummyProgressBarCounter:
+    def __init__(self, total: int | None) -> None:
+        self.total = total
+        self.items_completed = 0
+        self.done = False
+        self.progress: list[int] = []
+
+
 class DummyProgressBar:
-    calls: list[list[int]] = []
+    calls: list[DummyProgressBarCounter] = []
 
     def __init__(self, *args, **kwargs) -> None:
-        pass
+        self.formatters = kwargs.get('formatters', [])
 
     def __enter__(self) -> 'DummyProgressBar':
         return self
@@ -97,10 +111,14 @@ class DummyProgressBar:
     def __exit__(self, exc_type, exc, tb) -> Literal[False]:
         return False
 
-    def __call__(self, iterable) -> list[int]:
-        values = list(iterable)
-        DummyProgressBar.calls.append(values)
-        return values
+    def __call__(self, data=None, total: int | None = None) -> DummyProgressBarCounter:
+        counter = DummyProgressBarCounter(total)
+        DummyProgressBar.calls.append(counter)
+        return counter
+
+    def invalidate(self) -> None:
+        counter = DummyProgressBar.calls[-1]
+        counter.progress.append(counter.items_completed)
 
 
 class DummySpinner:
@@ -134,8 +152,9 @@ def dispatch_batch_statements(
     cli_args: DummyCliArgs,
     statements: str,
     batch_counter: int,
+    destructive: bool | None = None,
 ) -> None:
-    batch_mode.dispatch_batch_statements(cast(Any, mycli), cast(Any, cli_args), statements, batch_counter)
+    batch_mode.dispatch_batch_statements(cast(Any, mycli), cast(Any, cli_args), statements, batch_counter, destructive=destructive)
 
 
 def main_batch_with_progress_bar(mycli: DummyMyCli, cli_args: DummyCliArgs) -> int:
@@ -489,6 +508,155 @@ def test_dispatch_batch_statements_sleeps_and_reraises_query_errors(monkeypatch)
     assert secho_calls == []
 
 
+def test_batch_pipeline_preserves_order_and_classifies_statements() -> None:
+    statements = [('select 1;', 0), ('drop table t;', 1), ('select 2;', 2)]
+    pipeline = batch_mode.BatchPipeline(iter(statements), ['drop'], depth=1)
+
+    assert list(pipeline) == [
+        (('select 1;', 0), False),
+        (('drop table t;', 1), True),
+        (('select 2;', 2), False),
+    ]
+
+
+def test_batch_pipeline_skips_classification_without_keywords() -> None:
+    pipeline = batch_mode.BatchPipeline(iter([('drop table t;', 0, 14)]))
+
+    assert list(pipeline) == [(('drop table t;', 0, 14), False)]
+
+
+def test_batch_pipeline_reraises_read_errors_in_order() -> None:
+    def statements():
+        yield ('select 1;', 0)
+        raise ValueError('bad input')
+
+    seen: list[tuple[str, int]] = []
+    with pytest.raises(ValueError, match='bad input'):
+        for item, _destructive in batch_mode.BatchPipeline(statements()):
+            seen.append(item)
+
+    assert seen == [('select 1;', 0)]
+
+
+def test_batch_pipeline_stop_releases_blocked_worker() -> None:
+    pipeline = batch_mode.BatchPipeline(iter([(f'select {i};', i) for i in range(10)]), depth=1)
+    iterator = iter(pipeline)
+
+    assert next(iterator) == (('select 0;', 0), False)
+    pipeline.stop()
+    pipeline.join(timeout=5)
+
+    assert not pipeline.is_alive()
+
+
+def test_dispatch_batch_statements_uses_precomputed_classification(monkeypatch) -> None:
+    confirmations: list[str] = []
+    mycli = DummyMyCli()
+
+    monkeypatch.setattr(batch_mode, 'is_destructive', lambda _keywords, _statement: pytest.fail('should not reclassify'))
+    monkeypatch.setattr(batch_mode, 'open', lambda _path: object(), raising=False)
+    monkeypatch.setattr(batch_mode, 'confirm_destructive_query', lambda _keywords, statement: confirmations.append(statement) or False)
+    monkeypatch.setattr(batch_mode, 'sys', SimpleNamespace(stdin=None))
+
+    dispatch_batch_statements(mycli, DummyCliArgs(warn_batch=True), 'select 1;', 0, destructive=False)
+    dispatch_batch_statements(mycli, DummyCliArgs(warn_batch=True), 'drop table t;', 1, destructive=True)
+
+    assert confirmations == ['drop table t;']
+    assert mycli.ran_queries == [('select 1;', None, True)]
+
+
+@pytest.mark.parametrize(
+    ('statement', 'destructive', 'expected'),
+    (
+        ('select 1;', False, True),
+        ('insert into t values (1);', False, True),
+        ('delete from t;', True, False),
+        (';', False, False),
+        ('select 1\\G', False, False),
+        ('call p();', False, False),
+        ('delimiter $$', False, False),
+        ('\\dt', False, False),
+        ('-- note\nCALL p();', False, False),
+        ('/* x */ CALL p()', False, False),
+        ('# note\n/* a */ /* b */\n call p();', False, False),
+        ('/*!50001 CALL p() */;', False, False),
+        ('-- note\nselect 1;', False, True),
+        ('/* unterminated', False, False),
+    ),
+)
+def test_is_packable_statement(statement: str, destructive: bool, expected: bool) -> None:
+    assert batch_mode.is_packable_statement(statement, destructive) is expected
+
+
+@pytest.mark.parametrize(
+    ('statement', 'expected'),
+    (
+        ('  select 1;', 'select 1;'),
+        ('-- a\n# b\n/* c */ select /* d */ 1;', 'select /* d */ 1;'),
+        ('/*! keep */ select 1;', '/*! keep */ select 1;'),
+        ('-- only a comment', ''),
+    ),
+)
+def test_strip_leading_comments(statement: str, expected: str) -> None:
+    assert batch_mode.strip_leading_comments(statement) == expected
+
+
+def test_batch_packer_groups_plain_statements(monkeypatch) -> None:
+    dispatch_calls: list[tuple[str, int]] = []
+    mycli = DummyMyCli()
+    cli_args = DummyCliArgs(batch_pack=2)
+
+    monkeypatch.setattr(
+        batch_mode,
+        'dispatch_batch_statements',
+        lambda _mycli, _cli_args, statement, counter, **_kwargs: dispatch_calls.append((statement, counter)),
+    )
+    monkeypatch.setattr(batch_mode.special, 'is_show_warnings_enabled', lambda: False)
+
+    packer = batch_mode.BatchPacker(cast(Any, mycli), cast(Any, cli_args))
+    packer.add('select 0;', 0, False)
+    packer.add('select 1;', 1, False)
+    packer.add('select 2;', 2, False)
+    packer.add('select 3;', 3, False)
+    packer.add('drop table t;', 4, True)
+    packer.add('select 5;', 5, False)
+    packer.flush()
+
+    assert mycli.packed_queries == [['select 1;', 'select 2;']]
+    assert dispatch_calls == [('select 0;', 0), ('select 3;', 3), ('drop table t;', 4), ('select 5;', 5)]
+    assert mycli.main_formatter.format_name == 'tsv_noheader'
+
+
+@pytest.mark.parametrize(('throttle', 'warnings_enabled'), ((0.5, False), (0.0, True)))
+def test_batch_packer_disabled_by_throttle_and_warnings(monkeypatch, throttle: float, warnings_enabled: bool) -> None:
+    mycli = DummyMyCli()
+    cli_args = DummyCliArgs(batch_pack=10, throttle=throttle)
+
+    monkeypatch.setattr(batch_mode, 'dispatch_batch_statements', lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(batch_mode.special, 'is_show_warnings_enabled', lambda: warnings_enabled)
+
+    packer = batch_mode.BatchPacker(cast(Any, mycli), cast(Any, cli_args))
+    for counter in range(3):
+        packer.add(f'select {counter};', counter, False)
+    packer.flush()
+
+    assert mycli.packed_queries == []
+
+
+def test_main_batch_without_progress_bar_packs_statements(monkeypatch, tmp_path: Path) -> None:
+    mycli = DummyMyCli()
+    cli_args = DummyCliArgs(batch=write_batch_file(tmp_path, 'select 0;\nselect 1;\nselect 2;\nselect 3;\n'), batch_pack=3)
+
+    monkeypatch.setattr(batch_mode.special, 'is_show_warnings_enabled', lambda: False)
+    monkeypatch.setattr(batch_mode, 'sys', make_fake_sys(stdin_tty=True))
+
+    result = main_batch_without_progress_bar(mycli, cli_args)
+
+    assert result == 0
+    assert mycli.ran_queries == [('select 0;', None, True)]
+    assert mycli.packed_queries == [['select 1;', 'select 2;', 'select 3;']]
+
+
 def test_main_batch_with_progress_bar_returns_error_when_batch_is_missing() -> None:
     assert main_batch_with_progress_bar(DummyMyCli(), DummyCliArgs()) == 1
 
@@ -523,48 +691,37 @@ def test_main_batch_with_progress_bar_handles_open_errors(monkeypatch) -> None:
     assert messages == [('Failed to open --batch file: missing.sql', True, 'red')]
 
 
-def test_main_batch_with_progress_bar_handles_counting_value_errors(monkeypatch) -> None:
+def test_main_batch_with_progress_bar_handles_iteration_value_errors(monkeypatch, tmp_path: Path) -> None:
     messages: list[tuple[str, bool, str]] = []
-    count_handle = DummyFile('count')
-    cli_args = DummyCliArgs(batch='statements.sql')
+    cli_args = DummyCliArgs(batch=write_batch_file(tmp_path, 'select 1;\n'))
 
-    monkeypatch.setattr(batch_mode.os.path, 'exists', lambda _path: False)
-    monkeypatch.setattr(batch_mode.click, 'open_file', lambda _path: count_handle)
-    monkeypatch.setattr(batch_mode, 'statements_from_filehandle', lambda _handle: (_ for _ in ()).throw(ValueError('bad sql')))
+    DummyProgressBar.calls.clear()
+    monkeypatch.setattr(batch_mode, 'ProgressBar', DummyProgressBar)
+    monkeypatch.setattr(batch_mode.prompt_toolkit.output, 'create_output', lambda **_kwargs: object())
+    monkeypatch.setattr(
+        batch_mode,
+        'statements_and_offsets_from_filehandle',
+        lambda _handle: (_ for _ in ()).throw(ValueError('bad sql')),
+    )
     monkeypatch.setattr(batch_mode.click, 'secho', lambda message, err, fg: messages.append((message, err, fg)))
     monkeypatch.setattr(batch_mode, 'sys', make_fake_sys(stdin_tty=True))
 
     result = main_batch_with_progress_bar(DummyMyCli(), cli_args)
 
     assert result == 1
-    assert messages == [('Error reading --batch file: statements.sql: bad sql', True, 'red')]
+    assert messages == [('bad sql', True, 'red')]
 
 
-def test_main_batch_with_progress_bar_processes_all_statements(monkeypatch) -> None:
+def test_main_batch_with_progress_bar_processes_all_statements(monkeypatch, tmp_path: Path) -> None:
     messages: list[tuple[str, bool, str]] = []
-    count_handle = DummyFile('count')
-    run_handle = DummyFile('run')
-    open_calls: list[str] = []
     dispatch_calls: list[tuple[str, int]] = []
-    cli_args = DummyCliArgs(batch='statements.sql')
-
-    def fake_open_file(path: str) -> DummyFile:
-        open_calls.append(path)
-        return count_handle if len(open_calls) == 1 else run_handle
-
-    def fake_statements_from_filehandle(handle: DummyFile):
-        if handle is count_handle:
-            return iter([('select 1;', 0), ('select 2;', 1)])
-        return iter([('select 1;', 0), ('select 2;', 1)])
+    cli_args = DummyCliArgs(batch=write_batch_file(tmp_path, 'select 1;\nselect 2;\n'))
 
     DummyProgressBar.calls.clear()
-    monkeypatch.setattr(batch_mode.os.path, 'exists', lambda _path: False)
-    monkeypatch.setattr(batch_mode.click, 'open_file', fake_open_file)
-    monkeypatch.setattr(batch_mode, 'statements_from_filehandle', fake_statements_from_filehandle)
     monkeypatch.setattr(
         batch_mode,
         'dispatch_batch_statements',
-        lambda _mycli, _cli_args, statement, counter: dispatch_calls.append((statement, counter)),
+        lambda _mycli, _cli_args, statement, counter, **_kwargs: dispatch_calls.append((statement, counter)),
     )
     monkeypatch.setattr(batch_mode, 'ProgressBar', DummyProgressBar)
     monkeypatch.setattr(batch_mode.prompt_toolkit.output, 'create_output', lambda **_kwargs: object())
@@ -576,37 +733,76 @@ def test_main_batch_with_progress_bar_processes_all_statements(monkeypatch) -> N
     assert result == 0
     assert messages == [('Ignoring STDIN since --batch was also given.', True, 'yellow')]
     assert dispatch_calls == [('select 1;', 0), ('select 2;', 1)]
-    assert DummyProgressBar.calls == [[0, 1]]
-    assert count_handle.closed is True
-    assert run_handle.closed is True
+    assert len(DummyProgressBar.calls) == 1
+    assert DummyProgressBar.calls[0].total == 20
+    assert DummyProgressBar.calls[0].progress == [10, 20]
+    assert DummyProgressBar.calls[0].done is True
 
 
-def test_main_batch_with_progress_bar_returns_error_when_dispatch_fails(monkeypatch) -> None:
-    messages: list[tuple[str, bool, str]] = []
-    count_handle = DummyFile('count')
-    run_handle = DummyFile('run')
-    open_calls = 0
-    cli_args = DummyCliArgs(batch='statements.sql')
+def test_main_batch_with_progress_bar_counts_statements_in_background(monkeypatch, tmp_path: Path) -> None:
+    formatters: list = []
+    cli_args = DummyCliArgs(batch=write_batch_file(tmp_path, 'select 1;\nselect 2;\nselect 3;\n'), progress_count=True)
 
-    def fake_open_file(_path: str) -> DummyFile:
-        nonlocal open_calls
-        open_calls += 1
-        return count_handle if open_calls == 1 else run_handle
+    class RecordingProgressBar(DummyProgressBar):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            formatters.extend(self.formatters)
 
-    def fake_statements_from_filehandle(handle: DummyFile):
-        if handle is count_handle:
-            return iter([('select 1;', 0)])
-        return iter([('select 1;', 0)])
+    DummyProgressBar.calls.clear()
+    monkeypatch.setattr(batch_mode, 'dispatch_batch_statements', lambda _mycli, _cli_args, _statement, _counter, **_kwargs: None)
+    monkeypatch.setattr(batch_mode, 'ProgressBar', RecordingProgressBar)
+    monkeypatch.setattr(batch_mode.prompt_toolkit.output, 'create_output', lambda **_kwargs: object())
+    monkeypatch.setattr(batch_mode, 'sys', make_fake_sys(stdin_tty=True))
+
+    result = main_batch_with_progress_bar(DummyMyCli(), cli_args)
+
+    assert result == 0
+    statement_progress = next(f for f in formatters if isinstance(f, batch_mode.StatementProgress))
+    assert statement_progress.counter is not None
+    assert statement_progress.counter.batch_path == cli_args.batch
+    assert statement_progress.completed == 3
+
+
+def test_statement_counter_counts_statements(tmp_path: Path) -> None:
+    counter = batch_mode.StatementCounter(write_batch_file(tmp_path, 'select 1; select 2;\nselect 3;\n'))
+    counter.start()
+    counter.join()
+
+    assert counter.count == 3
+    assert counter.finished is True
+
+
+def test_statement_counter_stops_early(tmp_path: Path) -> None:
+    counter = batch_mode.StatementCounter(write_batch_file(tmp_path, 'select 1;\n'))
+    counter.stop()
+    counter.run()
+
+    assert counter.count == 0
+    assert counter.finished is False
+
+
+def test_statement_progress_shows_partial_count() -> None:
+    counter = batch_mode.StatementCounter('unused.sql')
+    statement_progress = batch_mode.StatementProgress(counter)
+    statement_progress.completed = 2
+    counter.count = 5
+
+    assert statement_progress._text() == '2/5+ statements'
+    counter.finished = True
+    assert statement_progress._text() == '2/5 statements'
+    assert batch_mode.StatementProgress()._text() == '0 statements'
+
+
+def test_main_batch_with_progress_bar_returns_error_when_dispatch_fails(monkeypatch, tmp_path: Path) -> None:
+    messages: list[tuple[str, bool, str]] = []
+    cli_args = DummyCliArgs(batch=write_batch_file(tmp_path, 'select 1;\n'))
 
-    monkeypatch.setattr(batch_mode.os.path, 'exists', lambda _path: False)
-    monkeypatch.setattr(batch_mode.click, 'open_file', fake_open_file)
-    monkeypatch.setattr(batch_mode, 'statements_from_filehandle', fake_statements_from_filehandle)
     monkeypatch.setattr(batch_mode, 'ProgressBar', DummyProgressBar)
     monkeypatch.setattr(batch_mode.prompt_toolkit.output, 'create_output', lambda **_kwargs: object())
     monkeypatch.setattr(
         batch_mode,
         'dispatch_batch_statements',
-        lambda _mycli, _cli_args, _statement, _counter: (_ for _ in ()).throw(OSError('dispatch failed')),
+        lambda _mycli, _cli_args, _statement, _counter, **_kwargs: (_ for _ in ()).throw(OSError('dispatch failed')),
     )
     monkeypatch.setattr(batch_mode.click, 'secho', lambda message, err, fg: messages.append((message, err, fg)))
     monkeypatch.setattr(batch_mode, 'sys', make_fake_sys(stdin_tty=True))
@@ -615,7 +811,6 @@ def test_main_batch_with_progress_bar_returns_error_when_dispatch_fails(monkeypa
 
     assert result == 1
     assert messages == [('dispatch failed', True, 'red')]
-    assert run_handle.closed is True
 
 
 def test_main_batch_without_progress_bar_returns_error_when_batch_is_missing() -> None:
@@ -647,7 +842,7 @@ def test_main_batch_without_progress_bar_processes_statements(monkeypatch) -> No
     monkeypatch.setattr(
         batch_mode,
         'dispatch_batch_statements',
-        lambda _mycli, _cli_args, statement, counter: dispatch_calls.append((statement, counter)),
+        lambda _mycli, _cli_args, statement, counter, **_kwargs: dispatch_calls.append((statement, counter)),
     )
     monkeypatch.setattr(batch_mode.click, 'secho', lambda message, err, fg: messages.append((message, err, fg)))
     monkeypatch.setattr(batch_mode, 'sys', make_fake_sys(stdin_tty=False))
@@ -667,7 +862,7 @@ def test_main_batch_without_progress_bar_skips_checkpoint_prefix(monkeypatch, tm
     monkeypatch.setattr(
         batch_mode,
         'dispatch_batch_statements',
-        lambda _mycli, _cli_args, statement, counter: dispatch_calls.append((statement, counter)),
+        lambda _mycli, _cli_args, statement, counter, **_kwargs: dispatch_calls.append((statement, counter)),
     )
     monkeypatch.setattr(batch_mode, 'sys', make_fake_sys(stdin_tty=True))
 
@@ -687,7 +882,7 @@ def test_main_batch_without_progress_bar_skips_only_matching_duplicate_prefix(mo
     monkeypatch.setattr(
         batch_mode,
         'dispatch_batch_statements',
-        lambda _mycli, _cli_args, statement, counter: dispatch_calls.append((statement, counter)),
+        lambda _mycli, _cli_args, statement, counter, **_kwargs: dispatch_calls.append((statement, counter)),
     )
     monkeypatch.setattr(batch_mode, 'sys', make_fake_sys(stdin_tty=True))
 
@@ -707,7 +902,7 @@ def test_main_batch_without_progress_bar_fails_on_mismatched_checkpoint(monkeypa
     monkeypatch.setattr(
         batch_mode,
         'dispatch_batch_statements',
-        lambda _mycli, _cli_args, statement, counter: dispatch_calls.append((statement, counter)),
+        lambda _mycli, _cli_args, statement, counter, **_kwargs: dispatch_calls.append((statement, counter)),
     )
     monkeypatch.setattr(batch_mode, 'sys', make_fake_sys(stdin_tty=True))
 
@@ -727,7 +922,7 @@ def test_main_batch_without_progress_bar_succeeds_when_checkpoint_skips_all(monk
     monkeypatch.setattr(
         batch_mode,
         'dispatch_batch_statements',
-        lambda _mycli, _cli_args, statement, counter: dispatch_calls.append((statement, counter)),
+        lambda _mycli, _cli_args, statement, counter, **_kwargs: dispatch_calls.append((statement, counter)),
     )
     monkeypatch.setattr(batch_mode, 'sys', make_fake_sys(stdin_tty=True))
 
@@ -750,7 +945,7 @@ def test_main_batch_with_progress_bar_skips_checkpoint_prefix_and_counts_all_sta
     monkeypatch.setattr(
         batch_mode,
         'dispatch_batch_statements',
-        lambda _mycli, _cli_args, statement, counter: dispatch_calls.append((statement, counter)),
+        lambda _mycli, _cli_args, statement, counter, **_kwargs: dispatch_calls.append((statement, counter)),
     )
     monkeypatch.setattr(batch_mode, 'sys', make_fake_sys(stdin_tty=True))
 
@@ -761,7 +956,7 @@ def test_main_batch_with_progress_bar_skips_checkpoint_prefix_and_counts_all_sta
 
     assert result == 0
     assert dispatch_calls == [('select 2;', 1), ('select 3;', 2)]
-    assert DummyProgressBar.calls == [[0, 1, 2]]
+    assert DummyProgressBar.calls[0].progress == [10, 20, 30]
 
 
 def test_main_batch_with_progress_bar_returns_error_when_checkpoint_replay_fails(monkeypatch, tmp_path: Path) -> None:
@@ -805,7 +1000,7 @@ def test_main_batch_from_stdin_processes_statements(monkeypatch) -> None:
     monkeypatch.setattr(
         batch_mode,
         'dispatch_batch_statements',
-        lambda _mycli, _cli_args, statement, counter: dispatch_calls.append((statement, counter)),
+        lambda _mycli, _cli_args, statement, counter, **_kwargs: dispatch_calls.append((statement, counter)),
     )
 
     result = main_batch_from_stdin(DummyMyCli(), DummyCliArgs())
@@ -832,8 +1027,8 @@ def test_main_batch_from_stdin_returns_error_for_value_errors(monkeypatch) -> No
     (
         ('select 2;', [], ['select 2;'], None),
         ('select 2; select 3;\nselect 4;\n', [], ['select 2;', 'select 3;', 'select 4;'], None),
-        ('select 2;\nselect 2;\nselect 2;\n', ['--progress'], ['select 2;', 'select 2;', 'select 2;'], [[0, 1, 2]]),
-        ('select 2; select 3;\nselect 4;\n', ['--progress'], ['select 2;', 'select 3;', 'select 4;'], [[0, 1, 2]]),
+        ('select 2;\nselect 2;\nselect 2;\n', ['--progress'], ['select 2;', 'select 2;', 'select 2;'], [10, 20, 30]),
+        ('select 2; select 3;\nselect 4;\n', ['--progress'], ['select 2;', 'select 3;', 'select 4;'], [20, 20, 30]),
     ),
 )
 def test_click_batch_file_modes(monkeypatch, contents: str, extra_args: list[str], expected_queries: list[str], expected_progress) -> None:
@@ -849,7 +1044,7 @@ def test_click_batch_file_modes(monkeypatch, contents: str, extra_args: list[str
     assert result.exit_code == 0
     assert MockMyCli.ran_queries == expected_queries
     if expected_progress is not None:
-        assert DummyProgressBar.calls == expected_progress
+        assert DummyProgressBar.calls[0].progress == expected_progress
 
 
 def test_click_batch_file_skips_checkpoint_prefix(monkeypatch, tmp_path: Path) -> None:
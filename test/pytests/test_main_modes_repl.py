@@ -5,6 +5,9 @@ from collections.abc import Generator, Iterator
 from dataclasses import dataclass
 from io import StringIO
 import os
+import signal
+import threading
+import time
 from types import SimpleNamespace
 from typing import Any, Literal, cast
 
@@ -12,8 +15,13 @@ from prompt_toolkit.formatted_text import to_formatted_text, to_plain_text
 import pymysql
 import pytest
 
+from mycli.connection_pool import ControlConnection
 import mycli.main_modes.repl as repl_mode
+from mycli.packages.special import iocommands
 from mycli.packages.sqlresult import SQLResult
+import mycli.sqlexecute as sqlexecute_module
+from mycli.sqlexecute import SQLExecute
+from test.utils import dbtest
 
 
 class DummyLogger:
@@ -158,6 +166,7 @@ def make_repl_cli(sqlexecute: Any | None = None) -> Any:
     cli.plot_scale_factor = 1.0
     cli.plot_ppi = 200
     cli.plot_theme = 'carbong90'
+    cli.export_row_group_size = 100000
     cli.prompt_session = None
     cli.post_redirect_command = None
     cli.logfile = None
@@ -179,6 +188,7 @@ def make_repl_cli(sqlexecute: Any | None = None) -> Any:
     cli.emacs_ttimeoutlen = 1.0
     cli.vi_ttimeoutlen = 2.0
     cli.sandbox_mode = False
+    cli.control_connection = None
     cli.destructive_warning = False
     cli.destructive_keywords = ['drop']
     cli.llm_prompt_field_truncate = 0
@@ -780,6 +790,80 @@ def test_output_results_covers_watch_warning_timing_beep_and_interrupts(monkeypa
     )
 
 
+def test_output_results_redraws_watch_frames_in_place(monkeypatch: pytest.MonkeyPatch) -> None:
+    cli = make_repl_cli(SimpleNamespace())
+    cli.auto_vertical_output = False
+    cli.prompt_session = FakePromptSession(columns=60, rows=10)
+    cli.format_sqlresult = lambda result, **kwargs: iter(result.rows)
+    cli.log_output = lambda line: None
+    echoed: list[str] = []
+    clears: list[bool] = []
+    monkeypatch.setattr(repl_mode.click, 'echo', lambda message, nl=True: echoed.append(message))
+    monkeypatch.setattr(repl_mode.click, 'clear', lambda: clears.append(True))
+    monkeypatch.setattr(repl_mode.sys.stdout, 'isatty', lambda: True)
+    monkeypatch.setattr(repl_mode.special, 'is_redirected', lambda: False)
+    monkeypatch.setattr(repl_mode.special, 'is_timing_enabled', lambda: True)
+    time_values = iter([0.5, 0.5, 2.0, 2.0, 0.5, 0.5])
+    monkeypatch.setattr(repl_mode.time, 'time', lambda: next(time_values))
+
+    def watch(rows: list[str]) -> SQLResult:
+        command = {'name': 'watch', 'seconds': 1.0, 'clear': True, 'statement': 0, 'statements': 1, 'server_seconds': 0.25}
+        return SQLResult(rows=rows, command=command)
+
+    repl_mode._output_results(cli, repl_mode.ReplState(), sqlresult_generator(watch(['a', 'b']), watch(['a', 'c'])), start=0.0)
+
+    timing = 'Time: 0.500s (server: 0.250s, client: 0.250s)'
+    assert echoed == [
+        f'\x1b[H\x1b[Ja\nb\n{timing}\n',
+        '\x1b[2;1Hc\x1b[K\x1b[4;1H',
+    ]
+    assert clears == []
+    assert cli.output_calls == []
+    assert cli.timing_calls == []
+
+    monkeypatch.setattr(repl_mode.sys.stdout, 'isatty', lambda: False)
+    repl_mode._output_results(cli, repl_mode.ReplState(), sqlresult_generator(watch(['a'])), start=0.0)
+    assert clears == [True]
+    assert cli.timing_calls == [(timing, False)]
+
+
+def test_output_results_repaints_watch_frame_after_terminal_resize(monkeypatch: pytest.MonkeyPatch) -> None:
+    cli = make_repl_cli(SimpleNamespace())
+    cli.auto_vertical_output = False
+    cli.prompt_session = FakePromptSession(columns=60, rows=10)
+    cli.log_output = lambda line: None
+    echoed: list[str] = []
+    monkeypatch.setattr(repl_mode.click, 'echo', lambda message, nl=True: echoed.append(message))
+    monkeypatch.setattr(repl_mode.sys.stdout, 'isatty', lambda: True)
+    monkeypatch.setattr(repl_mode.special, 'is_redirected', lambda: False)
+    monkeypatch.setattr(repl_mode.special, 'is_timing_enabled', lambda: False)
+
+    def format_sqlresult(result: SQLResult, **kwargs: Any) -> Iterator[str]:
+        # the terminal shrinks while the second frame is on its way
+        if result.rows == ['a', 'c']:
+            cli.prompt_session.output.columns = 40
+        return iter(result.rows)
+
+    cli.format_sqlresult = format_sqlresult
+
+    def watch(rows: list[str]) -> SQLResult:
+        command = {'name': 'watch', 'seconds': 1.0, 'clear': True, 'statement': 0, 'statements': 1}
+        return SQLResult(rows=rows, command=command)
+
+    repl_mode._output_results(
+        cli,
+        repl_mode.ReplState(),
+        sqlresult_generator(watch(['a', 'b']), watch(['a', 'c']), watch(['a', 'd'])),
+        start=0.0,
+    )
+
+    assert echoed == [
+        '\x1b[H\x1b[Ja\nb\n',
+        '\x1b[H\x1b[Ja\nc\n',
+        '\x1b[2;1Hd\x1b[K\x1b[3;1H',
+    ]
+
+
 def test_output_results_handles_abort_default_width_and_bad_watch(monkeypatch: pytest.MonkeyPatch) -> None:
     cli = make_repl_cli(SimpleNamespace())
     cli.auto_vertical_output = True
@@ -1588,6 +1672,45 @@ def test_one_iteration_restarts_completions_when_active_database_drop_fails(monk
     assert cli.sqlexecute.dbname == 'db'
 
 
+@pytest.mark.parametrize(
+    ('text', 'patched', 'refresh_calls'),
+    [
+        ('alter table orders add column note text', True, []),
+        ('alter table orders add column note text', False, [False]),
+        ('create user bob', None, [False]),
+    ],
+)
+def test_one_iteration_patches_completions_after_ddl(
+    monkeypatch: pytest.MonkeyPatch,
+    text: str,
+    patched: bool | None,
+    refresh_calls: list[bool],
+) -> None:
+    patch_repl_runtime_defaults(monkeypatch)
+    monkeypatch.setattr(repl_mode, 'need_completion_refresh', lambda text: True)
+
+    class FakeSQLExecute:
+        dbname = 'db'
+        connection_id = 0
+
+        def run(self, text: str) -> Iterator[SQLResult]:
+            return iter([SQLResult(status='OK')])
+
+    cli = make_repl_cli(FakeSQLExecute())
+    changed: list[Any] = []
+
+    def refresh_changed_objects(targets: Any) -> bool:
+        changed.append(targets)
+        return bool(patched)
+
+    cli.refresh_changed_objects = refresh_changed_objects
+
+    repl_mode._one_iteration(cli, repl_mode.ReplState(), text)
+
+    assert changed == ([] if patched is None else [[repl_mode.ddl_targets(text)[0]]])
+    assert cli.refresh_calls == refresh_calls
+
+
 @pytest.mark.parametrize(
     ('terminator', 'setter_name'),
     [(r'\x', 'set_explorer_output'), (r'\G', 'set_expanded_output')],
@@ -1687,10 +1810,10 @@ def test_one_iteration_writes_polars_parquet_without_rendering_rows(monkeypatch:
         connection_id = 0
 
         def __init__(self) -> None:
-            self.calls: list[str] = []
+            self.calls: list[tuple[str, bool]] = []
 
-        def run(self, text: str) -> Iterator[SQLResult]:
-            self.calls.append(text)
+        def run(self, text: str, unbuffered: bool = False) -> Iterator[SQLResult]:
+            self.calls.append((text, unbuffered))
             return iter([SQLResult(header=['id'], rows=[(1,)])])
 
     sqlexecute = FakeSQLExecute()
@@ -1713,11 +1836,15 @@ def test_one_iteration_writes_polars_parquet_without_rendering_rows(monkeypatch:
         plot_scale_factor: float,
         plot_ppi: int,
         plot_theme: str,
+        row_group_size: int,
+        progress: Any,
     ) -> SQLResult:
         assert image_protocol == 'none'
         assert plot_scale_factor == 1.0
         assert plot_ppi == 200
         assert plot_theme == 'carbong90'
+        assert row_group_size == 100000
+        assert progress is None
         assert list(results) == [SQLResult(header=['id'], rows=[(1,)])]
         run_calls.append((received_transform, path))
         return SQLResult(status=f'Wrote 1 rows to {path}.')
@@ -1735,7 +1862,7 @@ def test_one_iteration_writes_polars_parquet_without_rendering_rows(monkeypatch:
     command = 'SELECT * FROM orders .> orders.parquet'
     repl_mode._one_iteration(cli, repl_mode.ReplState(), command)
 
-    assert sqlexecute.calls == ['SELECT * FROM orders']
+    assert sqlexecute.calls == [('SELECT * FROM orders', True)]
     assert prepare_calls == [('SELECT * FROM orders', None)]
     assert run_calls == [(transform, 'orders.parquet')]
     assert cli.output_calls[-1][1] == SQLResult(status='Wrote 1 rows to orders.parquet.')
@@ -1776,6 +1903,8 @@ def test_one_iteration_writes_transformed_polars_parquet(monkeypatch: pytest.Mon
         plot_scale_factor: float,
         plot_ppi: int,
         plot_theme: str,
+        row_group_size: int,
+        progress: Any,
     ) -> SQLResult:
         assert image_protocol == 'none'
         assert plot_scale_factor == 1.0
@@ -1838,6 +1967,8 @@ def test_one_iteration_writes_polars_plot_and_runs_post_redirect_hook(
         plot_scale_factor: float,
         plot_ppi: int,
         plot_theme: str,
+        row_group_size: int,
+        progress: Any,
     ) -> SQLResult:
         assert received_transform is transform
         assert list(results) == [SQLResult(header=['id'], rows=[(1,)])]
@@ -1872,7 +2003,7 @@ def test_one_iteration_reports_polars_post_redirect_hook_error(monkeypatch: pyte
         dbname = 'db'
         connection_id = 0
 
-        def run(self, text: str) -> Iterator[SQLResult]:
+        def run(self, text: str, unbuffered: bool = False) -> Iterator[SQLResult]:
             assert text == 'SELECT * FROM orders'
             return iter([SQLResult(header=['id'], rows=[(1,)])])
 
@@ -1884,9 +2015,7 @@ def test_one_iteration_reports_polars_post_redirect_hook_error(monkeypatch: pyte
     monkeypatch.setattr(
         repl_mode,
         'run_polars_transform',
-        lambda received_transform, results, path, *, image_protocol, plot_scale_factor, plot_ppi, plot_theme: SQLResult(
-            status=f'Wrote 1 rows to {path}.'
-        ),
+        lambda received_transform, results, path, **kwargs: SQLResult(status=f'Wrote 1 rows to {path}.'),
     )
 
     def raise_hook_error(command: str, filename: str) -> None:
@@ -1909,8 +2038,9 @@ def test_one_iteration_does_not_run_hook_after_failed_polars_parquet_write(monke
         dbname = 'db'
         connection_id = 0
 
-        def run(self, text: str) -> Iterator[SQLResult]:
+        def run(self, text: str, unbuffered: bool = False) -> Iterator[SQLResult]:
             assert text == 'SELECT * FROM orders'
+            assert unbuffered
             return iter([SQLResult(header=['id'], rows=[(1,)])])
 
     cli = make_repl_cli(FakeSQLExecute())
@@ -1928,6 +2058,8 @@ def test_one_iteration_does_not_run_hook_after_failed_polars_parquet_write(monke
         plot_scale_factor: float,
         plot_ppi: int,
         plot_theme: str,
+        row_group_size: int,
+        progress: Any,
     ) -> SQLResult:
         raise repl_mode.PolarsTransformError('write failed')
 
@@ -2135,6 +2267,176 @@ def test_one_iteration_covers_cancel_paths_and_redirect_error(monkeypatch: pytes
     assert 'Did not get a connection id, skip cancelling query' in cli.echo_calls
 
 
+class FakeControlConnection:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, Any]] = []
+        self.error: Exception | None = None
+
+    def warm_up(self, sqlexecute: Any) -> None:
+        self.calls.append(('warm_up', sqlexecute))
+
+    def kill_query(self, sqlexecute: Any, connection_id: int) -> None:
+        self.calls.append(('kill_query', connection_id))
+        if self.error is not None:
+            raise self.error
+
+
+class FakeInterruptedSQLExecute:
+    """Receives a real SIGINT while waiting for the server, then reads
+    *response* as the response to the statement."""
+
+    def __init__(self, response: BaseException | None = None, in_flight: bool = True) -> None:
+        self.dbname = 'db'
+        self.connection_id = 7
+        self.response = response
+        self.in_flight = in_flight
+        self.query_in_flight = False
+        self.connects = 0
+
+    def connect(self) -> None:
+        self.connects += 1
+
+    def run(self, text: str) -> Iterator[SQLResult]:
+        if text == 'kill 7':
+            yield SQLResult(status='OK')
+            return
+        self.query_in_flight = self.in_flight
+        os.kill(os.getpid(), signal.SIGINT)
+        self.query_in_flight = False
+        if self.response is not None:
+            raise self.response
+        yield SQLResult(status='1 row in set')
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='POSIX signals')
+def test_one_iteration_kills_query_over_control_connection_and_keeps_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    patch_repl_runtime_defaults(monkeypatch)
+    sqlexecute = FakeInterruptedSQLExecute(pymysql.OperationalError(1317, 'Query execution was interrupted'))
+    cli = make_repl_cli(sqlexecute)
+    control = FakeControlConnection()
+    cli.control_connection = control
+    handler = signal.getsignal(signal.SIGINT)
+
+    repl_mode._one_iteration(cli, repl_mode.ReplState(), 'select sleep(100)')
+
+    assert control.calls == [('warm_up', sqlexecute), ('kill_query', 7)]
+    assert sqlexecute.connects == 0
+    assert cli.echo_calls == ['Cancelled query id: 7']
+    assert signal.getsignal(signal.SIGINT) is handler
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='POSIX signals')
+def test_one_iteration_kills_query_and_keeps_result_which_finished_first(monkeypatch: pytest.MonkeyPatch) -> None:
+    patch_repl_runtime_defaults(monkeypatch)
+    sqlexecute = FakeInterruptedSQLExecute()
+    cli = make_repl_cli(sqlexecute)
+    cli.control_connection = FakeControlConnection()
+
+    repl_mode._one_iteration(cli, repl_mode.ReplState(), 'select sleep(100)')
+
+    assert sqlexecute.connects == 0
+    assert cli.output_calls[0][1].status == '1 row in set'
+    assert cli.echo_calls == ['Cancelled query id: 7']
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='POSIX signals')
+@pytest.mark.parametrize('response', [IndexError('index out of range'), pymysql.InternalError('Packet sequence number wrong')])
+def test_one_iteration_reconnects_when_killed_response_is_out_of_step(monkeypatch: pytest.MonkeyPatch, response) -> None:
+    patch_repl_runtime_defaults(monkeypatch)
+    sqlexecute = FakeInterruptedSQLExecute(response)
+    cli = make_repl_cli(sqlexecute)
+    cli.control_connection = FakeControlConnection()
+
+    repl_mode._one_iteration(cli, repl_mode.ReplState(), 'select sleep(100)')
+
+    assert sqlexecute.connects == 1
+    assert cli.echo_calls == [str(response), 'Cancelled query id: 7']
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='POSIX signals')
+def test_one_iteration_interrupts_when_kill_cannot_be_sent(monkeypatch: pytest.MonkeyPatch) -> None:
+    patch_repl_runtime_defaults(monkeypatch)
+    sqlexecute = FakeInterruptedSQLExecute()
+    cli = make_repl_cli(sqlexecute)
+    control = FakeControlConnection()
+    control.error = pymysql.OperationalError(2003, 'unreachable')
+    cli.control_connection = control
+
+    repl_mode._one_iteration(cli, repl_mode.ReplState(), 'select sleep(100)')
+
+    assert control.calls[-1] == ('kill_query', 7)
+    assert sqlexecute.connects == 1
+    assert cli.echo_calls == ['Cancelled query id: 7']
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='POSIX signals')
+def test_one_iteration_interrupts_when_no_statement_is_waiting(monkeypatch: pytest.MonkeyPatch) -> None:
+    patch_repl_runtime_defaults(monkeypatch)
+    sqlexecute = FakeInterruptedSQLExecute(in_flight=False)
+    cli = make_repl_cli(sqlexecute)
+    control = FakeControlConnection()
+    cli.control_connection = control
+
+    repl_mode._one_iteration(cli, repl_mode.ReplState(), 'select 1')
+
+    assert control.calls == [('warm_up', sqlexecute)]
+    assert sqlexecute.connects == 1
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='POSIX signals')
+def test_one_iteration_stops_watch_at_one_interrupt_without_killing(monkeypatch: pytest.MonkeyPatch) -> None:
+    patch_repl_runtime_defaults(monkeypatch)
+    executed: list[str] = []
+    cursor = SimpleNamespace(execute=executed.append, description=None)
+    executor = SQLExecute.__new__(SQLExecute)
+    executor.conn = SimpleNamespace(cursor=lambda *args: cursor)
+    executor.dbname = 'db'
+    executor.connection_id = 42
+    executor.query_in_flight = False
+    monkeypatch.setattr(sqlexecute_module, 'Connection', SimpleNamespace)
+
+    def interrupted_sleep(seconds: float) -> None:
+        os.kill(os.getpid(), signal.SIGINT)
+        time.sleep(seconds)
+
+    monkeypatch.setattr(iocommands, 'sleep', interrupted_sleep)
+    cli = make_repl_cli(executor)
+    control = FakeControlConnection()
+    cli.control_connection = control
+
+    repl_mode._one_iteration(cli, repl_mode.ReplState(), 'watch 0.01 select 1')
+
+    assert executed == ['select 1']
+    assert control.calls == [('warm_up', executor)]
+    assert not [message for message in cli.echo_calls if 'Cancelled' in message]
+
+
+@dbtest
+@pytest.mark.skipif(os.name == 'nt', reason='POSIX signals')
+def test_one_iteration_interrupts_real_query_and_keeps_session(monkeypatch: pytest.MonkeyPatch, executor) -> None:
+    patch_repl_runtime_defaults(monkeypatch)
+    cli = make_repl_cli(executor)
+    cli.control_connection = ControlConnection()
+    executor.reset_connection_id()
+    connection_id = executor.connection_id
+    list(executor.run('set @kept = 42'))
+
+    timer = threading.Timer(1.0, os.kill, (os.getpid(), signal.SIGINT))
+    timer.start()
+    try:
+        started = time.monotonic()
+        repl_mode._one_iteration(cli, repl_mode.ReplState(), 'select sleep(10)')
+        elapsed = time.monotonic() - started
+    finally:
+        timer.cancel()
+        cli.control_connection.close()
+
+    assert elapsed < 5
+    assert f'Cancelled query id: {connection_id}' in cli.echo_calls
+    assert executor.connection_id == connection_id
+    assert list(next(executor.run('select @kept, connection_id()')).rows) == [(42, connection_id)]
+
+
 def test_main_repl_covers_setup_loop_and_goodbye(monkeypatch: pytest.MonkeyPatch) -> None:
     cli = make_repl_cli(SimpleNamespace())
     cli.verbosity = 0
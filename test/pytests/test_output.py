@@ -6,6 +6,7 @@ import sys
 from types import ModuleType, SimpleNamespace
 from typing import Any, cast
 
+from cli_helpers.tabular_output import TabularOutputFormatter
 import click
 from configobj import ConfigObj
 import prompt_toolkit
@@ -14,10 +15,12 @@ import pytest
 
 from mycli import compat
 from mycli import output as output_module
+from mycli.main_modes import repl as repl_mode
 from mycli.output import OutputMixin
 from mycli.packages.sqlresult import SQLResult
+from mycli.packages.tabular_output import streaming
 from mycli.types import ImageProtocol
-from test.utils import DummyFormatter, FakeCursorBase, make_bare_mycli  # type: ignore[attr-defined]
+from test.utils import DummyFormatter, FakeCursorBase, FetchingCursor, make_bare_mycli  # type: ignore[attr-defined]
 
 
 def test_output_timing_logs_and_prints_with_default_style(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -174,7 +177,7 @@ def test_get_output_margin_renders_prompt_once_and_counts_status_lines(monkeypat
     cli.prompt_format = 'ignored'
     cli.prompt_session = None
     cli.get_reserved_space = lambda: 2  # type: ignore[assignment]
-    monkeypatch.setattr(output_module.repl_mode, 'render_prompt_string', lambda *_args: FormattedText([('', 'one\ntwo')]))
+    monkeypatch.setattr(repl_mode, 'render_prompt_string', lambda *_args: FormattedText([('', 'one\ntwo')]))
     monkeypatch.setattr(output_module.special, 'is_timing_enabled', lambda: True)
 
     margin = OutputMixin.get_output_margin(cli, 'ok\nwarning')
@@ -194,7 +197,7 @@ def test_get_output_margin_uses_prompt_session_render_counter(monkeypatch: pytes
         render_counters.append(render_counter)
         return FormattedText([('', 'prompt')])
 
-    monkeypatch.setattr(output_module.repl_mode, 'render_prompt_string', render_prompt_string)
+    monkeypatch.setattr(repl_mode, 'render_prompt_string', render_prompt_string)
     monkeypatch.setattr(output_module.special, 'is_timing_enabled', lambda: False)
 
     assert OutputMixin.get_output_margin(cli) == 2
@@ -292,15 +295,71 @@ def test_output_switches_to_pager_when_content_does_not_fit(monkeypatch: pytest.
     assert paged_lines == ['row\n']
 
 
-def test_output_redirected_skips_screen_printing(monkeypatch: pytest.MonkeyPatch) -> None:
+def test_output_streams_remaining_lines_to_pager(monkeypatch: pytest.MonkeyPatch) -> None:
     cli = make_bare_mycli()
     cli.prompt_session = None
+    cli.explicit_pager = True
     cli.log_output = lambda value: None  # type: ignore[assignment]
     cli.get_output_margin = lambda status=None: 1  # type: ignore[assignment]
-    printed_lines: list[str] = []
+    produced: list[str] = []
+    pager_calls: list[int] = []
+
+    def lines():
+        for line in ['row 1', 'row 2', 'row 3']:
+            produced.append(line)
+            yield line
+
+    def echo_via_pager(values) -> None:
+        pager_calls.append(len(produced))
+        list(values)
+
     monkeypatch.setattr(output_module.special, 'write_tee', lambda value: None)
     monkeypatch.setattr(output_module.special, 'write_once', lambda value: None)
     monkeypatch.setattr(output_module.special, 'write_pipe_once', lambda value: None)
+    monkeypatch.setattr(output_module.special, 'is_redirected', lambda: False)
+    monkeypatch.setattr(output_module.special, 'is_pager_enabled', lambda: True)
+    monkeypatch.setattr(click, 'echo_via_pager', echo_via_pager)
+
+    OutputMixin.output(cli, itertools.chain(lines()), SQLResult())
+
+    assert pager_calls == [1]
+    assert produced == ['row 1', 'row 2', 'row 3']
+
+
+def test_output_tees_and_logs_every_line_when_pager_quits_early(monkeypatch: pytest.MonkeyPatch) -> None:
+    cli = make_bare_mycli()
+    cli.prompt_session = None
+    cli.explicit_pager = True
+    logged: list[str] = []
+    teed: list[str] = []
+    paged: list[str] = []
+    cli.log_output = logged.append  # type: ignore[assignment]
+    cli.get_output_margin = lambda status=None: 1  # type: ignore[assignment]
+
+    def quit_after_first_line(values) -> None:
+        paged.append(next(iter(values)))
+
+    monkeypatch.setattr(output_module.special, 'write_tee', teed.append)
+    monkeypatch.setattr(output_module.special, 'write_once', lambda value: None)
+    monkeypatch.setattr(output_module.special, 'write_pipe_once', lambda value: None)
+    monkeypatch.setattr(output_module.special, 'is_redirected', lambda: False)
+    monkeypatch.setattr(output_module.special, 'is_pager_enabled', lambda: True)
+    monkeypatch.setattr(click, 'echo_via_pager', quit_after_first_line)
+
+    OutputMixin.output(cli, itertools.chain(['row 1', 'row 2', 'row 3']), SQLResult())
+
+    assert paged == ['row 1\n']
+    assert teed == ['row 1', 'row 2', 'row 3']
+    assert logged == ['row 1', 'row 2', 'row 3']
+
+
+def test_output_redirected_skips_screen_printing(monkeypatch: pytest.MonkeyPatch) -> None:
+    cli = make_bare_mycli()
+    cli.prompt_session = None
+    cli.log_output = lambda value: None  # type: ignore[assignment]
+    cli.get_output_margin = lambda status=None: 1  # type: ignore[assignment]
+    printed_lines: list[str] = []
+    monkeypatch.setattr(output_module.special, 'write_redirected', lambda lines: None)
     monkeypatch.setattr(output_module.special, 'is_redirected', lambda: True)
     monkeypatch.setattr(output_module.special, 'is_pager_enabled', lambda: False)
     monkeypatch.setattr(click, 'secho', lambda value, **_kwargs: printed_lines.append(value))
@@ -310,6 +369,22 @@ def test_output_redirected_skips_screen_printing(monkeypatch: pytest.MonkeyPatch
     assert printed_lines == []
 
 
+def test_output_redirected_writes_blocks_of_lines(monkeypatch: pytest.MonkeyPatch) -> None:
+    cli = make_bare_mycli()
+    cli.redirect_buffer_size = 9
+    logged: list[str] = []
+    written: list[list[str]] = []
+    cli.log_output = lambda value: logged.append(value)  # type: ignore[assignment]
+    cli.get_output_margin = lambda status=None: pytest.fail('fit checks are skipped')  # type: ignore[assignment]
+    monkeypatch.setattr(output_module.special, 'write_redirected', lambda lines: written.append(lines))
+    monkeypatch.setattr(output_module.special, 'is_redirected', lambda: True)
+
+    OutputMixin.output(cli, itertools.chain(['id', 'row 1', 'row 2', 'row 3']), SQLResult())
+
+    assert written == [['id', 'row 1'], ['row 2', 'row 3']]
+    assert logged == ['id\nrow 1', 'row 2\nrow 3']
+
+
 def test_output_uses_warning_status_style(monkeypatch: pytest.MonkeyPatch) -> None:
     cli = make_bare_mycli()
     cli.log_output = lambda value: None  # type: ignore[assignment]
@@ -559,7 +634,7 @@ def test_format_sqlresult_materializes_cursor_rows_when_width_is_limited(monkeyp
     cli = make_bare_mycli()
     cli.main_formatter = DummyFormatter()
     monkeypatch.setattr(output_module, 'Cursor', FakeCursorBase)
-    rows = FakeCursorBase(rows=[(1,)], rowcount=1, description=[('id', 3)])
+    rows = FetchingCursor(rows=[(1,)], rowcount=1, description=[('id', 3)])
     result = SQLResult(header=['id'], rows=cast(Any, rows))
 
     list(OutputMixin.format_sqlresult(cli, result, max_width=100))
@@ -608,6 +683,82 @@ def test_format_sqlresult_keeps_table_when_first_line_fits_width() -> None:
     assert list(OutputMixin.format_sqlresult(cli, result, max_width=100)) == ['plain output']
 
 
+def test_format_sqlresult_streams_cursor_rows_beyond_sample(monkeypatch: pytest.MonkeyPatch) -> None:
+    cli = make_bare_mycli()
+    cli.main_formatter = TabularOutputFormatter('ascii')
+    cli.helpers_style = None
+    monkeypatch.setattr(output_module, 'Cursor', FakeCursorBase)
+    monkeypatch.setattr(streaming, 'SAMPLE_ROWS', 2)
+    rows = FetchingCursor(rows=[(1,), (2,), (333,)], rowcount=3, description=[('id', 3)])
+    result = SQLResult(header=['id'], rows=cast(Any, rows))
+
+    formatted = list(OutputMixin.format_sqlresult(cli, result))
+
+    assert formatted == ['+----+', '| id |', '+----+', '|  1 |', '|  2 |', '| 333 |', '+----+']
+
+
+def test_format_sqlresult_renders_small_cursor_results_with_tabulate(monkeypatch: pytest.MonkeyPatch) -> None:
+    cli = make_bare_mycli()
+    cli.main_formatter = TabularOutputFormatter('ascii')
+    cli.helpers_style = None
+    monkeypatch.setattr(output_module, 'Cursor', FakeCursorBase)
+    monkeypatch.setattr(streaming, 'SAMPLE_ROWS', 4)
+    rows = FetchingCursor(rows=[(1,), (2,), (333,)], rowcount=3, description=[('id', 3)])
+    result = SQLResult(header=['id'], rows=cast(Any, rows))
+
+    formatted = list(OutputMixin.format_sqlresult(cli, result))
+
+    assert formatted == ['+-----+', '|  id |', '+-----+', '|   1 |', '|   2 |', '| 333 |', '+-----+']
+
+
+def test_format_sqlresult_streamed_table_switches_to_vertical_with_all_rows(monkeypatch: pytest.MonkeyPatch) -> None:
+    cli = make_bare_mycli()
+    cli.main_formatter = TabularOutputFormatter('ascii')
+    cli.helpers_style = None
+    monkeypatch.setattr(output_module, 'Cursor', FakeCursorBase)
+    monkeypatch.setattr(streaming, 'SAMPLE_ROWS', 2)
+    rows = FetchingCursor(rows=[(1,), (2,), (3,)], rowcount=3, description=[('id', 3)])
+    result = SQLResult(header=['id'], rows=cast(Any, rows))
+
+    formatted = list(OutputMixin.format_sqlresult(cli, result, max_width=3))
+
+    assert [line.splitlines()[-1] for line in formatted] == ['id | 1', 'id | 2', 'id | 3']
+
+
+@pytest.mark.parametrize(
+    ('format_name', 'is_expanded', 'max_width'),
+    [('simple', False, None), ('simple', False, 80), ('grid', False, None), ('ascii', True, None)],
+)
+def test_format_sqlresult_formats_every_cursor_row_when_not_streamed(
+    monkeypatch: pytest.MonkeyPatch, format_name: str, is_expanded: bool, max_width: int | None
+) -> None:
+    cli = make_bare_mycli()
+    cli.main_formatter = TabularOutputFormatter(format_name)
+    cli.helpers_style = None
+    monkeypatch.setattr(output_module, 'Cursor', FakeCursorBase)
+    monkeypatch.setattr(streaming, 'SAMPLE_ROWS', 2)
+    rows = FetchingCursor(rows=[(101,), (102,), (103,), (104,), (105,)], rowcount=5, description=[('id', 3)])
+    result = SQLResult(header=['id'], rows=cast(Any, rows))
+
+    formatted = '\n'.join(OutputMixin.format_sqlresult(cli, result, is_expanded=is_expanded, max_width=max_width))
+
+    assert all(str(value) in formatted for value in range(101, 106))
+
+
+def test_format_sqlresult_falls_back_to_vertical_with_every_cursor_row(monkeypatch: pytest.MonkeyPatch) -> None:
+    cli = make_bare_mycli()
+    cli.main_formatter = TabularOutputFormatter('simple')
+    cli.helpers_style = None
+    monkeypatch.setattr(output_module, 'Cursor', FakeCursorBase)
+    monkeypatch.setattr(streaming, 'SAMPLE_ROWS', 2)
+    rows = FetchingCursor(rows=[(1,), (2,), (3,), (4,), (5,)], rowcount=5, description=[('id', 3)])
+    result = SQLResult(header=['id'], rows=cast(Any, rows))
+
+    formatted = list(OutputMixin.format_sqlresult(cli, result, max_width=1))
+
+    assert [line.splitlines()[-1] for line in formatted] == [f'id | {i}' for i in range(1, 6)]
+
+
 def test_get_reserved_space_caps_ratio(monkeypatch: pytest.MonkeyPatch) -> None:
     cli = make_bare_mycli()
     monkeypatch.setattr(shutil, 'get_terminal_size', lambda *args, **kwargs: (120, 40))
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+import datetime
+import os
 from pathlib import Path
+import signal
+import threading
+import time
+from types import SimpleNamespace
 from typing import Any, Iterator, Sequence
 
+import pymysql
+from pymysql.constants import FIELD_TYPE, FLAG
+from pymysql.cursors import Cursor
 import pytest
 
 import mycli.packages.polars_transform as polars_transform
@@ -27,20 +36,21 @@ class FakeDataFrame:
         rows: list[tuple[Any, ...]] | list[Any],
         schema: list[str],
         orient: str | None = None,
+        infer_schema_length: int | None = 100,
     ) -> None:
         if orient is None:
-            self.rows = [(value,) for value in rows]
+            self.data = [(value,) for value in rows]
         else:
             assert orient == 'row'
-            self.rows = rows
+            self.data = rows
         self.columns = schema
         self.parquet_paths: list[str] = []
 
-    def iter_rows(self) -> Iterator[tuple[Any, ...]]:
-        return iter(self.rows)
+    def rows(self) -> list[tuple[Any, ...]]:
+        return list(self.data)
 
     def __len__(self) -> int:
-        return len(self.rows)
+        return len(self.data)
 
     def write_parquet(self, path: str) -> None:
         self.parquet_paths.append(path)
@@ -94,6 +104,7 @@ class ScalarConstructionFailingDataFrame(FakeDataFrame):
         rows: list[tuple[Any, ...]] | list[Any],
         schema: list[str],
         orient: str | None = None,
+        infer_schema_length: int | None = 100,
     ) -> None:
         if orient is None:
             raise TypeError('invalid scalar')
@@ -267,7 +278,7 @@ def test_parse_polars_transform_ignores_non_suffix_markers(command: str) -> None
         ('SELECT 1 .|', 'require a Python expression'),
         ('SELECT 1; SELECT 2 .| df', 'exactly one SQL statement'),
         ('SELECT 1 .>', 'require a destination path'),
-        ('SELECT 1 .> export.csv', 'end in ".parquet", ".png", ".pdf", ".svg", or ".html"'),
+        ('SELECT 1 .> export.csv', 'end in ".parquet", ".arrow", ".feather", ".png", ".pdf", ".svg", or ".html"'),
         ('SELECT 1 .> export file.parquet', 'must be quoted'),
         ('SELECT 1 .> export.parquet .| df', 'must follow'),
         ('SELECT 1 .| df .> export.parquet \\x', 'cannot use special display terminators'),
@@ -607,7 +618,7 @@ def test_run_polars_transform_writes_series_to_parquet(
     assert result == SQLResult(status=f'Wrote {len(rows)} rows to series.parquet.')
     assert FakeDataFrame.written_paths == ['series.parquet']
     assert FakeDataFrame.written_dataframes[-1].columns == [column_name]
-    assert FakeDataFrame.written_dataframes[-1].rows == rows
+    assert FakeDataFrame.written_dataframes[-1].rows() == rows
 
 
 def test_run_polars_transform_reports_series_parquet_write_error(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -866,3 +877,267 @@ def test_run_polars_transform_rejects_non_single_tabular_result(results: Iterato
 def test_run_polars_transform_reports_expression_error() -> None:
     with pytest.raises(PolarsTransformError, match='ZeroDivisionError'):
         run_polars_transform(make_transform('1 / 0'), iter([SQLResult(header=['id'], rows=[(1,)])]))
+
+
+class FakeCursor(Cursor):
+    def __init__(self, description: list[tuple[Any, ...]], rows: list[tuple[Any, ...]]) -> None:
+        self.description = description
+        self.remaining = list(rows)
+        self.batch_sizes: list[int] = []
+
+    def fetchmany(self, size: int | None = None) -> list[tuple[Any, ...]]:
+        assert size is not None
+        self.batch_sizes.append(size)
+        batch, self.remaining = self.remaining[:size], self.remaining[size:]
+        return batch
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        raise AssertionError('rows should be fetched in batches')
+
+
+def cursor_column(name: str, field_type: int) -> tuple[Any, ...]:
+    return (name, field_type, None, None, None, None, True)
+
+
+def run_identity_transform(header: list[str], rows: Any) -> Any:
+    import polars as pl
+
+    return run_polars_transform(
+        PolarsTransform(sql='SELECT 1', expression='df', code=compile('df', '<test>', 'eval'), polars=pl, altair=None),
+        iter([SQLResult(header=header, rows=rows)]),
+    )
+
+
+def test_run_polars_transform_builds_typed_columns_in_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    import polars as pl
+
+    monkeypatch.setattr(polars_transform, 'FETCH_BATCH_SIZE', 2)
+    rows = [
+        (None, None, None, None),
+        (None, None, None, None),
+        (1, 1.5, datetime.date(2024, 1, 2), 'one'),
+        (2, None, None, None),
+        (3, 2.5, datetime.date(2024, 1, 3), 'three'),
+    ]
+    cursor = FakeCursor(
+        [
+            cursor_column('id', FIELD_TYPE.LONGLONG),
+            cursor_column('price', FIELD_TYPE.DOUBLE),
+            cursor_column('day', FIELD_TYPE.DATE),
+            cursor_column('name', FIELD_TYPE.VAR_STRING),
+        ],
+        rows,
+    )
+
+    dataframe = polars_transform._build_dataframe(pl, ['id', 'price', 'day', 'name'], cursor)
+
+    assert cursor.batch_sizes == [2, 2, 2, 2]
+    assert dataframe.schema == {'id': pl.Int64, 'price': pl.Float64, 'day': pl.Date, 'name': pl.String}
+    assert dataframe.rows() == rows
+    assert dataframe.n_chunks() == 1
+
+
+def test_run_polars_transform_falls_back_to_inferred_column_types() -> None:
+    import polars as pl
+
+    cursor = FakeCursor(
+        [cursor_column('id', FIELD_TYPE.LONGLONG), cursor_column('created', FIELD_TYPE.DATETIME)],
+        [(2**64 - 1, '0000-00-00 00:00:00')],
+    )
+
+    dataframe = polars_transform._build_dataframe(pl, ['id', 'created'], cursor)
+
+    assert dataframe.schema['created'] == pl.String
+    assert dataframe.rows() == [(2**64 - 1, '0000-00-00 00:00:00')]
+
+
+def test_run_polars_transform_keeps_columns_of_empty_results() -> None:
+    import polars as pl
+
+    cursor = FakeCursor([cursor_column('id', FIELD_TYPE.LONG), cursor_column('name', FIELD_TYPE.VAR_STRING)], [])
+
+    result = run_identity_transform(['id', 'name'], cursor)
+    dataframe = polars_transform._build_dataframe(pl, ['id', 'name'], FakeCursor(cursor.description, []))
+
+    assert result == SQLResult(header=['id', 'name'], rows=[])
+    assert dataframe.schema == {'id': pl.Int64, 'name': pl.Null}
+
+
+def test_run_polars_transform_batches_row_lists(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(polars_transform, 'FETCH_BATCH_SIZE', 2)
+    rows = [(1, 'one'), (2, None), (3, 'three')]
+
+    assert run_identity_transform(['id', 'name'], rows) == SQLResult(header=['id', 'name'], rows=rows)
+
+
+def make_export_transform() -> PolarsTransform:
+    import polars as pl
+
+    return PolarsTransform(sql='SELECT 1', expression=None, code=compile('df', '<test>', 'eval'), polars=pl, altair=None)
+
+
+@pytest.mark.parametrize(
+    ('expression', 'output_path', 'expected'),
+    [
+        (None, 'orders.parquet', True),
+        (None, 'orders.ARROW', True),
+        (None, 'orders.feather', True),
+        (None, 'orders.png', False),
+        ('df.head()', 'orders.parquet', False),
+        (None, None, False),
+    ],
+)
+def test_is_streamed_export(expression: str | None, output_path: str | None, expected: bool) -> None:
+    pipeline = PolarsPipeline(sql='SELECT 1', expression=expression, output_path=output_path, output_mode='tabular')
+
+    assert polars_transform.is_streamed_export(pipeline) is expected
+
+
+@pytest.mark.parametrize(('suffix', 'read'), [('parquet', 'read_parquet'), ('arrow', 'read_ipc'), ('feather', 'read_ipc')])
+def test_run_polars_transform_streams_export_in_row_groups(tmp_path: Path, suffix: str, read: str) -> None:
+    import polars as pl
+
+    rows = [(None, None), (None, None), (1, 'one'), (2, None), (3, 'three')]
+    cursor = FakeCursor([cursor_column('id', FIELD_TYPE.LONGLONG), cursor_column('name', FIELD_TYPE.VAR_STRING)], rows)
+    output_path = str(tmp_path / f'orders.{suffix}')
+    progress: list[int] = []
+
+    result = run_polars_transform(
+        make_export_transform(),
+        iter([SQLResult(header=['id', 'name'], rows=cursor)]),
+        output_path,
+        row_group_size=2,
+        progress=progress.append,
+    )
+
+    assert result == SQLResult(status=f'Wrote 5 rows to {output_path}.')
+    assert cursor.batch_sizes == [2, 2, 2, 2]
+    assert progress == [2, 4, 5]
+    written = getattr(pl, read)(output_path)
+    assert written.schema == {'id': pl.Int64, 'name': pl.String}
+    assert written.rows() == rows
+
+
+def make_field(flags: int = 0, charsetnr: int = 255) -> SimpleNamespace:
+    return SimpleNamespace(flags=flags, charsetnr=charsetnr)
+
+
+def test_run_polars_transform_exports_unsigned_bigints_past_the_first_batch(tmp_path: Path) -> None:
+    import polars as pl
+
+    rows = [(1,), (2,), (2**64 - 1,)]
+    cursor = FakeCursor([cursor_column('id', FIELD_TYPE.LONGLONG)], rows)
+    cursor._result = SimpleNamespace(fields=[make_field(flags=FLAG.UNSIGNED)])
+    output_path = str(tmp_path / 'orders.parquet')
+
+    run_polars_transform(make_export_transform(), iter([SQLResult(header=['id'], rows=cursor)]), output_path, row_group_size=2)
+
+    written = pl.read_parquet(output_path)
+    assert written.schema == {'id': pl.UInt64}
+    assert written.rows() == rows
+
+
+def test_run_polars_transform_exports_binary_columns_null_in_the_first_batch(tmp_path: Path) -> None:
+    import polars as pl
+
+    rows = [(None, None), (None, None), (b'\xff\x00', 'one')]
+    cursor = FakeCursor([cursor_column('data', FIELD_TYPE.BLOB), cursor_column('name', FIELD_TYPE.VAR_STRING)], rows)
+    cursor._result = SimpleNamespace(fields=[make_field(charsetnr=polars_transform.BINARY_CHARSET), make_field()])
+    output_path = str(tmp_path / 'orders.parquet')
+
+    run_polars_transform(make_export_transform(), iter([SQLResult(header=['data', 'name'], rows=cursor)]), output_path, row_group_size=2)
+
+    written = pl.read_parquet(output_path)
+    assert written.schema == {'data': pl.Binary, 'name': pl.String}
+    assert written.rows() == rows
+
+
+def test_run_polars_transform_exports_empty_results(tmp_path: Path) -> None:
+    import polars as pl
+
+    cursor = FakeCursor([cursor_column('id', FIELD_TYPE.LONG)], [])
+    output_path = str(tmp_path / 'orders.parquet')
+
+    result = run_polars_transform(make_export_transform(), iter([SQLResult(header=['id'], rows=cursor)]), output_path)
+
+    assert result == SQLResult(status=f'Wrote 0 rows to {output_path}.')
+    assert pl.read_parquet(output_path).schema == {'id': pl.Int64}
+
+
+def test_run_polars_transform_export_reraises_cursor_errors_and_removes_partial_file(tmp_path: Path) -> None:
+    class KilledCursor(FakeCursor):
+        def fetchmany(self, size: int | None = None) -> list[tuple[Any, ...]]:
+            if self.batch_sizes:
+                raise pymysql.OperationalError(1317, 'Query execution was interrupted')
+            return super().fetchmany(size)
+
+    cursor = KilledCursor([cursor_column('id', FIELD_TYPE.LONG)], [(1,), (2,), (3,)])
+    output_path = tmp_path / 'orders.parquet'
+
+    with pytest.raises(pymysql.OperationalError, match='interrupted'):
+        run_polars_transform(
+            make_export_transform(),
+            iter([SQLResult(header=['id'], rows=cursor)]),
+            str(output_path),
+            row_group_size=1,
+        )
+
+    assert not output_path.exists()
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='POSIX signals')
+@pytest.mark.parametrize('handler', [signal.default_int_handler, 'counting'])
+def test_run_polars_transform_export_stops_at_one_interrupt_and_removes_partial_file(tmp_path: Path, handler: Any) -> None:
+    class SlowCursor(FakeCursor):
+        def fetchmany(self, size: int | None = None) -> list[tuple[Any, ...]]:
+            time.sleep(0.01)
+            self.batch_sizes.append(1)
+            return [(len(self.batch_sizes),)]
+
+    interrupts: list[int] = []
+
+    def counting_handler(signum: int, frame: Any) -> None:
+        interrupts.append(signum)
+        raise KeyboardInterrupt
+
+    cursor = SlowCursor([cursor_column('id', FIELD_TYPE.LONG)], [])
+    output_path = tmp_path / 'orders.parquet'
+    previous = signal.signal(signal.SIGINT, counting_handler if handler == 'counting' else handler)
+    timer = threading.Timer(0.3, os.kill, (os.getpid(), signal.SIGINT))
+    try:
+        timer.start()
+        started = time.monotonic()
+        with pytest.raises(KeyboardInterrupt):
+            run_polars_transform(
+                make_export_transform(),
+                iter([SQLResult(header=['id'], rows=cursor)]),
+                str(output_path),
+                row_group_size=1,
+            )
+        elapsed = time.monotonic() - started
+        # a duplicate interrupt would be raised here
+        time.sleep(0.3)
+    finally:
+        timer.cancel()
+        signal.signal(signal.SIGINT, previous)
+
+    assert elapsed < 2
+    assert interrupts == ([signal.SIGINT] if handler == 'counting' else [])
+    assert not output_path.exists()
+    fetched = len(cursor.batch_sizes)
+    time.sleep(0.1)
+    assert len(cursor.batch_sizes) == fetched
+
+
+def test_run_polars_transform_export_reports_batches_which_do_not_fit_the_schema(tmp_path: Path) -> None:
+    output_path = tmp_path / 'orders.parquet'
+
+    with pytest.raises(PolarsTransformError, match='Unable to write Parquet file'):
+        run_polars_transform(
+            make_export_transform(),
+            iter([SQLResult(header=['id'], rows=[(1,), ('one',)])]),
+            str(output_path),
+            row_group_size=1,
+        )
+
+    assert not output_path.exists()
@@ -1,5 +1,5 @@
 from types import SimpleNamespace
-from typing import Any, cast
+from typing import Any, Iterator, cast
 
 import pytest
 
@@ -9,10 +9,11 @@ from mycli.packages.ptoolkit.history import FileHistoryWithTimestamp
 
 class DummyHistory(FileHistoryWithTimestamp):
     def __init__(self, items: list[tuple[str, str]]) -> None:
-        self._items = items
+        super().__init__('history')
+        self._older = items
 
-    def load_history_with_timestamp(self) -> list[tuple[str, str]]:
-        return self._items
+    def _refresh(self) -> None:
+        pass
 
 
 def make_event(history: Any) -> SimpleNamespace:
@@ -110,7 +111,8 @@ def test_search_history_formats_preview_updates_buffer_and_deduplicates(monkeypa
         def is_available(self) -> bool:
             return True
 
-        def prompt(self, items: list[str], fzf_options: str) -> list[str]:
+        def prompt_stream(self, items: Iterator[str], fzf_options: str) -> list[str]:
+            items = list(items)
             prompt_calls.append({'items': items, 'options': fzf_options})
             return [items[0]]
 
@@ -131,12 +133,12 @@ def test_search_history_formats_preview_updates_buffer_and_deduplicates(monkeypa
     assert prompt_calls == [
         {
             'items': [
-                '2026-01-02 03:04:05  SELECT 1 FROM dual',
-                '2026-01-03 12:00:00  SELECT 2',
+                '0\t2026-01-02 03:04:05  SELECT 1 FROM dual',
+                '1\t2026-01-03 12:00:00  SELECT 2',
             ],
             'options': '--info=hidden --scheme=history --tiebreak=index --bind=ctrl-r:up,alt-r:up '
-            '--preview-window=down:wrap:nohidden --no-height '
-            "--preview=\"printf '%s' {} | pygmentize -l mysql -P style='monokai style'\"",
+            "--preview-window=down:wrap:nohidden --no-height --delimiter='\\t' --with-nth=2.. "
+            "--preview=\"printf '%s' {2..} | pygmentize -l mysql -P style='monokai style'\"",
         }
     ]
     assert invalidated_apps == [event.app]
@@ -166,7 +168,8 @@ def test_search_history_without_result_keeps_buffer_and_uses_plain_preview(
         def is_available(self) -> bool:
             return True
 
-        def prompt(self, items: list[str], fzf_options: str) -> list[str]:
+        def prompt_stream(self, items: Iterator[str], fzf_options: str) -> list[str]:
+            items = list(items)
             prompt_calls.append({'items': items, 'options': fzf_options})
             return []
 
@@ -182,11 +185,45 @@ def test_search_history_without_result_keeps_buffer_and_uses_plain_preview(
 
     assert prompt_calls == [
         {
-            'items': ['2026-01-01 00:00:00  SELECT 1'],
+            'items': ['0\t2026-01-01 00:00:00  SELECT 1'],
             'options': '--info=hidden --scheme=history --tiebreak=index --bind=ctrl-r:up,alt-r:up '
-            "--preview-window=down:wrap:nohidden --no-height --preview=\"printf '%s' {}\"",
+            "--preview-window=down:wrap:nohidden --no-height --delimiter='\\t' --with-nth=2.. "
+            "--preview=\"printf '%s' {2..}\"",
         }
     ]
     assert invalidated_apps == [event.app]
     assert event.current_buffer.text == 'original'
     assert event.current_buffer.cursor_position == 0
+
+
+def test_prompt_stream_pipes_choices_and_stops_when_fzf_exits() -> None:
+    fzf = fzf_module.Fzf.__new__(fzf_module.Fzf)
+    fzf.executable_path = 'head -n 2 #'
+    produced: list[int] = []
+
+    def choices() -> Iterator[str]:
+        for i in range(1_000_000):
+            produced.append(i)
+            yield f'{i}\tchoice {i}'
+
+    assert fzf.prompt_stream(choices(), '--ignored') == ['0\tchoice 0', '1\tchoice 1']
+    assert len(produced) < 1_000_000
+
+
+def test_search_history_maps_selection_back_through_its_position(monkeypatch) -> None:
+    history = DummyHistory([('SELECT 2', '2026-01-02 00:00:00'), ('SELECT\t1', '2026-01-01 00:00:00')])
+    event = make_event(history=history)
+
+    class PromptingFzf:
+        def is_available(self) -> bool:
+            return True
+
+        def prompt_stream(self, items: Iterator[str], fzf_options: str) -> list[str]:
+            return [list(items)[1]]
+
+    monkeypatch.setattr(fzf_module, 'Fzf', PromptingFzf)
+    monkeypatch.setattr(fzf_module, 'safe_invalidate_display', lambda app: None)
+
+    fzf_module.search_history(cast(Any, event))
+
+    assert event.current_buffer.text == 'SELECT\t1'
@@ -1,7 +1,10 @@
 # type: ignore
 
+import asyncio
 from pathlib import Path
 
+import pytest
+
 from mycli.packages.ptoolkit import history as history_module
 from mycli.packages.ptoolkit.history import FileHistoryWithTimestamp
 
@@ -70,3 +73,86 @@ def test_load_history_with_timestamp_ignores_empty_separator_blocks(tmp_path: Pa
     assert history.load_history_with_timestamp() == [
         ('SELECT 1', '2026-04-02 11:00:00'),
     ]
+
+
+def write_history(path: Path, count: int) -> list[tuple[str, str]]:
+    expected = []
+    with path.open('a', encoding='utf-8') as f:
+        for i in range(count):
+            entry = f'SELECT {i}\nFROM t{i}' if i % 3 == 0 else f'SELECT {i}'
+            timestamp = f'2026-04-02 10:00:{i:02d}'
+            f.write(f'\n# {timestamp}\n')
+            for line in entry.split('\n'):
+                f.write(f'+{line}\n')
+            expected.append((entry, timestamp))
+    return expected
+
+
+def test_history_is_read_backwards_in_blocks(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(history_module, '_BLOCK_SIZE', 16)
+    history_path = tmp_path / 'history.txt'
+    expected = write_history(history_path, 40)
+
+    history = FileHistoryWithTimestamp(history_path)
+    entries = history.iter_history_with_timestamp()
+
+    assert [next(entries) for _ in range(3)] == expected[::-1][:3]
+    assert history._parsed_from > history_path.stat().st_size // 2
+    assert list(entries) == expected[::-1][3:]
+    assert history._parsed_from == 0
+
+
+def test_history_only_parses_what_was_appended_since_the_last_read(tmp_path: Path, monkeypatch) -> None:
+    history_path = tmp_path / 'history.txt'
+    expected = write_history(history_path, 5)
+    history = FileHistoryWithTimestamp(history_path)
+    assert history.load_history_with_timestamp() == expected[::-1]
+
+    monkeypatch.setattr(history, '_read_backwards', lambda: pytest.fail('the file was read again'))
+    history.store_string('SHOW TABLES')
+
+    entries = history.load_history_with_timestamp()
+    assert entries[0][0] == 'SHOW TABLES'
+    assert entries[1:] == expected[::-1]
+
+
+def test_history_starts_over_when_the_file_is_replaced(tmp_path: Path) -> None:
+    history_path = tmp_path / 'history.txt'
+    write_history(history_path, 5)
+    history = FileHistoryWithTimestamp(history_path)
+    history.load_history_with_timestamp()
+
+    history_path.unlink()
+    assert history.load_history_with_timestamp() == []
+    expected = write_history(history_path, 2)
+    assert history.load_history_with_timestamp() == expected[::-1]
+
+
+def test_load_yields_most_recent_first_and_keeps_appended_strings(tmp_path: Path) -> None:
+    history_path = tmp_path / 'history.txt'
+    expected = write_history(history_path, 3)
+    history = FileHistoryWithTimestamp(history_path)
+
+    async def load():
+        return [item async for item in history.load()]
+
+    assert asyncio.run(load()) == [entry for entry, _timestamp in expected[::-1]]
+    history.append_string('SELECT 99')
+    assert asyncio.run(load())[0] == 'SELECT 99'
+    assert history.get_strings()[-1] == 'SELECT 99'
+
+
+def test_unique_history_keeps_most_recent_of_entries_differing_in_whitespace(tmp_path: Path, monkeypatch) -> None:
+    history_path = tmp_path / 'history.txt'
+    history = FileHistoryWithTimestamp(history_path)
+    history_path.write_text('# t1\n+SELECT 1\n+FROM dual\n\n# t2\n+SELECT 2\n', encoding='utf-8')
+    history.store_string('SELECT  1 FROM dual')
+
+    assert list(history.iter_unique_history_with_timestamp())[1:] == [('SELECT 2', 't2', 'SELECT 2')]
+    assert history._older_normalized == ['SELECT 1 FROM dual', 'SELECT 2', 'SELECT 1 FROM dual']
+
+    monkeypatch.setattr(history_module, '_collapse_whitespace', None)
+    assert [entry for entry, _timestamp, _normalized in history.iter_unique_history_with_timestamp()] == [
+        'SELECT  1 FROM dual',
+        'SELECT 2',
+    ]
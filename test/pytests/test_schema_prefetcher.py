@@ -472,6 +472,164 @@ def test_run_logs_prefetch_error_and_continues(monkeypatch) -> None:
     invalidate.assert_called_once_with()
 
 
+def test_run_prefetches_schemas_in_parallel_over_separate_connections(monkeypatch) -> None:
+    mycli = make_mycli()
+    mycli.prefetch_schemas_parallelism = 3
+    schemas = [f'schema{i}' for i in range(6)]
+    executors: list[MagicMock] = []
+    make_executor = _fake_executor_factory({schema: [(f't_{schema}', 'c')] for schema in schemas})
+    barrier = threading.Barrier(3, timeout=5)
+
+    def make(*args, **kwargs):
+        executor = make_executor(*args, **kwargs)
+        table_columns = executor.table_columns.side_effect
+
+        def wait_for_all_workers(schema=None):
+            # every connection must be working before any schema completes
+            if not barrier.broken:
+                barrier.wait()
+            return table_columns(schema=schema)
+
+        executor.table_columns.side_effect = wait_for_all_workers
+        executors.append(executor)
+        return executor
+
+    monkeypatch.setattr(schema_prefetcher_module, 'SQLExecute', make)
+    prefetcher = SchemaPrefetcher(mycli)
+
+    prefetcher._run(schemas)
+
+    assert len(executors) == 3
+    assert prefetcher._loaded == set(schemas)
+    assert set(mycli.completer.dbmetadata['tables']) >= set(schemas)
+    for executor in executors:
+        executor.close.assert_called_once_with()
+
+
+def test_run_borrows_connections_from_pool(monkeypatch) -> None:
+    mycli = make_mycli()
+    mycli.prefetch_schemas_parallelism = 2
+    make_executor = _fake_executor_factory({'other1': [('t', 'c')], 'other2': [('u', 'c')]})
+    released: list[tuple[object, bool]] = []
+    mycli.connection_pool = SimpleNamespace(
+        acquire=lambda sqlexecute: make_executor(),
+        release=lambda executor, discard=False: released.append((executor, discard)),
+    )
+    monkeypatch.setattr(schema_prefetcher_module, 'SQLExecute', MagicMock(side_effect=AssertionError('no new connection')))
+    prefetcher = SchemaPrefetcher(mycli)
+
+    prefetcher._run(['other1', 'other2'])
+
+    assert prefetcher._loaded == {'other1', 'other2'}
+    assert len(released) == 2
+    assert all(discard is False for _executor, discard in released)
+    for executor, _discard in released:
+        executor.close.assert_not_called()
+
+
+def test_run_limits_workers_to_number_of_schemas(monkeypatch) -> None:
+    mycli = make_mycli()
+    mycli.prefetch_schemas_parallelism = 8
+    executors: list[MagicMock] = []
+    make_executor = _fake_executor_factory({})
+
+    def make(*args, **kwargs):
+        executors.append(make_executor(*args, **kwargs))
+        return executors[-1]
+
+    monkeypatch.setattr(schema_prefetcher_module, 'SQLExecute', make)
+    prefetcher = SchemaPrefetcher(mycli)
+
+    prefetcher._run(['a', 'b'])
+
+    assert len(executors) == 2
+    assert prefetcher._loaded == {'a', 'b'}
+
+
+def test_prefetch_worker_logs_connection_failure(monkeypatch) -> None:
+    mycli = make_mycli()
+    prefetcher = SchemaPrefetcher(mycli)
+    errors: list[str] = []
+    monkeypatch.setattr(prefetcher, '_make_executor', MagicMock(side_effect=RuntimeError('boom')))
+    monkeypatch.setattr(schema_prefetcher_module._logger, 'error', lambda message, *args: errors.append(message))
+    next_schema = MagicMock()
+
+    prefetcher._prefetch_worker(None, next_schema, threading.Event())
+
+    next_schema.assert_not_called()
+    assert errors == ['schema prefetch could not open connection: %r']
+
+
+def _bulk_executor(schemas: list[str]) -> MagicMock:
+    executor = MagicMock()
+    executor.all_table_columns.side_effect = lambda _schemas: iter([(schema, f't_{schema}', 'id') for schema in [*schemas, 'unrequested']])
+    executor.all_indexed_columns.side_effect = lambda _schemas: iter([(schemas[0], f't_{schemas[0]}', 'id')])
+    executor.all_foreign_keys.side_effect = lambda _schemas: iter([])
+    executor.all_enum_values.side_effect = lambda _schemas: iter([(schemas[1], f't_{schemas[1]}', 'kind', ['a', 'b'])])
+    executor.all_routines.side_effect = lambda _schemas: iter([
+        (schemas[0], 'FUNCTION', 'f1'),
+        (schemas[0], 'PROCEDURE', 'p1'),
+        ('unrequested', 'FUNCTION', 'f2'),
+    ])
+    executor.close = MagicMock()
+    return executor
+
+
+def test_run_prefetches_many_schemas_in_bulk(monkeypatch) -> None:
+    mycli = make_mycli()
+    schemas = [f'schema{i}' for i in range(schema_prefetcher_module.BULK_PREFETCH_MIN_SCHEMAS)]
+    executor = _bulk_executor(schemas)
+    prefetcher = SchemaPrefetcher(mycli)
+    prefetch_one = MagicMock()
+    monkeypatch.setattr(prefetcher, '_make_executor', lambda: executor)
+    monkeypatch.setattr(prefetcher, '_prefetch_one', prefetch_one)
+
+    prefetcher._run(schemas)
+
+    prefetch_one.assert_not_called()
+    assert prefetcher._loaded == set(schemas)
+    meta = mycli.completer.dbmetadata
+    assert meta['tables']['schema0'] == {'t_schema0': ['*', 'id']}
+    assert 'unrequested' not in meta['tables']
+    assert meta['enum_values']['schema1'] == {'t_schema1': {'kind': ['a', 'b']}}
+    assert set(meta['functions']['schema0']) == {'f1'}
+    assert set(meta['procedures']['schema0']) == {'p1'}
+    for fetch in (executor.all_table_columns, executor.all_indexed_columns, executor.all_foreign_keys, executor.all_enum_values):
+        fetch.assert_called_once_with(schemas)
+    executor.all_routines.assert_called_once_with(schemas)
+    executor.close.assert_called_once_with()
+
+
+def test_run_falls_back_to_per_schema_prefetch_when_bulk_fails(monkeypatch) -> None:
+    mycli = make_mycli()
+    schemas = [f'schema{i}' for i in range(schema_prefetcher_module.BULK_PREFETCH_MIN_SCHEMAS)]
+    executor = _bulk_executor(schemas)
+    executor.all_foreign_keys.side_effect = RuntimeError('boom')
+    prefetcher = SchemaPrefetcher(mycli)
+    calls: list[str] = []
+    monkeypatch.setattr(prefetcher, '_make_executor', lambda: executor)
+    monkeypatch.setattr(prefetcher, '_prefetch_one', lambda _executor, schema: calls.append(schema))
+
+    prefetcher._run(schemas)
+
+    assert calls == schemas
+    assert prefetcher._loaded == set(schemas)
+
+
+def test_run_prefetches_few_schemas_one_at_a_time(monkeypatch) -> None:
+    mycli = make_mycli()
+    executor = MagicMock()
+    prefetcher = SchemaPrefetcher(mycli)
+    calls: list[str] = []
+    monkeypatch.setattr(prefetcher, '_make_executor', lambda: executor)
+    monkeypatch.setattr(prefetcher, '_prefetch_one', lambda _executor, schema: calls.append(schema))
+
+    prefetcher._run(['a', 'b'])
+
+    assert calls == ['a', 'b']
+    executor.all_table_columns.assert_not_called()
+
+
 def test_prefetch_one_loads_foreign_keys_enums_functions_and_procedures(monkeypatch) -> None:
     mycli = make_mycli()
     load_schema_metadata = MagicMock()
@@ -357,6 +357,26 @@ def test_pipe_once_command():
             assert f.read() == b"hello world\n"
 
 
+def test_write_redirected(tmp_path, monkeypatch):
+    once_path = tmp_path / 'once.txt'
+    tee_path = tmp_path / 'tee.txt'
+    monkeypatch.setitem(mycli.packages.special.iocommands.PIPE_ONCE, 'process', object())
+    monkeypatch.setitem(mycli.packages.special.iocommands.PIPE_ONCE, 'stdin', [])
+    mycli.packages.special.execute(None, f"\\once {once_path}")
+    mycli.packages.special.execute(None, f"tee {tee_path}")
+    try:
+        mycli.packages.special.write_redirected(['a,b', '', '1,2'])
+        mycli.packages.special.write_redirected(['3,4'])
+        assert mycli.packages.special.iocommands.written_to_once_file
+    finally:
+        mycli.packages.special.unset_once_if_written(None)
+        mycli.packages.special.close_tee()
+
+    assert once_path.read_text() == 'a,b\n1,2\n3,4\n'
+    assert tee_path.read_text() == 'a,b\n\n1,2\n3,4\n'
+    assert mycli.packages.special.iocommands.PIPE_ONCE['stdin'] == ['a,b\n1,2', '3,4']
+
+
 def test_parseargfile():
     """Test that parseargfile expands the user directory."""
     expected = (os.path.join(os.path.expanduser("~"), "filename"), "a")
@@ -430,17 +450,15 @@ def test_watch_query_full(monkeypatch: pytest.MonkeyPatch) -> None:
 @dbtest
 @patch("click.clear")
 def test_watch_query_clear(clear_mock):
-    """Test that the screen is cleared with the -c flag of `watch` command
-    before execute the query."""
+    """Test that the -c flag of `watch` command asks the caller to clear
+    or redraw the screen at each iteration."""
     with db_connection().cursor() as cur:
         watch_gen = mycli.packages.special.iocommands.watch_query(arg="0.1 -c select 1;", cur=cur)
+        for _ in range(2):
+            result = next(watch_gen)
+            assert result.command['clear'] is True
+            assert result.command['statement'] == 0
         assert not clear_mock.called
-        next(watch_gen)
-        assert clear_mock.called
-        clear_mock.reset_mock()
-        next(watch_gen)
-        assert clear_mock.called
-        clear_mock.reset_mock()
 
 
 @dbtest
@@ -1722,7 +1740,9 @@ def test_watch_query_confirmed_without_description_and_keyboard_interrupt(monkey
 
     assert result.preamble == '> select 1;'
     assert result.header is None
-    assert result.command == {'name': 'watch', 'seconds': 0.1}
+    server_seconds = result.command.pop('server_seconds')
+    assert result.command == {'name': 'watch', 'seconds': 0.1, 'clear': False, 'statement': 0, 'statements': 1}
+    assert server_seconds >= 0
     assert iocommands.is_pager_enabled() is False
 
     with pytest.raises(StopIteration):
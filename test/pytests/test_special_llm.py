@@ -1,5 +1,6 @@
 import builtins
 import importlib
+import sys
 from types import SimpleNamespace
 from typing import Any, cast
 from unittest.mock import patch
@@ -8,6 +9,7 @@ import click
 import pytest
 
 from mycli.packages.special import llm as llm_module
+from mycli.packages.special import main as special_main
 from mycli.packages.special.llm import (
     NEED_DEPENDENCIES,
     USAGE,
@@ -35,33 +37,28 @@ def executor():
     return None
 
 
-def test_reload_llm_module_handles_disabled_and_import_error_paths(monkeypatch) -> None:
+def test_reload_llm_module_handles_disabled_and_missing_llm(monkeypatch) -> None:
     with monkeypatch.context() as m:
         m.setenv("MYCLI_LLM_OFF", "1")
         importlib.reload(llm_module)
         assert llm_module.LLM_IMPORTED is False
-        assert llm_module.LLM_CLI_IMPORTED is False
+        assert llm_module.llm_cli() is None
 
     importlib.reload(llm_module)
 
-    original_import = builtins.__import__
-
-    def fake_import(name, globals=None, locals=None, fromlist=(), level=0):  # noqa: A002
-        if name == "llm" or name == "llm.cli":
-            raise ImportError("no llm")
-        return original_import(name, globals, locals, fromlist, level)
-
     with monkeypatch.context() as m:
         m.delenv("MYCLI_LLM_OFF", raising=False)
-        m.setattr(builtins, "__import__", fake_import)
+        m.setattr(special_main, "find_spec", lambda name: None)
         importlib.reload(llm_module)
         assert llm_module.LLM_IMPORTED is False
-        assert llm_module.LLM_CLI_IMPORTED is False
+        assert llm_module.llm_cli() is None
+        assert llm_module.cli_commands() == []
+        assert llm_module.command_tree() == {}
 
     importlib.reload(llm_module)
 
 
-def test_reload_llm_module_handles_cli_import_error(monkeypatch) -> None:
+def test_llm_cli_handles_cli_import_error(monkeypatch) -> None:
     original_import = builtins.__import__
 
     def fake_import(name, globals=None, locals=None, fromlist=(), level=0):  # noqa: A002
@@ -69,22 +66,40 @@ def test_reload_llm_module_handles_cli_import_error(monkeypatch) -> None:
             raise ImportError("no llm cli")
         return original_import(name, globals, locals, fromlist, level)
 
-    with monkeypatch.context() as m:
-        m.delenv("MYCLI_LLM_OFF", raising=False)
-        m.setattr(builtins, "__import__", fake_import)
-        importlib.reload(llm_module)
-        assert llm_module.LLM_IMPORTED is True
-        assert llm_module.LLM_CLI_IMPORTED is False
+    monkeypatch.setattr(llm_module, "LLM_IMPORTED", True)
+    monkeypatch.setattr(builtins, "__import__", fake_import)
+    llm_module.llm_cli.cache_clear()
+    try:
+        assert llm_module.llm_cli() is None
+    finally:
+        llm_module.llm_cli.cache_clear()
 
-    importlib.reload(llm_module)
+
+def test_command_tree_is_built_from_llm_cli_on_first_use(monkeypatch) -> None:
+    calls: list[int] = []
+    root = click.Group("root")
+    root.add_command(click.Command("prompt"))
+
+    def llm_cli():
+        calls.append(1)
+        return root
+
+    monkeypatch.setattr(llm_module, "llm_cli", llm_cli)
+    llm_module.command_tree.cache_clear()
+    try:
+        assert calls == []
+        assert get_completions([]) == ["prompt"]
+        assert get_completions([]) == ["prompt"]
+        assert calls == [1]
+    finally:
+        llm_module.command_tree.cache_clear()
 
 
 def test_build_command_tree_handles_groups_models_and_leaf(monkeypatch) -> None:
-    monkeypatch.setattr(
-        llm_module,
+    monkeypatch.setitem(
+        sys.modules,
         "llm",
         SimpleNamespace(get_models=lambda: [SimpleNamespace(model_id="gpt-4o"), SimpleNamespace(model_id="llama3")]),
-        raising=False,
     )
 
     models_group = click.Group("models")
@@ -116,11 +131,11 @@ def test_get_completions_walks_tree_and_skips_flags() -> None:
 
 def test_cli_commands_is_cached(monkeypatch) -> None:
     llm_module.cli_commands.cache_clear()
-    monkeypatch.setattr(llm_module, "cli", SimpleNamespace(commands={"models": object(), "prompt": object()}))
+    monkeypatch.setattr(llm_module, "llm_cli", lambda: SimpleNamespace(commands={"models": object(), "prompt": object()}))
 
     assert llm_module.cli_commands() == ["models", "prompt"]
 
-    monkeypatch.setattr(llm_module, "cli", SimpleNamespace(commands={"install": object()}))
+    monkeypatch.setattr(llm_module, "llm_cli", lambda: SimpleNamespace(commands={"install": object()}))
     assert llm_module.cli_commands() == ["models", "prompt"]
     llm_module.cli_commands.cache_clear()
 
@@ -227,7 +242,7 @@ def test_ensure_mycli_template_returns_early_or_replaces(monkeypatch) -> None:
     ]
 
 
-@patch("mycli.packages.special.llm.llm")
+@patch("mycli.packages.special.llm.LLM_IMPORTED")
 def test_llm_command_without_args(mock_llm, executor):
     r"""
     Invoking \llm without any arguments should print the usage and raise FinishIteration.
@@ -240,7 +255,7 @@ def test_llm_command_without_args(mock_llm, executor):
     assert exc_info.value.results == [SQLResult(preamble=USAGE)]
 
 
-@patch("mycli.packages.special.llm.llm")
+@patch("mycli.packages.special.llm.LLM_IMPORTED")
 def test_llm_command_with_help_subcommand(mock_llm, executor):
     r"""
     Invoking \llm with "help" should print the usage and raise FinishIteration.
@@ -253,7 +268,7 @@ def test_llm_command_with_help_subcommand(mock_llm, executor):
     assert exc_info.value.results == [SQLResult(preamble=USAGE)]
 
 
-@patch("mycli.packages.special.llm.llm")
+@patch("mycli.packages.special.llm.LLM_IMPORTED")
 @patch("mycli.packages.special.llm.run_external_cmd")
 def test_llm_command_with_c_flag(mock_run_cmd, mock_llm, executor):
     string = "Hello, no SQL today."
@@ -266,7 +281,7 @@ def test_llm_command_with_c_flag(mock_run_cmd, mock_llm, executor):
     assert exc_info.value.results == [SQLResult(preamble=string)]
 
 
-@patch("mycli.packages.special.llm.llm")
+@patch("mycli.packages.special.llm.LLM_IMPORTED")
 @patch("mycli.packages.special.llm.run_external_cmd")
 def test_llm_command_with_c_flag_and_fenced_sql(mock_run_cmd, mock_llm, executor):
     # Return text containing a fenced SQL block
@@ -281,7 +296,7 @@ def test_llm_command_with_c_flag_and_fenced_sql(mock_run_cmd, mock_llm, executor
     assert isinstance(duration, float)
 
 
-@patch("mycli.packages.special.llm.llm")
+@patch("mycli.packages.special.llm.LLM_IMPORTED")
 @patch("mycli.packages.special.llm.run_external_cmd")
 def test_llm_command_known_subcommand(mock_run_cmd, mock_llm, executor):
     # 'models' is a known subcommand
@@ -292,7 +307,7 @@ def test_llm_command_known_subcommand(mock_run_cmd, mock_llm, executor):
     assert exc_info.value.results is None
 
 
-@patch("mycli.packages.special.llm.llm")
+@patch("mycli.packages.special.llm.LLM_IMPORTED")
 @patch("mycli.packages.special.llm.run_external_cmd")
 def test_llm_command_with_help_flag(mock_run_cmd, mock_llm, executor):
     test_text = r"\llm --help"
@@ -302,7 +317,7 @@ def test_llm_command_with_help_flag(mock_run_cmd, mock_llm, executor):
     assert exc_info.value.results is None
 
 
-@patch("mycli.packages.special.llm.llm")
+@patch("mycli.packages.special.llm.LLM_IMPORTED")
 @patch("mycli.packages.special.llm.run_external_cmd")
 def test_llm_command_with_install_flag(mock_run_cmd, mock_llm, executor):
     test_text = r"\llm install openai"
@@ -312,7 +327,7 @@ def test_llm_command_with_install_flag(mock_run_cmd, mock_llm, executor):
     assert exc_info.value.results is None
 
 
-@patch("mycli.packages.special.llm.llm")
+@patch("mycli.packages.special.llm.LLM_IMPORTED")
 @patch("mycli.packages.special.llm.ensure_mycli_template")
 @patch("mycli.packages.special.llm.sql_using_llm")
 def test_llm_command_with_prompt(mock_sql_using_llm, mock_ensure_template, mock_llm, executor):
@@ -329,7 +344,7 @@ def test_llm_command_with_prompt(mock_sql_using_llm, mock_ensure_template, mock_
     assert isinstance(duration, float)
 
 
-@patch("mycli.packages.special.llm.llm")
+@patch("mycli.packages.special.llm.LLM_IMPORTED")
 @patch("mycli.packages.special.llm.ensure_mycli_template")
 @patch("mycli.packages.special.llm.sql_using_llm")
 def test_llm_command_question_with_context(mock_sql_using_llm, mock_ensure_template, mock_llm, executor):
@@ -346,7 +361,7 @@ def test_llm_command_question_with_context(mock_sql_using_llm, mock_ensure_templ
     assert isinstance(duration, float)
 
 
-@patch("mycli.packages.special.llm.llm")
+@patch("mycli.packages.special.llm.LLM_IMPORTED")
 @patch("mycli.packages.special.llm.ensure_mycli_template")
 @patch("mycli.packages.special.llm.sql_using_llm")
 def test_llm_command_question_verbose(mock_sql_using_llm, mock_ensure_template, mock_llm, executor):
@@ -370,7 +385,7 @@ def test_handle_llm_without_dependencies(executor, monkeypatch) -> None:
     assert exc_info.value.results == [SQLResult(preamble=NEED_DEPENDENCIES)]
 
 
-@patch("mycli.packages.special.llm.llm")
+@patch("mycli.packages.special.llm.LLM_IMPORTED")
 def test_handle_llm_wraps_context_errors(mock_llm, executor, monkeypatch) -> None:
     assert mock_llm is not None
     monkeypatch.setattr(llm_module, "ensure_mycli_template", lambda: (_ for _ in ()).throw(ValueError("bad template")))
@@ -542,7 +557,7 @@ def test_handle_llm_registered_aliases_without_args(prefix, executor, monkeypatc
     assert prefix in COMMANDS
     assert COMMANDS[prefix].handler is COMMANDS[r"\llm"].handler
     assert COMMANDS[prefix].command == r"\llm"
-    monkeypatch.setattr(llm_module, "llm", object())
+    monkeypatch.setattr(llm_module, "LLM_IMPORTED", True)
     with pytest.raises(llm_module.FinishIteration) as exc_info:
         handle_llm(prefix, executor, 'mysql', 0, 0)
     assert exc_info.value.results == [SQLResult(preamble=USAGE)]
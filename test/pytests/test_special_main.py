@@ -1,4 +1,3 @@
-import builtins
 from collections.abc import Iterator
 import importlib
 import importlib.util
@@ -447,21 +446,29 @@ def test_reload_special_main_without_llm_support(monkeypatch) -> None:
             sys.modules.pop('test_special_main_without_llm', None)
 
 
-def test_reload_special_main_handles_llm_import_error(monkeypatch) -> None:
-    original_import = builtins.__import__
-
-    def fake_import(name, globals=None, locals=None, fromlist=(), level=0):  # noqa: A002
-        if name == 'llm':
-            raise ImportError('no llm')
-        return original_import(name, globals, locals, fromlist, level)
-
+def test_reload_special_main_without_llm_installed(monkeypatch) -> None:
     with monkeypatch.context() as m:
         m.delenv('MYCLI_LLM_OFF', raising=False)
-        m.setattr(builtins, '__import__', fake_import)
-        isolated_main = load_isolated_special_main('test_special_main_import_error')
+        m.setattr(importlib.util, 'find_spec', lambda name: None)
+        isolated_main = load_isolated_special_main('test_special_main_without_llm_installed')
         try:
             assert isolated_main.LLM_IMPORTED is False
             assert r'\llm' not in isolated_main.COMMANDS
             assert r'\ai' not in isolated_main.COMMANDS
         finally:
-            sys.modules.pop('test_special_main_import_error', None)
+            sys.modules.pop('test_special_main_without_llm_installed', None)
+
+
+def test_llm_installed_does_not_import_llm(monkeypatch) -> None:
+    looked_up: list[str] = []
+    monkeypatch.delenv('MYCLI_LLM_OFF', raising=False)
+    monkeypatch.setattr(special_main, 'find_spec', lambda name: looked_up.append(name) or object())
+
+    assert special_main.llm_installed() is True
+    assert looked_up == ['llm']
+
+    def broken_find_spec(name):
+        raise ValueError('llm.__spec__ is None')
+
+    monkeypatch.setattr(special_main, 'find_spec', broken_find_spec)
+    assert special_main.llm_installed() is False
@@ -3,12 +3,16 @@
 from types import SimpleNamespace
 
 import pytest
+import sqlglot
+import sqlglot.tokens
 import sqlparse
 from sqlparse.sql import Identifier, IdentifierList, Token, TokenList
 from sqlparse.tokens import DML, Keyword, Punctuation
 
 from mycli.packages import sql_utils
 from mycli.packages.sql_utils import (
+    DDLTarget,
+    ddl_targets,
     extract_columns_from_select,
     extract_from_part,
     extract_table_identifiers,
@@ -28,6 +32,7 @@ from mycli.packages.sql_utils import (
     query_has_where_clause,
     query_is_single_table_update,
     query_starts_with,
+    split_statements,
 )
 
 
@@ -430,7 +435,7 @@ def test_extract_tables_from_complete_statements_skips_cte_table_identifiers(mon
             return [FakeIdentifier()]
 
     monkeypatch.setattr(sql_utils.sqlparse, 'parse', lambda _sql: ['stmt'])
-    monkeypatch.setattr(sql_utils.sqlglot, 'parse_one', lambda *_args, **_kwargs: FakeStatement())
+    monkeypatch.setattr(sqlglot, 'parse_one', lambda *_args, **_kwargs: FakeStatement())
 
     assert extract_tables_from_complete_statements('with cte as (select 1) select * from cte') == []
 
@@ -539,6 +544,47 @@ def test_need_completion_refresh_ignores_queries_that_fail_to_split(monkeypatch)
     assert need_completion_refresh('ignored') is False
 
 
+@pytest.mark.parametrize(
+    ('queries', 'expected'),
+    [
+        ('select 1;', []),
+        ('alter table foo add column bar int;', [DDLTarget('table', 'foo')]),
+        ('ALTER TABLE foo ADD INDEX (a), DROP COLUMN b', [DDLTarget('table', 'foo')]),
+        ('alter table foo rename column a to b', [DDLTarget('table', 'foo')]),
+        ('alter table db.foo rename to bar', [DDLTarget('table', 'foo', 'db'), DDLTarget('table', 'bar')]),
+        ('create table if not exists `my db`.`foo bar` (id int);', [DDLTarget('table', 'foo bar', 'my db')]),
+        ('create or replace algorithm=merge view v as select 1', [DDLTarget('table', 'v')]),
+        ('CREATE DEFINER=`root`@`localhost` SQL SECURITY INVOKER VIEW v AS SELECT 1', [DDLTarget('table', 'v')]),
+        ('CREATE SQL /* who runs it */ SECURITY DEFINER VIEW v AS SELECT 1', [DDLTarget('table', 'v')]),
+        (
+            'drop temporary table if exists foo, db.bar',
+            [DDLTarget('table', 'foo', dropped=True), DDLTarget('table', 'bar', 'db', dropped=True)],
+        ),
+        (
+            'rename table a to b, db.c to d',
+            [DDLTarget('table', 'a'), DDLTarget('table', 'b'), DDLTarget('table', 'c', 'db'), DDLTarget('table', 'd')],
+        ),
+        ('create unique index i on db.foo (a)', [DDLTarget('table', 'foo', 'db')]),
+        ('drop index i on foo', [DDLTarget('table', 'foo')]),
+        ('create function f() returns int return 1', [DDLTarget('function', 'f')]),
+        ('drop procedure if exists db.p', [DDLTarget('procedure', 'p', 'db', dropped=True)]),
+        ('create database foo', [DDLTarget('database', 'foo')]),
+        ('drop schema foo', [DDLTarget('database', 'foo', dropped=True)]),
+        ('alter database foo character set utf8mb4', []),
+        ("create aggregate function f returns string soname 'f.so'", []),
+        ('select 1; create table foo (id int)', [DDLTarget('table', 'foo')]),
+        ('create user bob', None),
+        ('create event e on schedule every 1 day do drop table foo', None),
+        ('use foo', None),
+        ('create table foo (id int); use foo', None),
+        ('alter table', None),
+        ('rename table a b', None),
+    ],
+)
+def test_ddl_targets(queries, expected):
+    assert ddl_targets(queries) == expected
+
+
 @pytest.mark.parametrize(
     ('queries', 'expected'),
     [
@@ -567,21 +613,21 @@ def test_need_completion_reset_ignores_queries_that_fail_to_split(monkeypatch):
 
 def test_classify_sandbox_statement_treats_token_error_as_quit(monkeypatch):
     def raise_token_error(*_args, **_kwargs):
-        raise sql_utils.sqlglot.errors.TokenError('bad token')
+        raise sqlglot.errors.TokenError('bad token')
 
-    monkeypatch.setattr(sql_utils.sqlglot, 'tokenize', raise_token_error)
+    monkeypatch.setattr(sqlglot, 'tokenize', raise_token_error)
 
     assert sql_utils.classify_sandbox_statement('`') == ('quit', None)
 
 
 def test_classify_sandbox_statement_treats_empty_tokens_as_quit(monkeypatch):
-    monkeypatch.setattr(sql_utils.sqlglot, 'tokenize', lambda *_args, **_kwargs: [])
+    monkeypatch.setattr(sqlglot, 'tokenize', lambda *_args, **_kwargs: [])
 
     assert sql_utils.classify_sandbox_statement('ignored') == ('quit', None)
 
 
 def test_find_password_after_eq_returns_none_for_non_string_token() -> None:
-    token_type = sql_utils.sqlglot.tokens.TokenType
+    token_type = sqlglot.tokens.TokenType
     tokens = [
         SimpleNamespace(token_type=token_type.EQ, text='='),
         SimpleNamespace(token_type=token_type.VAR, text='CURRENT_USER'),
@@ -684,3 +730,57 @@ def test_is_mutating(status_plain, expected):
 )
 def test_is_select(status_plain, expected):
     assert is_select(status_plain) is expected
+
+
+@pytest.fixture
+def fresh_parse_caches():
+    sql_utils.parse_statements.cache_clear()
+    sql_utils._complete_prefixes.clear()
+    yield
+    sql_utils.parse_statements.cache_clear()
+    sql_utils._complete_prefixes.clear()
+
+
+def test_split_statements_parses_only_the_tail_after_known_statements(monkeypatch, fresh_parse_caches):
+    parsed: list[str] = []
+    original_parse = sqlparse.parse
+
+    def spy_parse(sql):
+        parsed.append(sql)
+        return original_parse(sql)
+
+    monkeypatch.setattr(sql_utils.sqlparse, 'parse', spy_parse)
+    head = 'select 1;\nselect 2;\n'
+
+    offset, statements = split_statements(head + 'sel')
+    assert offset == 0
+    assert [str(statement) for statement in statements] == ['select 1;', '\nselect 2;', '\nsel']
+
+    offset, statements = split_statements(head + 'select * from t')
+
+    assert offset == len('select 1;\nselect 2;')
+    assert [str(statement) for statement in statements] == ['\nselect * from t']
+    assert parsed == [head + 'sel', '\nselect * from t']
+
+
+@pytest.mark.parametrize(
+    'tail',
+    [
+        '',
+        ' ',
+        '  -- note\n',
+        '\nselect 3; select 4',
+        '/* note */ select 3',
+    ],
+)
+def test_split_statements_matches_a_full_parse(fresh_parse_caches, tail):
+    head = 'select 1; select 2;'
+    split_statements(head + '\nx')
+    split_statements(head + ' x')
+
+    offset, statements = split_statements(head + tail)
+
+    full = [str(statement) for statement in sqlparse.parse(head + tail)]
+    skipped = len(full) - len(statements)
+    assert [str(statement) for statement in statements] == full[skipped:]
+    assert ''.join(full[:skipped]) == (head + tail)[:offset]
@@ -188,6 +188,87 @@ def test_find_fuzzy_matches_skips_rapidfuzz_duplicates_for_remaining_fuzziness_t
     assert matches == [('alphabet', existing_fuzziness)]
 
 
+@pytest.mark.parametrize(('last', 'text'), [('cust', 'cust'), ('CuId', 'cuid'), ('cu_na', 'cu_na'), ('cusotmer', 'cusotmer'), ('q', 'q')])
+def test_find_fuzzy_matches_through_index_matches_linear_scan(monkeypatch, last: str, text: str) -> None:
+    collection = [f'{a}_{b}{n}' for a in ('customer', 'order', 'CustomerId') for b in ('name', 'id', 'status') for n in range(40)]
+    completer = SQLCompleter()
+    linear = completer.find_fuzzy_matches(last, text, collection)
+
+    monkeypatch.setattr(mycli.sqlcompleter, '_COMPLETION_INDEX_MIN_ITEMS', 1)
+    indexed = completer.find_fuzzy_matches(last, text, collection)
+
+    assert indexed == linear
+    assert list(completer._completion_indexes) == [tuple(collection)]
+
+
+@pytest.mark.parametrize(('text', 'start_only'), [('cust', True), ('name', False), ('', True), ('zz', True)])
+def test_find_perfect_matches_through_index_matches_linear_scan(monkeypatch, text: str, start_only: bool) -> None:
+    collection = {f'{a}_{b}{n}' for a in ('customer', 'order', 'Name') for b in ('name', 'id') for n in range(40)}
+    completer = SQLCompleter()
+    linear = completer.find_perfect_matches(text, collection, start_only)
+
+    monkeypatch.setattr(mycli.sqlcompleter, '_COMPLETION_INDEX_MIN_ITEMS', 1)
+    indexed = completer.find_perfect_matches(text, collection, start_only)
+
+    assert indexed == linear
+    assert len(completer._completion_indexes) == 1
+
+
+def test_completion_index_is_reused_by_contents_and_evicted_oldest_first(monkeypatch) -> None:
+    monkeypatch.setattr(mycli.sqlcompleter, '_COMPLETION_INDEX_CACHE_SIZE', 2)
+    completer = SQLCompleter()
+
+    first = completer.completion_index(['a', 'b'])
+    assert completer.completion_index({'a': 1, 'b': 2}.keys()) is first
+
+    completer.completion_index(['c'])
+    completer.completion_index(['d'])
+
+    assert list(completer._completion_indexes) == [('c',), ('d',)]
+    completer.reset_completions()
+    assert completer._completion_indexes == {}
+
+
+def test_scoped_columns_are_built_once_while_typing_and_rebuilt_after_metadata_changes(monkeypatch) -> None:
+    completer = SQLCompleter()
+    completer.load_schema_metadata('test', {'users': ['*', 'id', 'email'], 'orders': ['*', 'id', 'total']}, {}, {}, {}, {}, {})
+    completer.set_dbname('test')
+    calls = []
+    populate_scoped_cols = completer.populate_scoped_cols
+    monkeypatch.setattr(completer, 'populate_scoped_cols', lambda tables: calls.append(tables) or populate_scoped_cols(tables))
+
+    for text in ('SELECT e', 'SELECT em', 'SELECT ema'):
+        result = [c.text for c in completer.get_completions(Document(text=text, cursor_position=len(text)), None)]
+        assert 'email' in result
+    assert len(calls) == 1
+
+    completer.update_table_metadata('test', 'users', ['id', 'email_verified'], [], [], [])
+    text = 'SELECT ema'
+    result = [c.text for c in completer.get_completions(Document(text=text, cursor_position=len(text)), None)]
+    assert 'email_verified' in result
+    assert 'email' not in result
+    assert len(calls) == 2
+
+
+def test_cached_collection_is_keyed_by_arguments_and_metadata_generation(monkeypatch) -> None:
+    monkeypatch.setattr(mycli.sqlcompleter, '_COLLECTION_CACHE_SIZE', 2)
+    completer = SQLCompleter()
+    calls = []
+
+    def build(*args):
+        calls.append(args)
+        return args
+
+    assert completer.cached_collection(build, 'a') == ('a',)
+    assert completer.cached_collection(build, 'a') == ('a',)
+    assert completer.cached_collection(build, 'b') == ('b',)
+    completer.set_dbname('other')
+    assert completer.cached_collection(build, 'a') == ('a',)
+
+    assert calls == [('a',), ('b',), ('a',)]
+    assert len(completer._collections) == 2
+
+
 @pytest.mark.parametrize(
     ('text', 'collection', 'start_only', 'expected'),
     [
@@ -810,3 +891,86 @@ def test_load_schema_metadata_ignores_empty_schema() -> None:
     assert completer.dbmetadata['indexed_columns'] == {}
     assert 'users' not in completer.all_completions
     assert 'fn_users' not in completer.all_completions
+
+
+def make_ddl_completer() -> SQLCompleter:
+    completer = SQLCompleter()
+    completer.load_schema_metadata(
+        schema='current',
+        table_columns={'orders': ['*', 'id', 'customer_id'], 'customers': ['*', 'id']},
+        indexed_columns={'orders': {'id'}},
+        foreign_keys={
+            'tables': {'orders': {'customers'}, 'customers': {'orders'}},
+            'relations': [('orders', 'customer_id', 'customers', 'id')],
+        },
+        enum_values={'orders': {'old': ['a']}},
+        functions={'fn_foo': None},
+        procedures={},
+    )
+    return completer
+
+
+def test_update_table_metadata_replaces_one_table() -> None:
+    completer = make_ddl_completer()
+    tables_before = completer.dbmetadata['tables']['current']
+
+    completer.update_table_metadata(
+        'current',
+        'orders',
+        ['id', 'customer_id', 'status'],
+        ['id', 'status'],
+        [('status', ['new', 'paid'])],
+        [('orders', 'customer_id', 'customers', 'id')],
+    )
+
+    assert completer.dbmetadata['tables']['current'] == {
+        'orders': ['*', 'id', 'customer_id', 'status'],
+        'customers': ['*', 'id'],
+    }
+    assert completer.dbmetadata['tables']['current'] is not tables_before
+    assert completer.dbmetadata['indexed_columns']['current'] == {'orders': {'id', 'status'}}
+    assert completer.dbmetadata['enum_values']['current'] == {'orders': {'status': ['new', 'paid']}}
+    assert completer.dbmetadata['foreign_keys']['current']['relations'] == [('orders', 'customer_id', 'customers', 'id')]
+    assert 'status' in completer.all_completions
+
+
+def test_update_table_metadata_removes_missing_table_and_its_relations() -> None:
+    completer = make_ddl_completer()
+
+    completer.update_table_metadata('current', 'orders', [], [], [], [])
+
+    assert completer.dbmetadata['tables']['current'] == {'customers': ['*', 'id']}
+    assert completer.dbmetadata['indexed_columns']['current'] == {}
+    assert completer.dbmetadata['enum_values']['current'] == {}
+    assert completer.dbmetadata['foreign_keys']['current'] == {'tables': {}, 'relations': []}
+
+
+def test_update_table_metadata_ignores_unloaded_schema() -> None:
+    completer = make_ddl_completer()
+
+    completer.update_table_metadata('other', 'orders', ['id'], [], [], [])
+
+    assert 'other' not in completer.dbmetadata['tables']
+
+
+def test_update_routine_metadata_adds_and_removes() -> None:
+    completer = make_ddl_completer()
+
+    completer.update_routine_metadata('current', 'procedures', 'proc_bar')
+    completer.update_routine_metadata('current', 'functions', 'fn_foo', dropped=True)
+
+    assert completer.dbmetadata['procedures']['current'] == {'proc_bar': None}
+    assert completer.dbmetadata['functions']['current'] == {}
+
+
+def test_update_database_name_adds_and_removes_with_metadata() -> None:
+    completer = make_ddl_completer()
+    completer.extend_database_names(['app_db', 'current'])
+
+    completer.update_database_name('new_db')
+    assert completer.databases == ['app_db', '`current`', 'new_db']
+
+    completer.update_database_name('current', dropped=True)
+    assert completer.databases == ['app_db', 'new_db']
+    assert 'current' not in completer.dbmetadata['tables']
+    assert 'current' not in completer.dbmetadata['functions']
@@ -1,6 +1,7 @@
 # type: ignore
 
 from datetime import time
+import itertools
 import os
 from types import SimpleNamespace
 
@@ -547,10 +548,12 @@ class FakeQueryConnection:
     def __init__(self, cursors: list[FakeQueryCursor]) -> None:
         self.cursors = list(cursors)
         self.cursor_calls = 0
+        self.cursor_classes: list[type | None] = []
 
-    def cursor(self) -> FakeQueryCursor:
+    def cursor(self, cursor_class: type | None = None) -> FakeQueryCursor:
         cursor = self.cursors[self.cursor_calls]
         self.cursor_calls += 1
+        self.cursor_classes.append(cursor_class)
         return cursor
 
 
@@ -593,8 +596,10 @@ class FakeMetadataCursor:
 class FakeMetadataConnection:
     def __init__(self, cursor: FakeMetadataCursor) -> None:
         self._cursor = cursor
+        self.cursor_classes: list[type | None] = []
 
-    def cursor(self) -> FakeMetadataCursor:
+    def cursor(self, cursor_class: type | None = None) -> FakeMetadataCursor:
+        self.cursor_classes.append(cursor_class)
         return self._cursor
 
 
@@ -646,6 +651,7 @@ def make_executor_for_connect_tests() -> SQLExecute:
     executor.connection_id = None
     executor.init_command = 'select 1'
     executor.unbuffered = False
+    executor.multi_statements = None
     executor.sandbox_mode = False
     executor.conn = None
     return executor
@@ -967,6 +973,25 @@ def test_run_uses_special_command_results_without_regular_execution(monkeypatch)
     assert cursor.executed == []
 
 
+@pytest.mark.parametrize(('unbuffered', 'cursor_class'), [(False, None), (True, sqlexecute.pymysql.cursors.SSCursor)])
+def test_run_uses_unbuffered_cursor_when_asked(monkeypatch, unbuffered: bool, cursor_class: type | None) -> None:
+    cursor = FakeQueryCursor()
+    connection = FakeQueryConnection([cursor])
+
+    def fake_execute(_cur: FakeQueryCursor, _sql: str) -> list[SQLResult]:
+        raise sqlexecute.CommandNotFound('not a special command')
+
+    monkeypatch.setattr(sqlexecute, 'Connection', FakeQueryConnection)
+    monkeypatch.setattr(sqlexecute, 'execute', fake_execute)
+    monkeypatch.setattr(SQLExecute, 'get_result', lambda _self, _cursor: SQLResult(status='ok'))
+
+    executor = make_executor_for_run_tests(connection)
+
+    assert list(executor.run('select 1', unbuffered=unbuffered)) == [SQLResult(status='ok')]
+    assert connection.cursor_classes == [cursor_class]
+    assert cursor.executed == ['select 1']
+
+
 def test_run_falls_back_to_regular_sql_and_handles_output_flags(monkeypatch) -> None:
     cursors = [FakeQueryCursor(), FakeQueryCursor(), FakeQueryCursor()]
     expanded_values: list[bool] = []
@@ -1072,6 +1097,60 @@ def test_run_skips_trailing_empty_result_set_from_nextset(monkeypatch) -> None:
     assert get_result_calls == [1]
 
 
+def test_run_packed_executes_once_and_indexes_each_result(monkeypatch) -> None:
+    cursor = FakeQueryCursor(nextset_steps=[(True, 0, None), (True, 1, [('column',)]), (False, 0, None)])
+    get_result_calls: list[int] = []
+
+    def fake_get_result(_self: SQLExecute, _cursor: FakeQueryCursor) -> SQLResult:
+        get_result_calls.append(len(get_result_calls) + 1)
+        return SQLResult(status=f'result {len(get_result_calls)}')
+
+    monkeypatch.setattr(sqlexecute, 'Connection', FakeQueryConnection)
+    monkeypatch.setattr(SQLExecute, 'get_result', fake_get_result)
+
+    executor = make_executor_for_run_tests(FakeQueryConnection([cursor]))
+
+    results = list(executor.run_packed(['insert into t values (1);', 'update t set a = 2;', 'select 3;']))
+
+    assert [(index, result.status) for index, result in results] == [(0, 'result 1'), (1, 'result 2'), (2, 'result 3')]
+    assert cursor.executed == ['insert into t values (1);\nupdate t set a = 2;\nselect 3;']
+
+
+def test_run_packed_fails_when_results_outnumber_statements(monkeypatch) -> None:
+    cursor = FakeQueryCursor(nextset_steps=[(True, 1, [('column',)]), (True, 0, None), (True, 0, None), (False, 0, None)])
+
+    monkeypatch.setattr(sqlexecute, 'Connection', FakeQueryConnection)
+    monkeypatch.setattr(SQLExecute, 'get_result', lambda _self, _cursor: SQLResult(status='ok'))
+
+    executor = make_executor_for_run_tests(FakeQueryConnection([cursor]))
+    results = executor.run_packed(['call p();', 'select 2;'])
+
+    assert [index for index, _result in itertools.islice(results, 2)] == [0, 1]
+    with pytest.raises(pymysql.err.ProgrammingError, match='more results than statements'):
+        next(results)
+    assert cursor.nextset() is False
+    assert executor.query_in_flight is False
+
+
+def test_connect_enables_multi_statements_when_requested(monkeypatch) -> None:
+    executor = make_executor_for_connect_tests()
+    executor.ssl = None
+    executor.init_command = None
+    executor.multi_statements = True
+    connect_kwargs = {}
+
+    def fake_connect(**kwargs):
+        connect_kwargs.update(kwargs)
+        return DummyConnection(server_version='8.0.36')
+
+    monkeypatch.setattr(sqlexecute.pymysql, 'connect', fake_connect)
+    monkeypatch.setattr(SQLExecute, 'reset_connection_id', lambda self: None)
+
+    executor.connect()
+
+    assert connect_kwargs['client_flag'] & sqlexecute.pymysql.constants.CLIENT.MULTI_STATEMENTS
+
+
 def test_get_result_returns_header_and_row_status_for_result_sets() -> None:
     cursor = FakeQueryCursor()
     cursor.rowcount = 2
@@ -1353,6 +1432,124 @@ def test_procedures_yields_empty_tuple_and_logs_database_errors(monkeypatch, cap
     assert "No procedure completions due to DatabaseError('boom')" in caplog.text
 
 
+def test_all_table_columns_streams_rows_for_every_schema(monkeypatch) -> None:
+    cursor = FakeMetadataCursor([('app_db', 'users', 'id'), ('other_db', 'orders', 'id')])
+    connection = FakeMetadataConnection(cursor)
+    executor = make_executor_for_run_tests(connection)
+    monkeypatch.setattr(sqlexecute, 'Connection', FakeMetadataConnection)
+
+    result = list(executor.all_table_columns(['app_db', 'other_db']))
+
+    assert result == [('app_db', 'users', 'id'), ('other_db', 'orders', 'id')]
+    assert cursor.executed == [(SQLExecute.all_table_columns_query, {'schemas': ('app_db', 'other_db')})]
+    assert connection.cursor_classes == [pymysql.cursors.SSCursor]
+    assert cursor.exited is True
+
+
+def test_all_enum_values_parses_enum_columns(monkeypatch) -> None:
+    cursor = FakeMetadataCursor([
+        ('app_db', 'orders', 'status', "enum('new','paid')"),
+        ('app_db', 'orders', 'notes', 'varchar(255)'),
+    ])
+    executor = make_executor_for_run_tests(FakeMetadataConnection(cursor))
+    monkeypatch.setattr(sqlexecute, 'Connection', FakeMetadataConnection)
+
+    result = list(executor.all_enum_values(['app_db']))
+
+    assert result == [('app_db', 'orders', 'status', ['new', 'paid'])]
+    assert cursor.executed == [(SQLExecute.all_enum_values_query, {'schemas': ('app_db',)})]
+
+
+@pytest.mark.parametrize(
+    ('method', 'query', 'message'),
+    [
+        ('all_indexed_columns', SQLExecute.all_indexed_columns_query, 'No indexed-column metadata'),
+        ('all_foreign_keys', SQLExecute.all_foreign_keys_query, 'No foreign key completions'),
+        ('all_routines', SQLExecute.all_routines_query, 'No routine completions'),
+    ],
+)
+def test_all_schema_metadata_logs_execute_errors(monkeypatch, caplog, method, query, message) -> None:
+    cursor = FakeMetadataCursor([], execute_error=pymysql.DatabaseError('boom'))
+    executor = make_executor_for_run_tests(FakeMetadataConnection(cursor))
+    monkeypatch.setattr(sqlexecute, 'Connection', FakeMetadataConnection)
+
+    with caplog.at_level('ERROR', logger='mycli.sqlexecute'):
+        result = list(getattr(executor, method)(['app_db']))
+
+    assert result == []
+    assert cursor.executed == [(query, {'schemas': ('app_db',)})]
+    assert message in caplog.text
+
+
+def test_all_schema_metadata_queries_nothing_for_no_schemas(monkeypatch) -> None:
+    cursor = FakeMetadataCursor([('app_db', 'users', 'id')])
+    executor = make_executor_for_run_tests(FakeMetadataConnection(cursor))
+    monkeypatch.setattr(sqlexecute, 'Connection', FakeMetadataConnection)
+
+    assert list(executor.all_table_columns([])) == []
+    assert cursor.executed == []
+
+
+def test_all_schema_metadata_queries_filter_by_schema() -> None:
+    for query in (
+        SQLExecute.all_table_columns_query,
+        SQLExecute.all_indexed_columns_query,
+        SQLExecute.all_enum_values_query,
+        SQLExecute.all_foreign_keys_query,
+        SQLExecute.all_routines_query,
+    ):
+        assert 'in %(schemas)s' in query.lower()
+
+
+def test_table_metadata_collects_columns_indexes_enums_and_foreign_keys(monkeypatch) -> None:
+    cursor = FakeMetadataCursor([
+        ('column', 1, 'id', 'int', None, None),
+        ('column', 2, 'status', "enum('new','paid')", None, None),
+        ('foreign_key', 0, 'orders', 'customer_id', 'customers', 'id'),
+        ('index', 0, 'id', None, None, None),
+    ])
+    executor = make_executor_for_run_tests(FakeMetadataConnection(cursor))
+    executor.dbname = 'app_db'
+    monkeypatch.setattr(sqlexecute, 'Connection', FakeMetadataConnection)
+
+    result = executor.table_metadata('orders')
+
+    assert result == sqlexecute.TableMetadata(
+        columns=['id', 'status'],
+        indexed_columns=['id'],
+        enum_values=[('status', ['new', 'paid'])],
+        foreign_keys=[('orders', 'customer_id', 'customers', 'id')],
+    )
+    assert cursor.executed == [(SQLExecute.table_metadata_query, {'schema': 'app_db', 'table': 'orders'})]
+    assert cursor.exited is True
+
+
+def test_schema_fingerprint_summarizes_current_schema(monkeypatch) -> None:
+    cursor = FakeMetadataCursor([('3:1', '12:2', '4:3', '1:4', '0:0')])
+    executor = make_executor_for_run_tests(FakeMetadataConnection(cursor))
+    executor.dbname = 'app_db'
+    monkeypatch.setattr(sqlexecute, 'Connection', FakeMetadataConnection)
+
+    assert executor.schema_fingerprint() == ('3:1', '12:2', '4:3', '1:4', '0:0')
+    assert executor.schema_fingerprint('other_db') == ('3:1', '12:2', '4:3', '1:4', '0:0')
+    assert cursor.executed == [
+        (SQLExecute.schema_fingerprint_query, {'schema': 'app_db'}),
+        (SQLExecute.schema_fingerprint_query, {'schema': 'other_db'}),
+    ]
+
+
+def test_schema_fingerprint_returns_none_and_logs_database_errors(monkeypatch, caplog) -> None:
+    cursor = FakeMetadataCursor([], execute_error=pymysql.DatabaseError('boom'))
+    executor = make_executor_for_run_tests(FakeMetadataConnection(cursor))
+    executor.dbname = 'app_db'
+    monkeypatch.setattr(sqlexecute, 'Connection', FakeMetadataConnection)
+
+    with caplog.at_level('ERROR', logger='mycli.sqlexecute'):
+        assert executor.schema_fingerprint() is None
+
+    assert 'No schema fingerprint' in caplog.text
+
+
 def test_character_sets_executes_query_and_yields_rows(monkeypatch) -> None:
     cursor = FakeMetadataCursor([('utf8mb4',), ('latin1',)])
     executor = make_executor_for_run_tests(FakeMetadataConnection(cursor))
@@ -1711,3 +1908,55 @@ def test_close_does_nothing_when_connection_is_none() -> None:
     executor = make_executor_for_run_tests()
 
     executor.close()
+
+
+@pytest.mark.parametrize(
+    ('error', 'expected'),
+    [
+        (pymysql.OperationalError(1317, 'Query execution was interrupted'), True),
+        (pymysql.ProgrammingError(1064, 'You have an error in your SQL syntax'), True),
+        (pymysql.OperationalError(2013, 'Lost connection to MySQL server during query'), False),
+        (pymysql.InternalError('Packet sequence number wrong - got 3 expected 1'), False),
+        (IndexError('index out of range'), False),
+    ],
+)
+def test_is_server_error(error, expected) -> None:
+    assert sqlexecute.is_server_error(error) is expected
+
+
+def test_run_clears_query_in_flight_while_results_are_consumed(monkeypatch) -> None:
+    cursor = FakeQueryCursor(nextset_steps=[(False, 1, [('column',)])])
+    executor = make_executor_for_run_tests(FakeQueryConnection([cursor]))
+
+    def fake_execute(_cur: FakeQueryCursor, _sql: str) -> list[SQLResult]:
+        raise sqlexecute.CommandNotFound('not a special command')
+
+    monkeypatch.setattr(sqlexecute, 'Connection', FakeQueryConnection)
+    monkeypatch.setattr(sqlexecute, 'execute', fake_execute)
+    monkeypatch.setattr(sqlexecute.iocommands, 'split_queries', lambda statement: iter([statement]))
+    monkeypatch.setattr(SQLExecute, 'get_result', lambda _self, _cursor: SQLResult(status='ok'))
+
+    results = executor.run('select 1')
+    next(results)
+    assert executor.query_in_flight is False
+    assert list(results) == []
+    assert executor.query_in_flight is False
+
+
+def test_run_keeps_query_in_flight_while_unbuffered_rows_are_consumed(monkeypatch) -> None:
+    cursor = FakeQueryCursor(nextset_steps=[(False, 1, [('column',)])])
+    executor = make_executor_for_run_tests(FakeQueryConnection([cursor]))
+
+    def fake_execute(_cur: FakeQueryCursor, _sql: str) -> list[SQLResult]:
+        raise sqlexecute.CommandNotFound('not a special command')
+
+    monkeypatch.setattr(sqlexecute, 'Connection', FakeQueryConnection)
+    monkeypatch.setattr(sqlexecute, 'execute', fake_execute)
+    monkeypatch.setattr(sqlexecute.iocommands, 'split_queries', lambda statement: iter([statement]))
+    monkeypatch.setattr(SQLExecute, 'get_result', lambda _self, _cursor: SQLResult(status='ok'))
+
+    results = executor.run('select 1', unbuffered=True)
+    next(results)
+    assert executor.query_in_flight is True
+    results.close()
+    assert executor.query_in_flight is False
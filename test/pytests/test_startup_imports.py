@@ -0,0 +1,90 @@
+# type: ignore
+
+"""Import-time budget for the non-interactive modes.
+
+Each mode's startup is run under ``python -X importtime`` in a fresh
+interpreter.  The REPL, completion and llm machinery must not be imported.
+Timings depend on the machine, so the import budget is only checked when
+MYCLI_TEST_IMPORT_BUDGET is set.
+"""
+
+import os
+import subprocess
+import sys
+from textwrap import dedent
+
+import pytest
+
+# What mycli does before connecting and after, short of the connection
+# itself: parse the command line, build MyCli, and format a result.
+STARTUP = dedent("""
+    import mycli.main
+    from mycli.client import MyCli
+    from mycli.packages.sqlresult import SQLResult
+    {mode_import}
+
+    mycli = MyCli()
+    list(mycli.format_sqlresult(SQLResult(header=['a'], rows=[(1,)])))
+""")
+
+MODE_IMPORTS = {
+    'execute': 'from mycli.main_modes.execute import main_execute_from_cli',
+    'batch': 'from mycli.main_modes.batch import main_batch_from_stdin, main_batch_without_progress_bar',
+}
+
+# Seconds of import time allowed for each mode, with room for slow machines
+# and the overhead of -X importtime itself.  About half of it is used.
+IMPORT_BUDGETS = {
+    'execute': 1.0,
+    'batch': 1.0,
+}
+
+INTERACTIVE_ONLY_MODULES = (
+    'llm',
+    'mycli.async_completer',
+    'mycli.completion_refresher',
+    'mycli.main_modes.repl',
+    'mycli.packages.completion_engine',
+    'mycli.sqlcompleter',
+    'sqlglot',
+)
+
+
+def import_times(mode, home):
+    """The modules imported by the startup of *mode*, with the microseconds
+    each took to import, not counting the modules it imported."""
+    env = dict(os.environ, HOME=str(home))
+    env.pop('MYCLI_LLM_OFF', None)
+    code = STARTUP.format(mode_import=MODE_IMPORTS[mode])
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _cumulative_us, name = line[len('import time:') :].split('|')
+        times[name.strip()] = int(self_us)
+    return times
+
+
+@pytest.mark.parametrize('mode', sorted(MODE_IMPORTS))
+def test_non_interactive_modes_do_not_import_interactive_machinery(mode, tmp_path) -> None:
+    times = import_times(mode, tmp_path)
+
+    assert 'mycli.client' in times
+    assert sorted(name for name in times if name.startswith(INTERACTIVE_ONLY_MODULES)) == []
+
+
+@pytest.mark.skipif(not os.environ.get('MYCLI_TEST_IMPORT_BUDGET'), reason='set MYCLI_TEST_IMPORT_BUDGET to check import times')
+@pytest.mark.parametrize('mode', sorted(MODE_IMPORTS))
+def test_non_interactive_modes_import_within_budget(mode, tmp_path) -> None:
+    times = import_times(mode, tmp_path)
+
+    seconds = sum(times.values()) / 1e6
+    slowest = sorted(times, key=times.__getitem__, reverse=True)[:10]
+    assert seconds <= IMPORT_BUDGETS[mode], f'{mode} imports took {seconds:.2f}s; slowest: {slowest}'
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from cli_helpers.tabular_output import TabularOutputFormatter
+import pytest
+
+from mycli.packages.tabular_output import streaming
+
+ROWS = [
+    (1, 'ab', None),
+    (22222, 'c', 3.5),
+    (3, 'ü漢字', 1.0),
+    (4, 'two\nlines', 0.25),
+]
+HEADERS = ['id', 'name', 'value']
+COLUMN_TYPES = [int, str, float]
+COLALIGN = ['right', 'left', 'right']
+OUTPUT_KWARGS = {
+    'dialect': 'unix',
+    'disable_numparse': True,
+    'preserve_whitespace': True,
+    'column_types': COLUMN_TYPES,
+    'colalign': COLALIGN,
+}
+
+
+@pytest.mark.parametrize('format_name', ['ascii', 'mysql', 'mysql_unicode', 'mysql_heavy', 'psql', 'psql_unicode', 'double', 'plain'])
+def test_format_output_matches_tabulate(format_name: str) -> None:
+    formatter = TabularOutputFormatter()
+
+    expected = list(formatter.format_output(iter(ROWS), HEADERS, format_name=format_name, **OUTPUT_KWARGS))
+    streamed = list(streaming.format_output(formatter, iter(ROWS), HEADERS, format_name, **OUTPUT_KWARGS))
+
+    assert streamed == expected
+
+
+def test_format_output_matches_tabulate_without_rows() -> None:
+    formatter = TabularOutputFormatter()
+
+    expected = list(formatter.format_output(iter([]), HEADERS, format_name='mysql', **OUTPUT_KWARGS))
+    streamed = list(streaming.format_output(formatter, iter([]), HEADERS, 'mysql', **OUTPUT_KWARGS))
+
+    assert streamed == expected
+
+
+@pytest.mark.parametrize('format_name', ['csv', 'csv-tab-noheader', 'tsv', 'jsonl'])
+def test_format_output_hands_rows_lazily_to_row_formats(format_name: str) -> None:
+    formatter = TabularOutputFormatter()
+    fetched: list[int] = []
+
+    def rows():
+        for i, row in enumerate(ROWS):
+            fetched.append(i)
+            yield row
+
+    expected = list(formatter.format_output(iter(ROWS), HEADERS, format_name=format_name, **OUTPUT_KWARGS))
+    lines = streaming.format_output(formatter, rows(), HEADERS, format_name, **OUTPUT_KWARGS)
+
+    next(lines)
+    assert len(fetched) < len(ROWS)
+    assert [expected[0], *lines] == expected
+
+
+def test_format_output_sizes_columns_from_sample() -> None:
+    formatter = TabularOutputFormatter()
+    rows = [(1, 'a'), (2, 'much wider')]
+
+    streamed = list(
+        streaming.format_output(
+            formatter,
+            iter(rows),
+            ['id', 'name'],
+            'ascii',
+            column_types=[int, str],
+            colalign=['right', 'left'],
+            sample_rows=1,
+            preserve_whitespace=True,
+        )
+    )
+
+    assert streamed == [
+        '+----+------+',
+        '| id | name |',
+        '+----+------+',
+        '|  1 | a    |',
+        '|  2 | much wider |',
+        '+----+------+',
+    ]
+
+
+def test_format_output_fetches_rows_lazily() -> None:
+    formatter = TabularOutputFormatter()
+    fetched: list[int] = []
+
+    def rows():
+        for i in range(100):
+            fetched.append(i)
+            yield (i,)
+
+    lines = streaming.format_output(formatter, rows(), ['id'], 'ascii', column_types=[int], colalign=['right'], sample_rows=10)
+
+    assert next(lines) == '+----+'
+    assert len(fetched) == 10
+    assert len(list(lines)) == 103
+    assert len(fetched) == 100
+
+
+@pytest.mark.parametrize(
+    ('format_name', 'expected'),
+    [
+        ('ascii', True),
+        ('mysql_unicode', True),
+        ('psql', True),
+        ('minimal', False),
+        ('grid', False),
+        ('csv', True),
+        ('tsv', True),
+        ('jsonl', True),
+        ('vertical', False),
+        ('unknown', False),
+    ],
+)
+def test_supports_streaming(format_name: str, expected: bool) -> None:
+    assert streaming.supports_streaming(TabularOutputFormatter(), format_name) is expected
+
+
+def test_can_stream_alignment() -> None:
+    assert streaming.can_stream_alignment(None)
+    assert streaming.can_stream_alignment(['left', 'right', 'center'])
+    assert not streaming.can_stream_alignment(['decimal'])
@@ -0,0 +1,57 @@
+# type: ignore
+
+from mycli.packages.watch_screen import CLEAR_BELOW, CLEAR_LINE, CLEAR_SCREEN, WatchScreen
+
+
+def draw(screen, lines):
+    screen.add(lines)
+    return screen.render()
+
+
+def test_first_frame_is_painted_whole() -> None:
+    screen = WatchScreen(columns=20, rows=10)
+
+    assert draw(screen, ['id | state', '1  | Sleep']) == f'{CLEAR_SCREEN}id | state\n1  | Sleep\n'
+
+
+def test_later_frames_only_rewrite_changed_lines() -> None:
+    screen = WatchScreen(columns=20, rows=10)
+    draw(screen, ['id | state', '1  | Sleep', '2  | Query'])
+
+    assert draw(screen, ['id | state', '1  | Query', '2  | Query']) == f'\x1b[2;1H1  | Query{CLEAR_LINE}\x1b[4;1H'
+    assert draw(screen, ['id | state', '1  | Query', '2  | Query']) == '\x1b[4;1H'
+
+
+def test_shorter_frame_clears_the_rest_of_the_previous_one() -> None:
+    screen = WatchScreen(columns=20, rows=10)
+    draw(screen, ['a', 'b', 'c'])
+
+    assert draw(screen, ['a', 'x']) == f'\x1b[2;1Hx{CLEAR_LINE}\x1b[3;1H{CLEAR_BELOW}\x1b[3;1H'
+
+
+def test_frames_which_wrap_or_scroll_are_painted_whole() -> None:
+    screen = WatchScreen(columns=5, rows=3)
+    draw(screen, ['a', 'b'])
+
+    assert draw(screen, ['a', 'too wide']) == f'{CLEAR_SCREEN}a\ntoo wide\n'
+    assert draw(screen, ['a', 'b']) == f'{CLEAR_SCREEN}a\nb\n'
+    assert draw(screen, ['a', 'b', 'c']) == f'{CLEAR_SCREEN}a\nb\nc\n'
+
+
+def test_width_of_lines_ignores_ansi_and_counts_wide_characters() -> None:
+    screen = WatchScreen(columns=5, rows=3)
+    draw(screen, ['a'])
+
+    assert draw(screen, ['\x1b[31mabcde\x1b[0m']) == f'\x1b[1;1H\x1b[31mabcde\x1b[0m{CLEAR_LINE}\x1b[2;1H'
+    assert draw(screen, ['日本語']) == f'{CLEAR_SCREEN}日本語\n'
+
+
+def test_frame_after_a_resize_is_painted_whole() -> None:
+    screen = WatchScreen(columns=20, rows=10)
+    draw(screen, ['a', 'b'])
+
+    screen.resize(20, 10)
+    assert draw(screen, ['a', 'c']) == f'\x1b[2;1Hc{CLEAR_LINE}\x1b[3;1H'
+    screen.resize(30, 10)
+    assert draw(screen, ['a', 'c']) == f'{CLEAR_SCREEN}a\nc\n'
+    assert (screen.columns, screen.rows) == (30, 10)
@@ -15,6 +15,7 @@ import pymysql
 import pytest
 
 from mycli import main
+from mycli.connection_pool import ConnectionPool
 from mycli.constants import (
     DEFAULT_CHARSET,
     DEFAULT_HOST,
@@ -107,6 +108,17 @@ class FakeCursorBase:
         return iter(self._rows)
 
 
+class FetchingCursor(FakeCursorBase):
+    """Like a pymysql Cursor, iterating resumes from the last row fetched."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._remaining = iter(self._rows)
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        return self._remaining
+
+
 class RecordingSQLExecute:
     calls: list[dict[str, Any]] = []
     side_effects: list[Any] = []
@@ -163,6 +175,9 @@ def make_bare_mycli() -> Any:
     cli._completer_lock = cast(Any, ReusableLock())
     cli.prefetch_schemas_mode = 'never'
     cli.prefetch_schemas_list = []
+    cli.prefetch_schemas_parallelism = 1
+    cli.connection_pool = ConnectionPool(max_size=0)
+    cli.control_connection = None
     cli.schema_prefetcher = cast(
         Any,
         SimpleNamespace(
@@ -181,6 +196,7 @@ def make_bare_mycli() -> Any:
     cli.login_path = None
     cli.login_path_as_host = False
     cli.post_redirect_command = None
+    cli.redirect_buffer_size = 65536
     cli.logfile = None
     cli.emacs_ttimeoutlen = 1.0
     cli.vi_ttimeoutlen = 1.0